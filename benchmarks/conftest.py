@@ -0,0 +1,87 @@
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# How far (as a fraction) a result may fall below its baseline before it counts as a regression
+benchmark_tolerance = float(os.getenv("BENCHMARK_TOLERANCE", 0.5))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-baseline",
+        action="store_true",
+        default=False,
+        help=f"Record the measured rates as the new baseline in {BASELINE_PATH}",
+    )
+
+
+def measure(function: Callable[[], object], number: int, repeat: int = 5) -> float:
+    """Call `function` `number` times per round, and return the best rate (calls per second)
+    over `repeat` rounds; the best round is the one least disturbed by the rest of the machine"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, time.perf_counter() - started)
+    return number / best
+
+
+class Baseline:
+    """The stored rates (operations per second) that benchmark results are held against"""
+
+    def __init__(self, path: str, update: bool):
+        self.path = path
+        self.update = update
+        self.rates: Dict[str, float] = {}
+        if os.path.exists(path):
+            with open(path) as baseline_file:
+                self.rates = json.load(baseline_file)
+        self.results: List[Tuple[str, float, float]] = []
+
+    def check(self, name: str, rate: float) -> None:
+        """Fail if `rate` regressed past the baseline for `name` (or record it as the baseline)"""
+        expected = self.rates.get(name)
+        self.results.append((name, rate, expected))
+        if self.update or expected is None:
+            self.rates[name] = round(rate, 1)
+            return
+
+        minimum = expected * (1 - benchmark_tolerance)
+        assert rate >= minimum, (
+            f"{name} regressed: {rate:,.1f}/s against a baseline of {expected:,.1f}/s "
+            f"(at least {minimum:,.1f}/s allowed)"
+        )
+
+    def save(self) -> None:
+        with open(self.path, "w") as baseline_file:
+            json.dump(dict(sorted(self.rates.items())), baseline_file, indent=2)
+            baseline_file.write("\n")
+
+
+_baseline: Optional[Baseline] = None
+
+
+@pytest.fixture(scope="session")
+def baseline(request) -> Baseline:
+    global _baseline
+    update = request.config.getoption("--update-baseline") or not os.path.exists(BASELINE_PATH)
+    _baseline = Baseline(BASELINE_PATH, update)
+    yield _baseline
+    if update:
+        _baseline.save()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _baseline is None or not _baseline.results:
+        return
+
+    terminalreporter.section("benchmarks")
+    for name, rate, expected in _baseline.results:
+        versus = f"(baseline {expected:,.1f}/s, {rate / expected:.0%})" if expected else "(new)"
+        terminalreporter.write_line(f"{name:<40} {rate:>14,.1f}/s {versus}")
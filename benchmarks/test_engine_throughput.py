@@ -0,0 +1,85 @@
+import random
+import time
+
+import pytest
+
+from benchmarks.conftest import measure
+
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.models.card import build_deck
+from src.utils.instrumentation import instrumentation
+
+# Games are seeded, so every run plays (and times) the same turns
+SEEDS = [1, 2, 3]
+MAX_TURNS = 200
+
+
+def _new_game(seed: int, concurrent_deliberation: bool = False) -> ResistanceCoupGameHandler:
+    random.seed(seed)
+    handler = ResistanceCoupGameHandler("benchmark", 5, concurrent_deliberation)
+    handler.setup_game()
+    return handler
+
+
+@pytest.mark.parametrize("concurrent_deliberation", [False, True], ids=["serial", "concurrent"])
+def test_handle_turn_throughput(baseline, concurrent_deliberation):
+    """Whole turns per second, and agent decisions (model calls) per second, against a model
+    that answers instantly"""
+    turns = 0
+    decisions = 0
+    elapsed = 0.0
+    for seed in SEEDS:
+        handler = _new_game(seed, concurrent_deliberation)
+        instrumentation.reset()
+
+        started = time.perf_counter()
+        for turn in range(1, MAX_TURNS + 1):
+            if handler.handle_turn():
+                break
+        elapsed += time.perf_counter() - started
+
+        turns += turn
+        decisions += len(instrumentation.invocations)
+
+    mode = "concurrent" if concurrent_deliberation else "serial"
+    baseline.check(f"handle_turn[{mode}] turns", turns / elapsed)
+    baseline.check(f"handle_turn[{mode}] decisions", decisions / elapsed)
+
+
+def test_build_headless_state(baseline):
+    handler = _new_game(SEEDS[0])
+    player = handler.current_player
+
+    # Cold: the board changed since the last render, so the public part is rendered again
+    def render_cold():
+        handler._last_state_fingerprint = None
+        handler._build_headless_state(player)
+
+    baseline.check("_build_headless_state[cold]", measure(render_cold, 2000))
+    baseline.check(
+        "_build_headless_state[warm]",
+        measure(lambda: handler._build_headless_state(player), 2000),
+    )
+
+
+def test_build_deck(baseline):
+    baseline.check("build_deck", measure(build_deck, 2000))
+
+
+def test_swap_card(baseline):
+    handler = _new_game(SEEDS[0])
+    player = handler.current_player
+
+    def swap_card():
+        handler._swap_card(player, player.cards.pop())
+
+    baseline.check("_swap_card", measure(swap_card, 5000))
+
+
+@pytest.mark.parametrize("coins", [2, 7, 10])
+def test_available_actions(baseline, coins):
+    handler = _new_game(SEEDS[0])
+    player = handler.current_player
+    player.coins = coins
+
+    baseline.check(f"available_actions[{coins} coins]", measure(player.available_actions, 5000))
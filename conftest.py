@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+# Tests and benchmarks play against the offline fake model with no simulated latency, so the
+# benchmarks measure the orchestration overhead alone (these must be set before `src` is imported)
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["LLM_FAKE_LATENCY"] = "0"
+os.environ["LLM_FAKE_LATENCY_JITTER"] = "0"
+os.environ.pop("LLM_CACHE_PATH", None)
+os.environ.pop("AI_TRACE_DIR", None)
+os.environ["GAME_PACING"] = "batch"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def headless():
+    """Silence the console"""
+    from src.utils.print import console
+
+    console.quiet = True
+    yield
+    console.quiet = False
@@ -1,21 +1,32 @@
-from dotenv import load_dotenv
-load_dotenv()
-
+import argparse
+import os
 import sys
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
 from rich.panel import Panel
+from rich.table import Table
 from rich.text import Text
 
-from src.handler.game_handler import ResistanceCoupGameHandler
 from src.utils.print import (
     console,
     print_blank,
     print_confirm,
+    print_table,
     print_text,
+    print_texts,
 )
 
-console.clear()
+# Only the light imports above come before this; the heavy ones wait until they are needed
+launched_at = time.perf_counter()
+
+load_dotenv()
+
+
+def print_title():
+    console.clear()
 
-def main():
     text = Text(
         """
         In the not too distant future, the government is run for profit by a new 'royal class' of multinational CEOs.
@@ -44,44 +55,311 @@ def main():
     )
     console.print(panel)
 
+
+def print_startup_timings(imports: float, players: float, deal: float):
+    table = Table("Startup", "Seconds")
+    table.add_row("Imports", f"{imports:.3f}")
+    table.add_row("Players", f"{players:.3f}")
+    table.add_row("Deal", f"{deal:.3f}")
+    table.add_row("Launch to first turn", f"{time.perf_counter() - launched_at:.3f}")
+    print_table(table)
+
+
+def load_checkpoint_to_resume(args: argparse.Namespace) -> Optional[dict]:
+    from src.handler.checkpoint import game_checkpoint_path, load_checkpoint
+
+    if not args.resume:
+        return None
+    checkpoint = load_checkpoint(game_checkpoint_path) if game_checkpoint_path else None
+    if checkpoint is None:
+        print_text(f"No checkpoint to resume from at '{game_checkpoint_path}', starting anew")
+    return checkpoint
+
+
+def import_game_handler() -> type:
+    """The game handler (and langchain, openai, ... behind it) is only imported once it is
+    needed, so the title screen, `--help` and `simulate` do not wait for it"""
+    from src.handler.game_handler import ResistanceCoupGameHandler
+
+    return ResistanceCoupGameHandler
+
+
+def create_handler(
+    handler_class: type, args: argparse.Namespace, checkpoint: Optional[dict], subscribers: list
+):
+    from src.utils.pacing import PacingClock, game_pacing, game_pacing_speed
+
+    pacing = PacingClock(
+        mode=args.pacing or ("batch" if args.fast_start else game_pacing), speed=game_pacing_speed
+    )
+    if checkpoint:
+        return handler_class.from_checkpoint(
+            checkpoint["game"], pacing=pacing, subscribers=subscribers
+        )
+
     # Removing the human flow from this
     # we could theoretically add back in later, but it's a lot of typing to talk to these 'bots
     #console.print()
     # player_name = print_prompt("What is your name, player?")
-    handler = ResistanceCoupGameHandler("There's no one steering this ship", 5)
+    return handler_class(
+        "There's no one steering this ship",
+        5,
+        concurrent_deliberation=os.getenv("AI_CONCURRENT_DELIBERATION") == "1",
+        pacing=pacing,
+        subscribers=subscribers,
+    )
+
+
+def play_until_won(handler, name: str, games_played: int, event_log) -> None:
+    """Take turns until we have a winner, checkpointing in between"""
+    from src.handler.checkpoint import (
+        game_checkpoint_every,
+        game_checkpoint_path,
+        remove_checkpoint,
+        save_checkpoint,
+    )
+
+    end_state = False
+    while not end_state:
+        handler.print_game_state()
+
+        console.print()
+        panel = Panel(Text(f"Turn {handler.turn + 1}", style="bold", justify="left"), expand=False)
+        console.print(panel)
+
+        end_state = handler.handle_turn()
+
+        # Checkpoint between turns, so an outage or Ctrl-C only costs the turn in progress
+        if (
+            not end_state
+            and game_checkpoint_path
+            and game_checkpoint_every > 0
+            and handler.turn % game_checkpoint_every == 0
+        ):
+            save_checkpoint(
+                {
+                    "name": name,
+                    "games_played": games_played,
+                    "event_log_size": event_log.checkpoint() if event_log else None,
+                    "game": handler.to_checkpoint(),
+                },
+                game_checkpoint_path,
+            )
+
+    if game_checkpoint_path:
+        remove_checkpoint(game_checkpoint_path)
+
+
+def report_game(name: str) -> None:
+    """Write out the metrics and timeline of the game just played"""
+    from src.utils.instrumentation import instrumentation, metrics_dir
+    from src.utils.tracing import trace_dir, tracer
+
+    if metrics_dir:
+        instrumentation.export(metrics_dir, name)
+        print_text(f"Agent metrics written to {os.path.join(metrics_dir, name)}.json/.prom")
+    if trace_dir:
+        print_text(f"Turn timeline written to {tracer.export(trace_dir, name)}")
+
+
+def report_session(event_log) -> None:
+    """Say how the response cache did, and where the session's event log went"""
+    from src.models.agents.llm_client_factory import get_response_cache
+
+    if (response_cache := get_response_cache()) is not None:
+        print_text(f"LLM response cache: {response_cache.stats()}")
+
+    if event_log:
+        event_log.close()
+        print_text(f"Game events written to {event_log.path}")
+
+
+def play(args: argparse.Namespace):
+    if not args.fast_start:
+        print_title()
+
+    started = time.perf_counter()
+    handler_class = import_game_handler()
+    imported = time.perf_counter()
+
+    from src.engine.event_log import JsonlEventLog, game_log_dir
+    from src.utils.instrumentation import instrumentation
+    from src.utils.tracing import tracer
+
+    checkpoint = load_checkpoint_to_resume(args)
+
+    # A resumed game carries on with the event log it started, minus any half-played turn
+    name = checkpoint["name"] if checkpoint else f"game-{time.strftime('%Y%m%d-%H%M%S')}"
+    event_log = JsonlEventLog(os.path.join(game_log_dir, f"{name}.jsonl")) if game_log_dir else None
+    if event_log and checkpoint and checkpoint["event_log_size"] is not None:
+        event_log.rewind(checkpoint["event_log_size"])
+
+    handler = create_handler(handler_class, args, checkpoint, [event_log] if event_log else None)
+    created = time.perf_counter()
 
     #console.print()
-    game_ready = print_confirm("Ready to start?")
+    game_ready = args.fast_start or checkpoint is not None or print_confirm("Ready to start?")
+    report_timings = args.timings
+    games_played = checkpoint["games_played"] if checkpoint else 0
 
     # Play the game
     while game_ready:
-        handler.setup_game()
-
-        # Take turns until we have a winner
-        end_state = False
-        turn_count = 0
-        while not end_state:
-            turn_count += 1
-
-            handler.print_game_state()
+        # Every game gets metrics and a timeline of its own
+        instrumentation.reset()
+        tracer.reset()
+        game_name = name if games_played == 0 else f"{name}-{games_played + 1}"
 
-            console.print()
-            panel = Panel(Text(f"Turn {turn_count}", style="bold", justify="left"), expand=False)
-            console.print(panel)
+        dealing = time.perf_counter()
+        if checkpoint:
+            print_text(f"Resuming {game_name} after turn {handler.turn}")
+            checkpoint = None
+        else:
+            handler.setup_game()
+        if report_timings:
+            dealt = time.perf_counter()
+            print_startup_timings(imported - started, created - imported, dealt - dealing)
+            report_timings = False
 
-            end_state = handler.handle_turn()
+        play_until_won(handler, name, games_played, event_log)
+        report_game(game_name)
+        games_played += 1
 
         console.print()
-        game_ready = print_confirm("Want to play again?")
+        game_ready = not args.fast_start and print_confirm("Want to play again?")
 
     print_blank()
     print_text("GAME OVER", rainbow=True)
+    report_session(event_log)
+
+
+def simulate(args: argparse.Namespace):
+    from src.engine.tournament import simulate, summarize_by_dimension
+
+    completed = 0
+
+    def report_progress(result):
+        nonlocal completed
+        completed += 1
+        if completed % max(1, args.games // 10) == 0 or completed == args.games:
+            print_text(f"{completed}/{args.games} games played")
+
+    rows = simulate(
+        number_of_games=args.games,
+        workers=args.workers,
+        number_of_players=args.players,
+        seed=args.seed,
+        output_dir=args.output,
+        on_result=report_progress,
+    )
+
+    table = Table("Seat", "Games", "Wins", "Win rate")
+    for row in summarize_by_dimension(rows)["seat"]:
+        table.add_row(row["value"], str(row["games"]), str(row["wins"]), f"{row['win_rate']:.1%}")
+    print_table(table)
+    print_text(f"Per-game results and win rates by trait were written to {args.output}")
+
+
+def replay(args: argparse.Namespace):
+    from src.engine.event_log import read_events, split_games
+    from src.engine.replay import GameReplayer, ReplayError
+
+    games = 0
+    turns = 0
+    for path in args.logs:
+        for events in split_games(read_events(path)):
+            games += 1
+            replayer = GameReplayer(verify=not args.no_verify)
+            try:
+                for turn in replayer.replay(events):
+                    turns += 1
+                    if args.summary:
+                        continue
+                    target_string = f" against {turn.target}" if turn.target else ""
+                    players = ", ".join(
+                        f"{player} ({player.coins} coins, {len(player.cards)} cards)"
+                        for player in turn.state.players
+                        if player.is_active
+                    )
+                    action = f"Turn {turn.turn}: {turn.player} chose {turn.action}{target_string}"
+                    print_texts(action, f"\n\t{players}")
+            except ReplayError as e:
+                print_text(f"[bold red]{path}, game {games}: {e}[/]", with_markup=True)
+                continue
+
+            state = replayer.state
+            winner = state.players[state.winner].name if state.winner is not None else "nobody"
+            print_text(f"{path}, game {games}: {state.turn} turns, won by {winner}")
+
+    print_text(f"Replayed {games} games ({turns} turns) without calling any model")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="The Resistance: Coup, played by AI agents")
+    subparsers = parser.add_subparsers(dest="command")
+
+    simulate_parser = subparsers.add_parser(
+        "simulate", help="Play a batch of headless games with scripted, trait-driven players"
+    )
+    simulate_parser.add_argument("--games", type=int, default=1000, help="Number of games")
+    simulate_parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes"
+    )
+    simulate_parser.add_argument("--players", type=int, default=5, help="Players per game")
+    simulate_parser.add_argument("--seed", type=int, default=0, help="Seed of the first game")
+    simulate_parser.add_argument(
+        "--output", default="simulation", help="Directory for results.jsonl and win_rates.csv"
+    )
+
+    replay_parser = subparsers.add_parser(
+        "replay", help="Rebuild recorded games turn by turn from their event logs (GAME_LOG_DIR)"
+    )
+    replay_parser.add_argument("logs", nargs="+", help="JSONL event logs to replay")
+    replay_parser.add_argument(
+        "--summary", action="store_true", help="Only print one line per game"
+    )
+    replay_parser.add_argument(
+        "--no-verify",
+        action="store_true",
+        help="Do not check the rebuilt state against the state recorded after every turn",
+    )
+
+    parser.add_argument(
+        "--fast-start",
+        action="store_true",
+        help="Skip the title screen and the prompts, play a single game without pauses",
+    )
+    parser.add_argument(
+        "--pacing",
+        choices=["real-time", "batch", "accelerated"],
+        help="Pause between messages as for spectators, not at all, or GAME_PACING_SPEED times "
+        "faster (overrides GAME_PACING)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Carry on with the game that was interrupted, from its last checkpoint "
+        "(GAME_CHECKPOINT_PATH)",
+    )
+    parser.add_argument(
+        "--timings", action="store_true", help="Report import and setup time before the first turn"
+    )
+
+    return parser.parse_args()
+
+
+def main(args: argparse.Namespace):
+    if args.command == "simulate":
+        simulate(args)
+    elif args.command == "replay":
+        replay(args)
+    else:
+        try:
+            play(args)
+        except KeyboardInterrupt:
+            print_blank()
+            print_text("GAME OVER", rainbow=True)
+            sys.exit(130)
 
 
 if __name__ == "__main__":
-    try:
-        main()
-    except KeyboardInterrupt:
-        print_blank()
-        print_text("GAME OVER", rainbow=True)
-        sys.exit(130)
+    main(parse_args())
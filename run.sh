@@ -3,4 +3,6 @@ export AI_CHATINESS=.5
 export SEE_AI_RATIONALE=1
 export SEE_AI_THOUGHTS=1
 export SEE_AI_CARDS=0
+export AI_CONCURRENT_DELIBERATION=1
+export GAME_PACING=real-time
 python coup.py
\ No newline at end of file
@@ -0,0 +1,322 @@
+import random
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from src.engine.events import EventBus, EventSubscriber, EventType, GameEvent
+from src.engine.policies import Policy
+from src.engine.state import GameState, PlayerState, responder_order
+from src.models.action import (
+    ACTIONS,
+    ASSASSINATION_COINS,
+    COUNTER_ACTIONS,
+    COUP_COINS,
+    FORCED_COUP_COINS,
+    LEGAL_ACTION_TYPES,
+    STEAL_COINS,
+    TREASURY_PAYOUTS,
+    Action,
+    ActionType,
+)
+from src.models.card import COPIES_PER_CARD, CardType, Deck
+
+COUNTER_CARDS = {
+    action_type: counter.associated_card_type for action_type, counter in COUNTER_ACTIONS.items()
+}
+
+STARTING_COINS = 2
+TREASURY_COINS = 50
+
+T = TypeVar("T")
+
+
+def resolve_action(
+    action: Action,
+    challenge_claim: Callable[[], Optional[bool]],
+    counter: Callable[[], Optional[T]],
+    challenge_counter: Callable[[T], Optional[bool]],
+    execute: Callable[[bool], None],
+) -> None:
+    """Settle a declared action: the rules shared by CoupEngine and ResistanceCoupGameHandler,
+    which supply the moves.
+
+    A challenge (of the claim, or of the counter of whoever blocks it) comes back as None if
+    nobody challenged, True if the claim held up and False if it was a bluff. `execute` is told
+    whether the action was blocked.
+    """
+    claim_upheld = challenge_claim() if action.can_be_challenged else None
+    if claim_upheld is False:
+        # The bluff is called, and the action does not take place
+        return
+    if claim_upheld is True or not action.can_be_countered:
+        # A claim that held up can no longer be blocked
+        execute(False)
+        return
+
+    blocker = counter()
+    execute(blocker is not None and challenge_counter(blocker) is not False)
+
+
+class CoupEngine:
+    """A headless implementation of the rules run by ResistanceCoupGameHandler.
+
+    Moves come from one scripted `Policy` per seat and are applied to a `GameState`; every
+    transition is published as a `GameEvent`, so recording the game is left to subscribers. All randomness flows through a per-game generator seeded by `seed`.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        policies: Sequence[Policy],
+        seed: Optional[int] = None,
+        subscribers: Optional[List[EventSubscriber]] = None,
+    ):
+        if len(names) != len(policies):
+            raise ValueError("Every player needs exactly one policy")
+
+        self.rng = random.Random(seed)
+        self.events = EventBus(subscribers)
+        self.policies = list(policies)
+        self.state = GameState(players=[PlayerState(name=name) for name in names])
+
+    def _emit(self, event_type: EventType, **kwargs) -> None:
+        if self.events.has_subscribers:
+            self.events.emit(GameEvent(event_type=event_type, turn=self.state.turn, **kwargs))
+
+    def _name(self, seat: Optional[int]) -> Optional[str]:
+        return None if seat is None else self.state.players[seat].name
+
+    def setup(self) -> GameState:
+        state = self.state
+        state.deck = Deck.full(COPIES_PER_CARD)
+        state.discard = []
+        state.treasury = TREASURY_COINS - STARTING_COINS * len(state.players)
+        state.turn = 0
+        state.winner = None
+        state.action_counts.clear()
+
+        self._emit(
+            EventType.game_started,
+            amount=len(state.players),
+            deck=[card.value for card in state.deck],
+        )
+        for player in state.players:
+            player.cards = [state.deck.draw(self.rng), state.deck.draw(self.rng)]
+            player.coins = STARTING_COINS
+            player.is_active = True
+            self._emit(
+                EventType.cards_dealt,
+                player=player.name,
+                cards=[card.value for card in player.cards],
+                amount=player.coins,
+            )
+
+        state.current_player_index = self.rng.randrange(len(state.players))
+        return state
+
+    def legal_actions(self, seat: int) -> Tuple[ActionType, ...]:
+        return LEGAL_ACTION_TYPES[min(self.state.players[seat].coins, FORCED_COUP_COINS)]
+
+    def _take_coins_from_treasury(self, seat: int, number_of_coins: int) -> None:
+        coins = min(number_of_coins, self.state.treasury)
+        self.state.treasury -= coins
+        self.state.players[seat].coins += coins
+        self._emit(EventType.coins_moved, player=self._name(seat), target="Treasury", amount=coins)
+
+    def _give_coins_to_treasury(self, seat: int, number_of_coins: int) -> None:
+        self.state.treasury += number_of_coins
+        self.state.players[seat].coins -= number_of_coins
+        self._emit(
+            EventType.coins_moved,
+            player=self._name(seat),
+            target="Treasury",
+            amount=-number_of_coins,
+        )
+
+    def _lose_influence(self, seat: int) -> None:
+        player = self.state.players[seat]
+        if not player.cards:
+            return
+
+        card = self.policies[seat].choose_discard(self.state, seat, self.rng)
+        if card not in player.cards:
+            raise ValueError(f"{player} cannot discard {card}, which they do not hold")
+
+        player.cards.remove(card)
+        self.state.discard.append(card)
+        self._emit(EventType.influence_lost, player=player.name, cards=[card.value])
+
+    def _swap_card(self, seat: int, card: CardType) -> None:
+        # Equivalent to reshuffling the whole deck before drawing from the top
+        self.state.deck.put_back(card)
+        new_card = self.state.deck.draw(self.rng)
+        self.state.players[seat].cards.append(new_card)
+        if self.events.has_subscribers:
+            self._emit(
+                EventType.card_swapped,
+                player=self._name(seat),
+                cards=[card.value],
+                drawn=[new_card.value],
+                deck=[deck_card.value for deck_card in self.state.deck],
+            )
+
+    def _challenge(self, claimant: int, card: CardType, responders: List[int]) -> Optional[bool]:
+        """Offer each responder, in order, the chance to challenge `claimant`'s claim to `card`.
+
+        Returns None if nobody challenged, True if the claim held up and False if it was a bluff.
+        """
+        state = self.state
+        for seat in responders:
+            if not self.policies[seat].should_challenge(state, seat, claimant, card, self.rng):
+                continue
+
+            self._emit(
+                EventType.challenge_declared,
+                player=self._name(seat),
+                target=self._name(claimant),
+                cards=[card.value],
+            )
+            claimant_cards = state.players[claimant].cards
+            if card in claimant_cards:
+                claimant_cards.remove(card)
+                self._emit(EventType.card_revealed, player=self._name(claimant), cards=[card.value])
+                self._lose_influence(seat)
+                self._swap_card(claimant, card)
+                return True
+
+            self._lose_influence(claimant)
+            return False
+
+        return None
+
+    def _counter(self, actor: int, action_type: ActionType) -> Optional[int]:
+        card = COUNTER_CARDS[action_type]
+        for seat in responder_order(self.state.players, actor):
+            if self.policies[seat].should_block(
+                self.state, seat, actor, action_type, card, self.rng
+            ):
+                self._emit(
+                    EventType.counter_declared,
+                    player=self._name(seat),
+                    target=self._name(actor),
+                    action=action_type.value,
+                    cards=[card.value],
+                )
+                return seat
+        return None
+
+    def _execute_action(
+        self, actor: int, action_type: ActionType, target: Optional[int], countered: bool
+    ):
+        state = self.state
+        match action_type:
+            case ActionType.income:
+                self._take_coins_from_treasury(actor, TREASURY_PAYOUTS[action_type])
+            case ActionType.foreign_aid:
+                if not countered:
+                    self._take_coins_from_treasury(actor, TREASURY_PAYOUTS[action_type])
+            case ActionType.coup:
+                self._give_coins_to_treasury(actor, COUP_COINS)
+                self._lose_influence(target)
+            case ActionType.tax:
+                self._take_coins_from_treasury(actor, TREASURY_PAYOUTS[action_type])
+            case ActionType.assassinate:
+                self._give_coins_to_treasury(actor, ASSASSINATION_COINS)
+                if not countered:
+                    self._lose_influence(target)
+            case ActionType.steal:
+                if not countered:
+                    steal_amount = min(state.players[target].coins, STEAL_COINS)
+                    state.players[target].coins -= steal_amount
+                    state.players[actor].coins += steal_amount
+                    self._emit(
+                        EventType.coins_moved,
+                        player=self._name(actor),
+                        target=self._name(target),
+                        amount=steal_amount,
+                    )
+            case ActionType.exchange:
+                hand = state.players[actor].cards
+                drawn = [state.deck.draw(self.rng), state.deck.draw(self.rng)]
+                hand.extend(drawn)
+                returned = self.policies[actor].choose_exchange(state, actor, self.rng)
+                for card in returned:
+                    hand.remove(card)
+                    state.deck.put_back(card)
+                self._emit(
+                    EventType.cards_exchanged,
+                    player=self._name(actor),
+                    cards=[card.value for card in returned],
+                    drawn=[card.value for card in drawn],
+                    amount=len(returned),
+                )
+
+    def _validate_action(self, actor: int, action_type: ActionType, target: Optional[int]) -> None:
+        if action_type not in self.legal_actions(actor):
+            raise ValueError(f"{self._name(actor)} cannot take {action_type.value} right now")
+        if ACTIONS[action_type].requires_target and target not in self.state.opponents_of(actor):
+            raise ValueError(
+                f"{self._name(actor)} picked an invalid target for {action_type.value}"
+            )
+
+    def play_turn(self) -> bool:
+        """Play the current player's turn; returns True once the game has a winner"""
+        state = self.state
+        state.turn += 1
+        actor = state.current_player_index
+        self._emit(EventType.turn_started, player=self._name(actor))
+
+        action_type, target = self.policies[actor].choose_action(
+            state, actor, self.legal_actions(actor), self.rng
+        )
+        action: Action = ACTIONS[action_type]
+        if not action.requires_target:
+            target = None
+        self._validate_action(actor, action_type, target)
+        state.action_counts[action_type.value] += 1
+        self._emit(
+            EventType.action_declared,
+            player=self._name(actor),
+            target=self._name(target),
+            action=action_type.value,
+        )
+
+        resolve_action(
+            action,
+            challenge_claim=lambda: self._challenge(
+                actor, action.associated_card_type, responder_order(state.players, actor, target)
+            ),
+            counter=lambda: self._counter(actor, action_type),
+            challenge_counter=lambda seat: self._challenge(
+                seat, COUNTER_CARDS[action_type], responder_order(state.players, seat)
+            ),
+            execute=lambda countered: self._execute_action(actor, action_type, target, countered),
+        )
+
+        self._remove_defeated_players()
+        if len(state.active_players) == 1:
+            state.winner = state.active_players[0]
+            self._emit(EventType.game_won, player=self._name(state.winner))
+            return True
+
+        self._next_player()
+        return False
+
+    def _remove_defeated_players(self) -> None:
+        for seat, player in enumerate(self.state.players):
+            if player.is_active and not player.cards:
+                player.is_active = False
+                self._give_coins_to_treasury(seat, player.coins)
+                self._emit(EventType.player_eliminated, player=player.name)
+
+    def _next_player(self) -> None:
+        state = self.state
+        number_of_players = len(state.players)
+        state.current_player_index = (state.current_player_index + 1) % number_of_players
+        while not state.current_player.is_active:
+            state.current_player_index = (state.current_player_index + 1) % number_of_players
+
+    def play_game(self, max_turns: int = 1000) -> GameState:
+        """Set up and play a whole game (or until `max_turns`, leaving `winner` as None)"""
+        self.setup()
+        while self.state.turn < max_turns and not self.play_turn():
+            pass
+        return self.state
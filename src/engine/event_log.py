@@ -0,0 +1,92 @@
+import json
+import os
+import time
+from typing import Iterator, List
+
+from src.engine.events import EventType, GameEvent
+
+# Where the handler appends the event log of every game (nothing is logged if unset)
+game_log_dir = os.getenv("GAME_LOG_DIR")
+
+# Buffered events are written out every this many events, or this many seconds
+game_log_flush_events = int(os.getenv("GAME_LOG_FLUSH_EVENTS", 256))
+game_log_flush_seconds = float(os.getenv("GAME_LOG_FLUSH_SECONDS", 5.0))
+
+
+class JsonlEventLog:
+    """An event subscriber that appends every event to `path` as one JSON line.
+
+    Lines are buffered and written out every `flush_events` events or `flush_seconds` seconds,
+    whichever comes first, and at the end of every game. The file is only ever appended to, so
+    one log can hold any number of games.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_events: int = game_log_flush_events,
+        flush_seconds: float = game_log_flush_seconds,
+    ):
+        self.path = path
+        self.flush_events = flush_events
+        self.flush_seconds = flush_seconds
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, event: GameEvent) -> None:
+        self._buffer.append(json.dumps(event.to_dict()))
+        if (
+            len(self._buffer) >= self.flush_events
+            or time.monotonic() - self._last_flush >= self.flush_seconds
+            or event.event_type == EventType.game_won
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            with open(self.path, "a") as log_file:
+                log_file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def checkpoint(self) -> int:
+        """Write out the buffered events, and return how far into the file they reach"""
+        self.flush()
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def rewind(self, size: int) -> None:
+        """Cut the file back to `size`, as returned by `checkpoint`, dropping the events of a turn
+        that was interrupted (and will be played again) after it"""
+        self._buffer = []
+        if os.path.exists(self.path):
+            with open(self.path, "r+") as log_file:
+                log_file.truncate(size)
+
+    def close(self) -> None:
+        self.flush()
+
+
+def read_events(path: str) -> Iterator[GameEvent]:
+    """Read the events back from a log, skipping a line cut short by a crash"""
+    with open(path) as log_file:
+        for line in log_file:
+            try:
+                yield GameEvent.from_dict(json.loads(line))
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                continue
+
+
+def split_games(events: Iterator[GameEvent]) -> Iterator[List[GameEvent]]:
+    """Group a stream of events into games, each starting at its `game_started` event"""
+    game: List[GameEvent] = []
+    for event in events:
+        if event.event_type == EventType.game_started and game:
+            yield game
+            game = []
+        game.append(event)
+    if game:
+        yield game
@@ -0,0 +1,73 @@
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+
+class EventType(str, Enum):
+    game_started = "Game Started"
+    cards_dealt = "Cards Dealt"
+    turn_started = "Turn Started"
+    action_declared = "Action Declared"
+    challenge_declared = "Challenge Declared"
+    card_revealed = "Card Revealed"
+    card_swapped = "Card Swapped"
+    influence_lost = "Influence Lost"
+    counter_declared = "Counter Declared"
+    coins_moved = "Coins Moved"
+    cards_exchanged = "Cards Exchanged"
+    player_eliminated = "Player Eliminated"
+    game_won = "Game Won"
+    message = "Message"
+    turn_ended = "Turn Ended"
+
+
+@dataclass
+class GameEvent:
+    event_type: EventType
+    turn: int
+    player: Optional[str] = None
+    target: Optional[str] = None
+    action: Optional[str] = None
+    cards: Optional[List[str]] = None
+    amount: Optional[int] = None
+    succeeded: Optional[bool] = None
+    # Cards taken from the deck, and the cards left in it afterwards
+    drawn: Optional[List[str]] = None
+    deck: Optional[List[str]] = None
+    # What was said (or announced) at the table
+    text: Optional[str] = None
+    # The full state at the end of a turn, for replays to check themselves against
+    state: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> dict:
+        event = {key: value for key, value in asdict(self).items() if value is not None}
+        event["event_type"] = self.event_type.value
+        return event
+
+    @classmethod
+    def from_dict(cls, event: Dict[str, Any]) -> "GameEvent":
+        return cls(**{**event, "event_type": EventType(event["event_type"])})
+
+
+EventSubscriber = Callable[[GameEvent], None]
+
+
+class EventBus:
+    """Fan game events out to any number of subscribers (loggers, recorders...)"""
+
+    def __init__(self, subscribers: Optional[List[EventSubscriber]] = None):
+        self._subscribers: List[EventSubscriber] = list(subscribers or [])
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, subscriber: EventSubscriber) -> None:
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: EventSubscriber) -> None:
+        self._subscribers.remove(subscriber)
+
+    def emit(self, event: GameEvent) -> None:
+        for subscriber in self._subscribers:
+            subscriber(event)
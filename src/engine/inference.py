@@ -0,0 +1,286 @@
+import os
+import random
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from math import comb
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from src.models.card import COPIES_PER_CARD, CardType
+
+# How often a player is taken to claim a role they do not hold
+inference_bluff_rate = float(os.getenv("AI_INFERENCE_BLUFF_RATE", 0.3))
+
+# Beyond this many combinations of hands to weigh, the odds are estimated from random deals
+inference_exact_limit = int(os.getenv("AI_INFERENCE_EXACT_LIMIT", 65536))
+inference_samples = int(os.getenv("AI_INFERENCE_SAMPLES", 2000))
+
+CARD_TYPES = list(CardType)
+
+# For each player: the chance they hold at least one card of each type
+HandOdds = Dict[str, Dict[CardType, float]]
+
+
+@dataclass
+class PublicRecord:
+    """What a player has shown the table about the hand they hold now"""
+
+    claims: Set[CardType] = field(default_factory=set)
+    ruled_out: Set[CardType] = field(default_factory=set)
+
+    def key(self) -> Tuple:
+        return (
+            tuple(sorted(card.value for card in self.claims)),
+            tuple(sorted(card.value for card in self.ruled_out)),
+        )
+
+
+def _hands(pool: Tuple[int, ...], size: int, start: int = 0) -> Iterator[Tuple[int, ...]]:
+    """Every hand of `size` cards (as counts per card type) that `pool` can make"""
+    if size == 0:
+        yield (0,) * len(pool)
+        return
+    for index in range(start, len(pool)):
+        if pool[index]:
+            rest = pool[:index] + (pool[index] - 1,) + pool[index + 1 :]
+            for hand in _hands(rest, size - 1, index):
+                yield hand[:index] + (hand[index] + 1,) + hand[index + 1 :]
+
+
+def _at_least_one(pool: Tuple[int, ...], size: int) -> List[float]:
+    """The chance that `size` cards drawn at random from `pool` include each card type"""
+    total = sum(pool)
+    if size <= 0 or total == 0:
+        return [0.0] * len(pool)
+    return [1 - comb(total - count, size) / comb(total, size) for count in pool]
+
+
+class HandInference:
+    """Works out the odds of what each opponent holds from public information alone.
+
+    The handler reports what the whole table sees: roles claimed (through actions and counters),
+    bluffs that were called, cards lost, and hands refreshed by an exchange or by swapping a
+    revealed card. Together with the discard pile and the viewer's own cards, that gives the
+    chance that each opponent holds each card type. Every deal consistent with what is known is
+    equally likely, except that a claim makes hands holding the claimed card more likely (one
+    without it counts `bluff_rate` as much), and a called bluff rules the card out.
+
+    Players who showed nothing are no different from the deck, so only those with a record are
+    weighed hand by hand: exactly, or from `samples` random deals (seeded by the public
+    information, so the odds are reproducible) where that would mean more than `exact_limit`
+    combinations. Results are memoized on the public information they were computed from.
+    """
+
+    def __init__(
+        self,
+        bluff_rate: float = inference_bluff_rate,
+        exact_limit: int = inference_exact_limit,
+        samples: int = inference_samples,
+        cache_size: int = 256,
+    ):
+        self.bluff_rate = bluff_rate
+        self.exact_limit = exact_limit
+        self.samples = samples
+        self.cache_size = cache_size
+        self._records: Dict[str, PublicRecord] = {}
+        self._cache: OrderedDict = OrderedDict()
+        # Bumped whenever the public information changes
+        self.version = 0
+
+    def reset(self) -> None:
+        self._records.clear()
+        self._cache.clear()
+        self.version += 1
+
+    def to_dict(self) -> Dict[str, Dict[str, List[str]]]:
+        return {
+            player: {
+                "claims": [card.value for card in record.claims],
+                "ruled_out": [card.value for card in record.ruled_out],
+            }
+            for player, record in self._records.items()
+        }
+
+    def load(self, records: Dict[str, Dict[str, List[str]]]) -> None:
+        self.reset()
+        for player, record in records.items():
+            self._records[player] = PublicRecord(
+                claims={CardType(card) for card in record["claims"]},
+                ruled_out={CardType(card) for card in record["ruled_out"]},
+            )
+
+    def _record(self, player: str) -> PublicRecord:
+        self.version += 1
+        return self._records.setdefault(player, PublicRecord())
+
+    def claimed(self, player: str, card_type: CardType) -> None:
+        self._record(player).claims.add(card_type)
+
+    def caught_bluffing(self, player: str, card_type: CardType) -> None:
+        record = self._record(player)
+        record.claims.discard(card_type)
+        record.ruled_out.add(card_type)
+
+    def lost_card(self, player: str, card_type: CardType) -> None:
+        """A claim is spent once the card is lost (the player may well have had it)"""
+        self._record(player).claims.discard(card_type)
+
+    def hand_refreshed(self, player: str) -> None:
+        """The player exchanged, or swapped a revealed card: what they showed no longer holds"""
+        self.version += 1
+        self._records.pop(player, None)
+
+    def _likelihood(self, record: PublicRecord, hand: Tuple[int, ...]) -> float:
+        weight = 1.0
+        for index, card_type in enumerate(CARD_TYPES):
+            if hand[index]:
+                if card_type in record.ruled_out:
+                    return 0.0
+            elif card_type in record.claims:
+                weight *= self.bluff_rate
+        return weight
+
+    def odds(
+        self,
+        own_cards: Sequence[CardType],
+        opponents: Sequence[Tuple[str, int]],
+        discard: Sequence[CardType],
+    ) -> HandOdds:
+        """The odds for each of `opponents` (name and number of cards) holding each card type,
+        as seen by a player holding `own_cards`"""
+        pool = [COPIES_PER_CARD] * len(CARD_TYPES)
+        for card_type in [*own_cards, *discard]:
+            pool[CARD_TYPES.index(card_type)] -= 1
+        opponents = [(name, size) for name, size in opponents if size > 0]
+        records = [self._records.get(name) for name, _ in opponents]
+
+        key = (
+            tuple(pool),
+            tuple(
+                (name, size, record.key() if record else None)
+                for (name, size), record in zip(opponents, records)
+            ),
+        )
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        odds = self._compute(tuple(max(count, 0) for count in pool), opponents, records, key)
+        self._cache[key] = odds
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return odds
+
+    def _compute(
+        self,
+        pool: Tuple[int, ...],
+        opponents: List[Tuple[str, int]],
+        records: List[Optional[PublicRecord]],
+        key: Tuple,
+    ) -> HandOdds:
+        weighed = [
+            (name, size, record)
+            for (name, size), record in zip(opponents, records)
+            if record is not None and (record.claims or record.ruled_out)
+        ]
+        weighed_names = {name for name, _, _ in weighed}
+        others = [(name, size) for name, size in opponents if name not in weighed_names]
+
+        combinations = 1
+        for _, size, _ in weighed:
+            combinations *= len(list(_hands(pool, size)))
+        if combinations <= self.exact_limit:
+            outcomes = self._enumerate(pool, weighed)
+        else:
+            outcomes = self._sample(pool, weighed, random.Random(repr(key)))
+
+        # Should the evidence contradict itself (or no sample fit it), fall back to ignoring it
+        total = sum(weight for _, weight in outcomes)
+        if total == 0:
+            outcomes = [((), 1.0)]
+            others, weighed, total = list(opponents), [], 1.0
+
+        sums = {name: [0.0] * len(CARD_TYPES) for name, _ in opponents}
+        for hands, weight in outcomes:
+            remaining = list(pool)
+            for (name, _, _), hand in zip(weighed, hands):
+                for index, count in enumerate(hand):
+                    remaining[index] -= count
+                    if count:
+                        sums[name][index] += weight
+            for name, size in others:
+                for index, chance in enumerate(_at_least_one(tuple(remaining), size)):
+                    sums[name][index] += weight * chance
+
+        return {
+            name: {
+                card_type: sums[name][index] / total for index, card_type in enumerate(CARD_TYPES)
+            }
+            for name, _ in opponents
+        }
+
+    def _enumerate(
+        self, pool: Tuple[int, ...], weighed: List[Tuple[str, int, PublicRecord]]
+    ) -> List[Tuple[Tuple, float]]:
+        """Every combination of hands for the weighed players, with its probability (up to a
+        constant): the number of deals that give it, times the likelihood of what was shown"""
+        outcomes: List[Tuple[Tuple, float]] = []
+
+        def visit(position: int, remaining: Tuple[int, ...], hands: Tuple, weight: float):
+            if position == len(weighed):
+                outcomes.append((hands, weight))
+                return
+            _, size, record = weighed[position]
+            for hand in _hands(remaining, size):
+                likelihood = self._likelihood(record, hand)
+                if likelihood == 0:
+                    continue
+                ways = 1
+                for count, taken in zip(remaining, hand):
+                    ways *= comb(count, taken)
+                rest = tuple(count - taken for count, taken in zip(remaining, hand))
+                visit(position + 1, rest, hands + (hand,), weight * ways * likelihood)
+
+        visit(0, pool, (), 1.0)
+        return outcomes
+
+    def _sample(
+        self,
+        pool: Tuple[int, ...],
+        weighed: List[Tuple[str, int, PublicRecord]],
+        rng: random.Random,
+    ) -> List[Tuple[Tuple, float]]:
+        """Random deals of the hidden cards, each weighed by the likelihood of what was shown"""
+        cards = [index for index, count in enumerate(pool) for _ in range(count)]
+        outcomes: List[Tuple[Tuple, float]] = []
+        for _ in range(self.samples):
+            dealt = rng.sample(cards, sum(size for _, size, _ in weighed))
+            hands = []
+            weight = 1.0
+            for _, size, record in weighed:
+                hand = [0] * len(pool)
+                for index in dealt[:size]:
+                    hand[index] += 1
+                dealt = dealt[size:]
+                hands.append(tuple(hand))
+                weight *= self._likelihood(record, hands[-1])
+            outcomes.append((tuple(hands), weight))
+        return outcomes
+
+
+def render_hand_odds(odds: HandOdds) -> str:
+    """A compact markdown table of the odds, for prompts"""
+    if not odds:
+        return ""
+    header = " | ".join(card_type.value for card_type in CARD_TYPES)
+    rows = [
+        f"| {name} | " + " | ".join(f"{chances[card_type]:.0%}" for card_type in CARD_TYPES) + " |"
+        for name, chances in odds.items()
+    ]
+    return "\n".join(
+        [
+            "Hand odds (chance each player holds at least one, from what the table has seen):",
+            f"| Player | {header} |",
+            "| --- |" + " --- |" * len(CARD_TYPES),
+            *rows,
+        ]
+    )
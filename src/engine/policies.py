@@ -0,0 +1,132 @@
+import random
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+from src.engine.state import GameState
+from src.models.action import ActionType
+from src.models.card import CardType
+
+TARGETED_ACTIONS = {ActionType.coup, ActionType.assassinate, ActionType.steal}
+
+
+class Policy(ABC):
+    """A scripted decision maker for one seat of a headless game.
+
+    Policies receive the full game state, but should only look at public information plus
+    their own seat's cards. `rng` is the game's own generator, so seeded games are reproducible.
+    """
+
+    @abstractmethod
+    def choose_action(
+        self, state: GameState, seat: int, legal_actions: Sequence[ActionType], rng: random.Random
+    ) -> Tuple[ActionType, Optional[int]]:
+        """Choose an action and (for targeted actions) the seat to target"""
+        pass
+
+    @abstractmethod
+    def should_challenge(
+        self, state: GameState, seat: int, claimant: int, card: CardType, rng: random.Random
+    ) -> bool:
+        """Choose whether to challenge `claimant`'s claim to hold `card`"""
+        pass
+
+    @abstractmethod
+    def should_block(
+        self,
+        state: GameState,
+        seat: int,
+        actor: int,
+        action: ActionType,
+        card: CardType,
+        rng: random.Random,
+    ) -> bool:
+        """Choose whether to block `actor`'s action by claiming `card`"""
+        pass
+
+    def choose_discard(self, state: GameState, seat: int, rng: random.Random) -> CardType:
+        """Choose which card to lose"""
+        return rng.choice(state.players[seat].cards)
+
+    def choose_exchange(self, state: GameState, seat: int, rng: random.Random) -> List[CardType]:
+        """Choose the two cards (from a hand that already includes the drawn ones) to give back"""
+        return rng.sample(state.players[seat].cards, 2)
+
+
+class RandomPolicy(Policy):
+    """Pick uniformly among legal actions and targets, bluffing freely"""
+
+    def __init__(self, challenge_rate: float = 0.15, block_rate: float = 0.2):
+        self.challenge_rate = challenge_rate
+        self.block_rate = block_rate
+
+    def choose_action(
+        self, state: GameState, seat: int, legal_actions: Sequence[ActionType], rng: random.Random
+    ) -> Tuple[ActionType, Optional[int]]:
+        action = rng.choice(legal_actions)
+        target = None
+        if action in TARGETED_ACTIONS:
+            target = rng.choice(state.opponents_of(seat))
+        return action, target
+
+    def should_challenge(
+        self, state: GameState, seat: int, claimant: int, card: CardType, rng: random.Random
+    ) -> bool:
+        return rng.random() < self.challenge_rate
+
+    def should_block(
+        self,
+        state: GameState,
+        seat: int,
+        actor: int,
+        action: ActionType,
+        card: CardType,
+        rng: random.Random,
+    ) -> bool:
+        return rng.random() < self.block_rate
+
+
+class HonestPolicy(Policy):
+    """Never bluff: only claim roles actually held, and call out claims more often when the
+    public information makes them unlikely"""
+
+    def __init__(self, challenge_rate: float = 0.1):
+        self.challenge_rate = challenge_rate
+
+    def choose_action(
+        self, state: GameState, seat: int, legal_actions: Sequence[ActionType], rng: random.Random
+    ) -> Tuple[ActionType, Optional[int]]:
+        cards = state.players[seat].cards
+        opponents = state.opponents_of(seat)
+        richest = max(opponents, key=lambda opponent: state.players[opponent].coins)
+
+        if ActionType.coup in legal_actions:
+            return ActionType.coup, richest
+        if ActionType.assassinate in legal_actions and CardType.assassin in cards:
+            return ActionType.assassinate, richest
+        if CardType.duke in cards:
+            return ActionType.tax, None
+        if CardType.captain in cards and state.players[richest].coins >= 2:
+            return ActionType.steal, richest
+        if CardType.ambassador in cards and rng.random() < 0.3:
+            return ActionType.exchange, None
+        return rng.choice([ActionType.income, ActionType.foreign_aid]), None
+
+    def should_challenge(
+        self, state: GameState, seat: int, claimant: int, card: CardType, rng: random.Random
+    ) -> bool:
+        # Copies we can account for (our own hand and the discard pile) make the claim less likely
+        seen = state.players[seat].cards.count(card) + state.discard.count(card)
+        if seen >= 3:
+            return True
+        return rng.random() < self.challenge_rate * (1 + seen)
+
+    def should_block(
+        self,
+        state: GameState,
+        seat: int,
+        actor: int,
+        action: ActionType,
+        card: CardType,
+        rng: random.Random,
+    ) -> bool:
+        return card in state.players[seat].cards
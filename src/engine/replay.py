@@ -0,0 +1,182 @@
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.engine.engine import STARTING_COINS, TREASURY_COINS
+from src.engine.events import EventType, GameEvent
+from src.engine.state import GameState, PlayerState
+from src.models.card import CardType, Deck
+
+
+class ReplayError(Exception):
+    """Raised when a log cannot be replayed, or the replay disagrees with the recorded state"""
+
+
+def snapshot(
+    players: List[Dict[str, Any]], deck: List[str], discard: List[str], treasury: int
+) -> Dict[str, Any]:
+    """The end-of-turn state recorded in `turn_ended` events, with cards named as strings.
+
+    Hands and the deck are sorted, since the order of their cards means nothing (players
+    shuffle their hands when exchanging, and the deck is drawn from at random).
+    """
+    for player in players:
+        player["cards"] = sorted(player["cards"])
+    return {"players": players, "deck": sorted(deck), "discard": discard, "treasury": treasury}
+
+
+def snapshot_game_state(state: GameState) -> Dict[str, Any]:
+    return snapshot(
+        players=[
+            {
+                "name": player.name,
+                "coins": player.coins,
+                "cards": [card.value for card in player.cards],
+                "is_active": player.is_active,
+            }
+            for player in state.players
+        ],
+        deck=[card.value for card in state.deck],
+        discard=[card.value for card in state.discard],
+        treasury=state.treasury,
+    )
+
+
+@dataclass
+class ReplayedTurn:
+    turn: int
+    player: str
+    action: Optional[str] = None
+    target: Optional[str] = None
+    events: List[GameEvent] = field(default_factory=list)
+    state: Optional[GameState] = None
+
+
+class GameReplayer:
+    """Rebuilds a game's state from its event log, without asking any player (or model) for
+    anything: every decision, draw and reshuffle is in the log.
+
+    With `verify`, the rebuilt state is checked against the state recorded at the end of every
+    turn, and every draw against the deck it was supposedly drawn from.
+    """
+
+    def __init__(self, verify: bool = True):
+        self.verify = verify
+        self.state = GameState(players=[])
+
+    def _player(self, name: Optional[str]) -> PlayerState:
+        for player in self.state.players:
+            if player.name == name:
+                return player
+        raise ReplayError(f"Turn {self.state.turn}: unknown player {name}")
+
+    def _check(self, condition: bool, message: str) -> None:
+        if self.verify and not condition:
+            raise ReplayError(f"Turn {self.state.turn}: {message}")
+
+    def _draw(self, cards: List[CardType]) -> None:
+        """Take `cards` out of the deck"""
+        deck = self.state.deck
+        for card in cards:
+            self._check(card in deck, f"{card.value} was drawn, but the deck holds none")
+            if card in deck:
+                deck.remove(card)
+
+    def _check_deck(self, deck: Optional[List[str]]) -> None:
+        """The deck recorded after a swap or an exchange must hold the cards left in the deck"""
+        if deck is None:
+            return
+        self._check(
+            Deck(CardType(card) for card in deck) == self.state.deck,
+            f"the recorded deck {deck} does not hold the cards left in the deck",
+        )
+
+    def apply(self, event: GameEvent) -> None:
+        state = self.state
+        cards = [CardType(card) for card in event.cards or []]
+        drawn = [CardType(card) for card in event.drawn or []]
+
+        match event.event_type:
+            case EventType.game_started:
+                self.state = GameState(
+                    players=[],
+                    deck=Deck(CardType(card) for card in event.deck or []),
+                    treasury=TREASURY_COINS - STARTING_COINS * (event.amount or 0),
+                )
+            case EventType.cards_dealt:
+                if state.deck:
+                    self._draw(cards)
+                state.players.append(
+                    PlayerState(name=event.player, coins=event.amount or 0, cards=cards)
+                )
+            case EventType.turn_started:
+                state.turn = event.turn
+                state.current_player_index = state.players.index(self._player(event.player))
+            case EventType.action_declared:
+                state.action_counts[event.action] += 1
+            case EventType.card_revealed:
+                self._player(event.player).cards.remove(cards[0])
+            case EventType.influence_lost:
+                self._player(event.player).cards.remove(cards[0])
+                state.discard.append(cards[0])
+            case EventType.card_swapped:
+                if event.drawn is None:
+                    raise ReplayError("The log does not record which card was drawn in a swap")
+                state.deck.put_back(cards[0])
+                self._draw(drawn)
+                self._check_deck(event.deck)
+                self._player(event.player).cards.extend(drawn)
+            case EventType.cards_exchanged:
+                if event.drawn is None:
+                    raise ReplayError("The log does not record which cards an exchange drew")
+                hand = self._player(event.player).cards
+                self._draw(drawn)
+                hand.extend(drawn)
+                for card in cards:
+                    hand.remove(card)
+                    state.deck.put_back(card)
+                self._check_deck(event.deck)
+            case EventType.coins_moved:
+                player = self._player(event.player)
+                player.coins += event.amount
+                if event.target == "Treasury":
+                    state.treasury -= event.amount
+                else:
+                    self._player(event.target).coins -= event.amount
+            case EventType.player_eliminated:
+                self._player(event.player).is_active = False
+            case EventType.game_won:
+                state.winner = state.players.index(self._player(event.player))
+            case EventType.turn_ended:
+                if event.state is not None:
+                    replayed = snapshot_game_state(state)
+                    self._check(
+                        replayed == event.state,
+                        f"the replayed state {replayed} does not match the recorded state "
+                        f"{event.state}",
+                    )
+
+    def replay(self, events: Iterable[GameEvent]) -> Iterator[ReplayedTurn]:
+        """Apply a game's events in order, yielding every turn (with a copy of the state as it
+        stood at the end of it) as it completes"""
+        turn: Optional[ReplayedTurn] = None
+        for event in events:
+            # Logs without turn_ended events still end a turn where the next one starts
+            if event.event_type == EventType.turn_started and turn is not None:
+                turn.state = copy.deepcopy(self.state)
+                yield turn
+
+            self.apply(event)
+
+            if event.event_type == EventType.turn_started:
+                turn = ReplayedTurn(turn=event.turn, player=event.player)
+            if turn is None:
+                continue
+
+            turn.events.append(event)
+            if event.event_type == EventType.action_declared:
+                turn.action, turn.target = event.action, event.target
+            elif event.event_type in (EventType.turn_ended, EventType.game_won):
+                turn.state = copy.deepcopy(self.state)
+                yield turn
+                turn = None
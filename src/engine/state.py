@@ -0,0 +1,67 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from src.models.card import CardType, Deck
+
+
+def seats_after(players: Sequence, seat: int) -> List[int]:
+    """The active seats other than `seat`, in seat order after it (going round the table).
+
+    Shared by the engine and ResistanceCoupGameHandler, so both ask players to respond in the
+    same order; `players` may be any objects with an `is_active` flag.
+    """
+    number_of_players = len(players)
+    seats = [(seat + offset) % number_of_players for offset in range(1, number_of_players)]
+    return [other for other in seats if players[other].is_active]
+
+
+def responder_order(players: Sequence, claimant: int, target: Optional[int] = None) -> List[int]:
+    """The seats that may challenge or block `claimant`: the targeted player gets the first
+    chance to respond, then everyone else in seat order after the claimant"""
+    responders = seats_after(players, claimant)
+    if target is not None and target in responders:
+        responders.remove(target)
+        responders.insert(0, target)
+    return responders
+
+
+@dataclass
+class PlayerState:
+    name: str
+    coins: int = 0
+    cards: List[CardType] = field(default_factory=list)
+    is_active: bool = True
+
+    def __str__(self):
+        return self.name
+
+
+@dataclass
+class GameState:
+    """Everything the rules engine needs to know about a game in progress"""
+
+    players: List[PlayerState]
+    deck: Deck = field(default_factory=Deck)
+    discard: List[CardType] = field(default_factory=list)
+    treasury: int = 0
+    current_player_index: int = 0
+    turn: int = 0
+    winner: Optional[int] = None
+    action_counts: Counter = field(default_factory=Counter)
+
+    @property
+    def current_player(self) -> PlayerState:
+        return self.players[self.current_player_index]
+
+    @property
+    def active_players(self) -> List[int]:
+        return [ind for ind, player in enumerate(self.players) if player.is_active]
+
+    def opponents_of(self, seat: int) -> List[int]:
+        """Active seats other than `seat`, in seat order after it"""
+        return seats_after(self.players, seat)
+
+    @property
+    def is_over(self) -> bool:
+        return self.winner is not None
@@ -0,0 +1,176 @@
+import csv
+import json
+import os
+import random
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.engine.engine import CoupEngine
+from src.engine.policies import HonestPolicy, RandomPolicy
+from src.engine.state import GameState
+from src.models.action import ActionType
+from src.models.card import CardType
+from src.models.traits import AICharacterTraits
+
+
+class TraitPolicy(HonestPolicy):
+    """A scripted stand-in for an AI player, whose appetite for bluffing, challenging and
+    blocking is derived from its procedurally generated traits"""
+
+    def __init__(self, traits: AICharacterTraits):
+        personality = f"{traits.personality_trait} {traits.rationalization_trait}".lower()
+
+        bluff_rate = 0.2
+        challenge_rate = 0.1
+        if "bluff" in personality and "call" not in personality:
+            bluff_rate += 0.3
+        if "call bluffs" in personality or "suspicious" in personality or "paranoid" in personality:
+            challenge_rate += 0.2
+        if "aggressive" in personality or "competitive" in personality:
+            bluff_rate += 0.1
+            challenge_rate += 0.1
+        if "passive" in personality or "peacemaker" in personality or "trusting" in personality:
+            bluff_rate -= 0.1
+            challenge_rate -= 0.05
+
+        super().__init__(challenge_rate=max(challenge_rate, 0.0))
+        self.bluff_rate = max(bluff_rate, 0.0)
+        self._bluffer = RandomPolicy(challenge_rate=self.challenge_rate, block_rate=bluff_rate)
+
+    def choose_action(
+        self, state: GameState, seat: int, legal_actions: Sequence[ActionType], rng: random.Random
+    ) -> Tuple[ActionType, Optional[int]]:
+        if rng.random() < self.bluff_rate:
+            return self._bluffer.choose_action(state, seat, legal_actions, rng)
+        return super().choose_action(state, seat, legal_actions, rng)
+
+    def should_block(
+        self,
+        state: GameState,
+        seat: int,
+        actor: int,
+        action: ActionType,
+        card: CardType,
+        rng: random.Random,
+    ) -> bool:
+        if card in state.players[seat].cards:
+            return True
+        return rng.random() < self.bluff_rate / 2
+
+
+@dataclass
+class TournamentResult:
+    game: int
+    seed: int
+    winner: Optional[str]
+    winner_seat: Optional[int]
+    turns: int
+    actions: Dict[str, int]
+    traits: List[Dict[str, str]] = field(default_factory=list)
+
+
+def play_tournament_game(game: int, seed: int, number_of_players: int) -> TournamentResult:
+    """Play one seeded game with trait-driven scripted players"""
+    # AICharacterTraits draws from the global generator; this runs inside a worker process
+    random.seed(seed)
+    traits = [AICharacterTraits() for _ in range(number_of_players)]
+    names = [f"Player {seat + 1}" for seat in range(number_of_players)]
+
+    engine = CoupEngine(names, [TraitPolicy(trait) for trait in traits], seed=seed)
+    state = engine.play_game()
+    winner = state.players[state.winner].name if state.winner is not None else None
+
+    return TournamentResult(
+        game=game,
+        seed=seed,
+        winner=winner,
+        winner_seat=state.winner,
+        turns=state.turn,
+        actions=dict(state.action_counts),
+        traits=[{"name": name, **trait.get_traits()} for name, trait in zip(names, traits)],
+    )
+
+
+def _play_tournament_game(arguments: Tuple[int, int, int]) -> TournamentResult:
+    return play_tournament_game(*arguments)
+
+
+def run_tournament(
+    number_of_games: int,
+    workers: int = os.cpu_count() or 1,
+    number_of_players: int = 5,
+    seed: int = 0,
+) -> Iterator[TournamentResult]:
+    """Play games across a pool of worker processes, yielding results as they finish"""
+    games = [(game, seed + game, number_of_players) for game in range(number_of_games)]
+    chunksize = max(1, min(256, number_of_games // (workers * 8)))
+    with Pool(processes=workers) as pool:
+        yield from pool.imap_unordered(_play_tournament_game, games, chunksize=chunksize)
+
+
+def aggregate_win_rates(results: List[TournamentResult]) -> List[Dict[str, object]]:
+    """Tabulate games played, wins and win rate by seat and by each kind of trait"""
+    games: Dict[Tuple[str, str], int] = Counter()
+    wins: Dict[Tuple[str, str], int] = Counter()
+    for result in results:
+        for seat, traits in enumerate(result.traits):
+            won = result.winner_seat == seat
+            keys = [("seat", str(seat + 1))] + [
+                (dimension, value) for dimension, value in traits.items() if dimension != "name"
+            ]
+            for key in keys:
+                games[key] += 1
+                wins[key] += won
+
+    rows = []
+    for dimension, value in sorted(games):
+        played = games[(dimension, value)]
+        rows.append(
+            {
+                "dimension": dimension,
+                "value": value,
+                "games": played,
+                "wins": wins[(dimension, value)],
+                "win_rate": round(wins[(dimension, value)] / played, 4),
+            }
+        )
+    return rows
+
+
+def simulate(
+    number_of_games: int,
+    workers: int,
+    number_of_players: int,
+    seed: int,
+    output_dir: str,
+    on_result: Optional[Callable[[TournamentResult], None]] = None,
+) -> List[Dict[str, object]]:
+    """Run a tournament, streaming per-game results to results.jsonl in `output_dir`, then write
+    the aggregated win rates to win_rates.csv"""
+    os.makedirs(output_dir, exist_ok=True)
+    results = []
+    with open(os.path.join(output_dir, "results.jsonl"), "w") as results_file:
+        for result in run_tournament(number_of_games, workers, number_of_players, seed):
+            results.append(result)
+            results_file.write(json.dumps(result.__dict__) + "\n")
+            if on_result is not None:
+                on_result(result)
+
+    rows = aggregate_win_rates(results)
+    with open(os.path.join(output_dir, "win_rates.csv"), "w", newline="") as win_rates_file:
+        writer = csv.DictWriter(
+            win_rates_file, fieldnames=["dimension", "value", "games", "wins", "win_rate"]
+        )
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return rows
+
+
+def summarize_by_dimension(rows: List[Dict[str, object]]) -> Dict[str, List[Dict[str, object]]]:
+    tables = defaultdict(list)
+    for row in rows:
+        tables[row["dimension"]].append(row)
+    return tables
@@ -0,0 +1,45 @@
+import gzip
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+# Where `coup.py` keeps the checkpoint of the game in progress (nothing is saved if empty)
+game_checkpoint_path = os.getenv("GAME_CHECKPOINT_PATH", ".coup_checkpoint.json.gz")
+
+# The game is checkpointed every this many turns
+game_checkpoint_every = int(os.getenv("GAME_CHECKPOINT_EVERY", 1))
+
+
+def save_checkpoint(checkpoint: Dict[str, Any], path: str) -> None:
+    """Write `checkpoint` to `path` as gzipped JSON.
+
+    The file is written next to `path` under a temporary name and then moved over it, so a crash
+    part way through leaves the previous checkpoint as it was rather than half of a new one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as checkpoint_file:
+            with gzip.GzipFile(fileobj=checkpoint_file, mode="wb", mtime=0) as gzip_file:
+                gzip_file.write(json.dumps(checkpoint, separators=(",", ":")).encode())
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """The checkpoint saved at `path`, or None if there is none"""
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rb") as checkpoint_file:
+        return json.loads(checkpoint_file.read())
+
+
+def remove_checkpoint(path: str) -> None:
+    if os.path.exists(path):
+        os.remove(path)
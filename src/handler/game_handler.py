@@ -1,18 +1,39 @@
+import asyncio
 import random
-import time
 from enum import Enum
-from typing import List, Optional, Tuple, Union
-
-import names
-from rich.console import Console
-from src.models.agents.ai_orchestrator import AIGameAgent
-
-from src.models.action import Action, ActionType, CounterAction, get_counter_action
-from src.models.card import Card, build_deck
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.models.agents.ai_orchestrator import AIGameAgent, prewarm_agents, prewarm_in_background
+
+from src.engine.engine import STARTING_COINS, TREASURY_COINS, resolve_action
+from src.engine.events import EventBus, EventSubscriber, EventType, GameEvent
+from src.engine.inference import HandInference, HandOdds, render_hand_odds
+from src.engine.replay import snapshot
+from src.engine.state import responder_order
+from src.models.action import (
+    ASSASSINATION_COINS,
+    COUP_COINS,
+    STEAL_COINS,
+    TREASURY_PAYOUTS,
+    Action,
+    ActionType,
+    CounterAction,
+    get_counter_action,
+)
+from src.models.card import CARDS, Card, CardType, Deck, build_deck
+from src.models.event_history import EventHistory
 from src.models.players.ai import AIPlayer
 from src.models.players.base import BasePlayer
 from src.models.players.human import HumanPlayer
-from src.utils.game_state import generate_players_table, generate_state_panel
+from src.utils.aio import run_coroutine
+from src.utils.game_state import (
+    generate_players_table,
+    generate_state_panel,
+    render_headless_state,
+    render_public_state,
+)
+from src.utils.name_pool import name_pool
+from src.utils.pacing import PacingClock
 from src.utils.print import (
     build_action_report_string,
     build_counter_report_string,
@@ -22,6 +43,11 @@ from src.utils.print import (
     print_text,
     print_texts,
 )
+from src.utils.tracing import tracer
+
+
+# Bumped whenever the layout of `to_checkpoint` changes
+CHECKPOINT_VERSION = 2
 
 
 class ChallengeResult(Enum):
@@ -30,36 +56,54 @@ class ChallengeResult(Enum):
     challenge_succeeded = 2
 
 
+# Whether the challenged claim held up, as CoupEngine and `resolve_action` put it
+CLAIM_UPHELD: Dict[ChallengeResult, Optional[bool]] = {
+    ChallengeResult.no_challenge: None,
+    ChallengeResult.challenge_failed: True,
+    ChallengeResult.challenge_succeeded: False,
+}
+
+
 class ResistanceCoupGameHandler:
     _players: List[BasePlayer] = []
     _current_player_index = 0
-    _deck: List[Card] = []
+    _deck: Deck
     _discard: List[str] = []
     _number_of_players: int = 0
     _treasury: int = 0
-    _current_round_events: List[str] = []
-    _last_round_events: List[str] = []
-
-    def __init__(self, player_name: str, number_of_players: int):
-        self._number_of_players = number_of_players
+    _current_round_events: EventHistory
+    _last_round_events: EventHistory
+    _concurrent_deliberation: bool = False
+    _pacing: PacingClock
+    _turn: int = 0
+    _last_state_fingerprint: Optional[Tuple] = None
+    _last_hands_fingerprint: Optional[Tuple] = None
+    _public_state: Optional[Tuple[List[str], str]] = None
+
+    def __init__(
+        self,
+        player_name: str,
+        number_of_players: int,
+        concurrent_deliberation: bool = False,
+        pacing: Optional[PacingClock] = None,
+        subscribers: Optional[List[EventSubscriber]] = None,
+    ):
+        self._reset(number_of_players, concurrent_deliberation, pacing, subscribers)
 
         # Set up players
         # self._players.append(HumanPlayer(name=player_name))
 
-        unique_names = set()
-        for i in range(number_of_players):
-            gender = random.choice(["male", "female"])
-
-            ai_name = names.get_first_name(gender=gender)
-            while ai_name in unique_names:
-                ai_name = names.get_first_name(gender=gender)
-
-            unique_names.add(ai_name)
+        for ai_name in name_pool.sample(number_of_players):
+            self._players.append(
+                AIPlayer(name=ai_name, ai_agent=AIGameAgent(name=ai_name), pacing=self._pacing)
+            )
 
-            self._players.append(AIPlayer(name=ai_name, ai_agent=AIGameAgent(name=ai_name)))
+        # Agent chains are otherwise built on first use; build them while the playbill is shown
+        if prewarm_agents:
+            prewarm_in_background([player.ai_agent for player in self._players])
 
         print_text(f"\r\n\t[bold magenta]The Playbill![/]", with_markup=True)
-        time.sleep(1)
+        self._pacing.pause(1)
         for player in self._players:
             print_text(f"\t\t[bold cyan]{player}[/]: ", with_markup=True)
             print_text(
@@ -73,7 +117,114 @@ class ResistanceCoupGameHandler:
             print_text(
                 f"\tSpeechiness seed: 'You {player.ai_agent.traits.speech_trait}'", with_markup=True
             )
-            time.sleep(1)
+            self._pacing.pause(1)
+
+    def _reset(
+        self,
+        number_of_players: int,
+        concurrent_deliberation: bool,
+        pacing: Optional[PacingClock],
+        subscribers: Optional[List[EventSubscriber]],
+    ) -> None:
+        self._number_of_players = number_of_players
+        self._concurrent_deliberation = concurrent_deliberation
+        self._pacing = pacing or PacingClock.from_env()
+        self._turn = 0
+        self.events = EventBus(subscribers)
+        self._players = []
+        self._deck = Deck()
+        self._discard = []
+        self._current_round_events = EventHistory()
+        self._last_round_events = EventHistory()
+        self._hand_inference = HandInference()
+        self._hand_odds_tables: Dict[str, str] = {}
+
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """Everything needed to carry on with the game from the end of the last turn: the board,
+        the round histories, each agent's traits and latest rationale, and the RNG state."""
+        version, internal_state, gauss_next = random.getstate()
+        return {
+            "version": CHECKPOINT_VERSION,
+            "turn": self._turn,
+            "current_player_index": self._current_player_index,
+            "treasury": self._treasury,
+            "deck": [card.value for card in self._deck],
+            "discard": list(self._discard),
+            "concurrent_deliberation": self._concurrent_deliberation,
+            "players": [
+                {
+                    "name": player.name,
+                    "coins": player.coins,
+                    "cards": [f"{card}" for card in player.cards],
+                    "is_active": player.is_active,
+                    "traits": {
+                        **player.ai_agent.traits.get_traits(),
+                        "chattiness": player.ai_agent.traits.chattiness,
+                    },
+                    "last_rationale": player.ai_agent.last_rationale,
+                }
+                for player in self._players
+            ],
+            "current_round_events": self._current_round_events.to_dict(),
+            "last_round_events": self._last_round_events.to_dict(),
+            "hand_inference": self._hand_inference.to_dict(),
+            "random_state": [version, list(internal_state), gauss_next],
+        }
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        checkpoint: Dict[str, Any],
+        pacing: Optional[PacingClock] = None,
+        subscribers: Optional[List[EventSubscriber]] = None,
+    ) -> "ResistanceCoupGameHandler":
+        """Rebuild a handler from `to_checkpoint`, ready for its next `handle_turn`"""
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {checkpoint.get('version')}")
+
+        handler = cls.__new__(cls)
+        handler._reset(
+            len(checkpoint["players"]),
+            checkpoint["concurrent_deliberation"],
+            pacing,
+            subscribers,
+        )
+        handler._turn = checkpoint["turn"]
+        handler._current_player_index = checkpoint["current_player_index"]
+        handler._treasury = checkpoint["treasury"]
+        handler._deck = Deck(CardType(card) for card in checkpoint["deck"])
+        handler._discard = list(checkpoint["discard"])
+        handler._current_round_events = EventHistory.from_dict(checkpoint["current_round_events"])
+        handler._last_round_events = EventHistory.from_dict(checkpoint["last_round_events"])
+        handler._hand_inference.load(checkpoint["hand_inference"])
+
+        for saved in checkpoint["players"]:
+            agent = AIGameAgent(name=saved["name"])
+            for trait, value in saved["traits"].items():
+                setattr(agent.traits, trait, value)
+            agent.last_rationale = saved["last_rationale"]
+            handler._players.append(
+                AIPlayer(
+                    name=saved["name"],
+                    ai_agent=agent,
+                    pacing=handler._pacing,
+                    coins=saved["coins"],
+                    cards=[CARDS[CardType(card)] for card in saved["cards"]],
+                    is_active=saved["is_active"],
+                )
+            )
+
+        if prewarm_agents:
+            prewarm_in_background([player.ai_agent for player in handler._players])
+
+        # Last, since creating the agents above draws their (since overwritten) traits from it
+        version, internal_state, gauss_next = checkpoint["random_state"]
+        random.setstate((version, tuple(internal_state), gauss_next))
+        return handler
+
+    @property
+    def turn(self) -> int:
+        return self._turn
 
     @property
     def current_player(self) -> BasePlayer:
@@ -84,9 +235,17 @@ class ResistanceCoupGameHandler:
         """Return the only remaining player"""
         return [player for player in self._players if player.is_active][0]
 
+    def _emit(self, event_type: EventType, **kwargs) -> None:
+        if self.events.has_subscribers:
+            self.events.emit(GameEvent(event_type=event_type, turn=self._turn, **kwargs))
+
+    def _record_event(self, msg: str):
+        self._current_round_events.append(msg)
+        self._emit(EventType.message, text=msg)
+
     def _broadcast_and_record(self, msg: str):
         print_text(msg)
-        self._current_round_events.append(msg)
+        self._record_event(msg)
 
     def print_game_state(self) -> None:
         print_table(generate_players_table(self._players, self._current_player_index))
@@ -102,48 +261,95 @@ class ResistanceCoupGameHandler:
             if player.is_active and player.name != excluded_player.name
         ]
 
-    def _shuffle_deck(self) -> None:
-        random.shuffle(self._deck)
+    def _responders(
+        self, claimant: BasePlayer, target: Optional[BasePlayer] = None
+    ) -> List[BasePlayer]:
+        """Who may challenge or block `claimant`, in the order they are asked (the same order as
+        in CoupEngine: the target first, then round the table from the claimant)"""
+        seats = responder_order(
+            self._players,
+            self._players.index(claimant),
+            self._players.index(target) if target is not None else None,
+        )
+        return [self._players[seat] for seat in seats]
+
+    def _draw_card(self) -> Card:
+        return CARDS[self._deck.draw()]
 
     def setup_game(self) -> None:
         self._deck = build_deck()
-        self._shuffle_deck()
+        self._discard = []
+        self._turn = 0
+        self._hand_inference.reset()
+        self._emit(
+            EventType.game_started,
+            amount=len(self._players),
+            deck=[card.value for card in self._deck],
+        )
 
-        self._treasury = 50 - 2 * len(self._players)
+        self._treasury = TREASURY_COINS - STARTING_COINS * len(self._players)
 
         for player in self._players:
             player.reset_player()
 
             # Deal 2 cards to each player
-            player.cards.append(self._deck.pop())
-            player.cards.append(self._deck.pop())
+            player.cards.append(self._draw_card())
+            player.cards.append(self._draw_card())
 
             # Gives each player 2 coins
-            player.coins = 2
+            player.coins = STARTING_COINS
 
             # Includes the player in the game
             player.is_active = True
+            self._emit(
+                EventType.cards_dealt,
+                player=player.name,
+                cards=[f"{card}" for card in player.cards],
+                amount=player.coins,
+            )
 
         # Random starting player
         self._current_player_index = random.randint(0, self._number_of_players - 1)
 
     def _swap_card(self, player: BasePlayer, card: Card) -> None:
-        self._deck.append(card)
-        self._shuffle_deck()
-        player.cards.append(self._deck.pop())
+        # Putting the card back and drawing at random is the same as reshuffling and drawing
+        self._deck.put_back(card.card_type)
+        new_card = self._draw_card()
+        player.cards.append(new_card)
+        if self.events.has_subscribers:
+            self._emit(
+                EventType.card_swapped,
+                player=player.name,
+                cards=[f"{card}"],
+                drawn=[f"{new_card}"],
+                deck=[deck_card.value for deck_card in self._deck],
+            )
+
+    def _lose_influence(self, player: BasePlayer) -> None:
+        """The player chooses a card to give up, which goes to the discard pile"""
+        card = player.remove_card(self._current_round_events)
+        self._discard.append(card)
+        self._hand_inference.lost_card(player.name, CardType(card))
+        self._emit(EventType.influence_lost, player=player.name, cards=[card])
 
     def _take_coin_from_treasury(self, player: BasePlayer, number_of_coins: int):
         if number_of_coins <= self._treasury:
             self._treasury -= number_of_coins
             player.coins += number_of_coins
         else:
-            coins = self._treasury
+            number_of_coins = self._treasury
             self._treasury = 0
-            player.coins += coins
+            player.coins += number_of_coins
+        self._emit(
+            EventType.coins_moved, player=player.name, target="Treasury", amount=number_of_coins
+        )
 
     def _give_coin_to_treasury(self, player: BasePlayer, number_of_coins: int):
         self._treasury += number_of_coins
         player.coins -= number_of_coins
+        self._emit(
+            EventType.coins_moved, player=player.name, target="Treasury", amount=-number_of_coins
+        )
 
     def _next_player(self):
         self._current_player_index = (self._current_player_index + 1) % len(self._players)
@@ -155,6 +361,7 @@ class ResistanceCoupGameHandler:
             if not player.cards and player.is_active:
                 player.is_active = False
                 self._give_coin_to_treasury(player, player.coins)
+                self._emit(EventType.player_eliminated, player=player.name)
 
                 return player
         return None
@@ -162,21 +369,87 @@ class ResistanceCoupGameHandler:
     def _determine_win_state(self) -> bool:
         return sum(player.is_active for player in self._players) == 1
 
-    def _build_headless_state(self, current_player: BasePlayer) -> str:
-        player_table_text = generate_players_table(
-            self._players, self._players.index(current_player)
+    def _hands_fingerprint(self) -> Tuple:
+        """A cheap summary of what the hand odds are worked out from: cards, discards and what
+        players have shown of their hands"""
+        return (
+            self._hand_inference.version,
+            tuple(self._discard),
+            tuple(
+                (player.is_active, tuple(card.card_type for card in player.cards))
+                for player in self._players
+            ),
+        )
+
+    def _state_fingerprint(self, hands_fingerprint: Tuple) -> Tuple:
+        """A cheap summary of what the board renderings show: the hands, and coins"""
+        return (
+            hands_fingerprint,
+            self._treasury,
+            tuple(player.coins for player in self._players),
         )
-        state_table_text = generate_state_panel(
-            self._deck, self._treasury, current_player, self._discard
+
+    def _snapshot(self) -> Dict[str, Any]:
+        """The full state, as recorded at the end of every turn for replays to check against"""
+        return snapshot(
+            players=[
+                {
+                    "name": player.name,
+                    "coins": player.coins,
+                    "cards": [f"{card}" for card in player.cards],
+                    "is_active": player.is_active,
+                }
+                for player in self._players
+            ],
+            deck=[card.value for card in self._deck],
+            discard=list(self._discard),
+            treasury=self._treasury,
+        )
+
+    def _refresh_state_caches(self) -> None:
+        """Drop the cached board renderings once the state has moved on. Coins change nearly
+        every turn, but the hand odds only need working out again when the cards (or what was
+        shown of them) do."""
+        hands_fingerprint = self._hands_fingerprint()
+        fingerprint = self._state_fingerprint(hands_fingerprint)
+        if fingerprint != self._last_state_fingerprint:
+            self._last_state_fingerprint = fingerprint
+            self._public_state = None
+        if hands_fingerprint != self._last_hands_fingerprint:
+            self._last_hands_fingerprint = hands_fingerprint
+            self._hand_odds_tables = {}
+
+    def _hand_odds(self, viewer: BasePlayer) -> HandOdds:
+        """The odds of what every other player holds, as far as `viewer` can tell"""
+        return self._hand_inference.odds(
+            own_cards=[card.card_type for card in viewer.cards],
+            opponents=[
+                (player.name, len(player.cards))
+                for player in self._players
+                if player is not viewer and player.is_active
+            ],
+            discard=[CardType(card) for card in self._discard],
+        )
+
+    @tracer.traced("render")
+    def _build_headless_state(self, current_player: BasePlayer) -> str:
+        self._refresh_state_caches()
+
+        if self._public_state is None:
+            self._public_state = render_public_state(
+                self._players, self._deck, self._treasury, self._discard
+            )
+        hand_odds = self._hand_odds_tables.get(current_player.name)
+        if hand_odds is None:
+            hand_odds = render_hand_odds(self._hand_odds(current_player))
+            self._hand_odds_tables[current_player.name] = hand_odds
+        str_output = render_headless_state(
+            self._public_state, self._players, self._players.index(current_player), hand_odds
         )
-        console = Console()
-        with console.capture() as capture:
-            console.print(player_table_text)
-            console.print(state_table_text)
-        str_output = capture.get()
         summary = f"```GAMESTATE\n\n{str_output}```"
         return summary
 
+    @tracer.traced("phase")
     def _action_phase(self) -> Tuple[Action, Optional[BasePlayer], Optional[str]]:
         summary = self._build_headless_state(self._players[self._current_player_index])
         target_action, target_player, speech = self.current_player.choose_action(
@@ -196,7 +469,8 @@ class ResistanceCoupGameHandler:
     ):
         # Player being challenged reveals the card
         print_texts(f"{player_being_challenged} reveals their ", (f"{card}", card.style), " card!")
-        self._current_round_events.append(f"{player_being_challenged} reveals their {card} card!")
+        self._emit(EventType.card_revealed, player=player_being_challenged.name, cards=[f"{card}"])
+        self._record_event(f"{player_being_challenged} reveals their {card} card!")
 
         self._broadcast_and_record(f"{challenger} loses the challenge")
         chat = challenger.determine_chat(
@@ -207,59 +481,61 @@ class ResistanceCoupGameHandler:
         )
 
         if chat is not None:
-            self._current_round_events.append(chat)
+            self._record_event(chat)
 
         # Challenge player loses influence (chooses a card to remove)
-        self._discard.append(challenger.remove_card(self._current_round_events))
+        self._lose_influence(challenger)
 
         # Player puts card into the deck and gets a new card
         self._swap_card(player_being_challenged, card)
+        self._hand_inference.hand_refreshed(player_being_challenged.name)
         self._broadcast_and_record(f"{player_being_challenged} gets a new card")
 
-        for player in self._players_without_player(challenger):
-            chat = player.determine_chat(
-                actor=challenger,
-                event_to_chat_about=f"{challenger} challenged {player_being_challenged} and lost a card",
-                past_events=self._current_round_events,
-                modifier=0.8,
-            )
-            if chat is not None:
-                self._current_round_events.append(chat)
+        self._record_chats(
+            [
+                (
+                    player,
+                    challenger,
+                    f"{challenger} challenged {player_being_challenged} and lost a card",
+                    0.8,
+                )
+                for player in self._players_without_player(challenger)
+            ]
+        )
 
     def _challenge_against_player_succeeded(self, player_being_challenged: BasePlayer):
         message = (
             f"{player_being_challenged} was caught bluffing! They do not have the required card!"
         )
         print_text(message)
-        self._current_round_events.append(message)
-
-        chat = player_being_challenged.determine_chat(
-            actor=player_being_challenged,
-            event_to_chat_about="You were caught bluffing! You do not have the required card and will lose one!",
-            past_events=self._current_round_events,
-            modifier=1.2,
+        self._record_event(message)
+
+        self._record_chats(
+            [
+                (
+                    player_being_challenged,
+                    player_being_challenged,
+                    "You were caught bluffing! You do not have the required card and will lose one!",
+                    1.2,
+                )
+            ]
+            + [
+                (
+                    player,
+                    player_being_challenged,
+                    f"{player_being_challenged} was caught bluffing! They do not have the required card!",
+                    0.8,
+                )
+                for player in self._players_without_player(player_being_challenged)
+            ]
         )
 
-        if chat is not None:
-            self._current_round_events.append(chat)
-
-        for player in self._players_without_player(player_being_challenged):
-            chat = player.determine_chat(
-                actor=player_being_challenged,
-                event_to_chat_about=f"{player_being_challenged} was caught bluffing! They do not have the required card!",
-                past_events=self._current_round_events,
-                modifier=0.8,
-            )
-
-            if chat is not None:
-                self._current_round_events.append(chat)
-
         # Player being challenged loses influence (chooses a card to remove)
-        self._discard.append(player_being_challenged.remove_card(self._current_round_events))
+        self._lose_influence(player_being_challenged)
 
+    @tracer.traced("phase")
     def _challenge_phase(
         self,
-        other_players: list[BasePlayer],
         player_being_challenged: BasePlayer,
         action_being_challenged: Union[Action, CounterAction],
         dialogue_so_far: Optional[List[str]] = None,
@@ -268,82 +544,208 @@ class ResistanceCoupGameHandler:
         accumulated_speech = []
 
         # Every player can choose to challenge, but let's start with the player targeted:
-        traversal_order: List[int] = []
-        if action_target is not None:
-            traversal_order = [self._players.index(action_target)]
-            for player in other_players:
-                if player is not action_target and player is not player_being_challenged:
-                    traversal_order.append(self._players.index(player))
+        challengers = self._responders(player_being_challenged, action_target)
+        if self._concurrent_deliberation:
+            challenger, accumulated_speech = run_coroutine(
+                self._deliberate_challenges_concurrently(
+                    challengers,
+                    player_being_challenged,
+                    action_being_challenged,
+                    dialogue_so_far,
+                    action_target,
+                )
+            )
         else:
-            for player in other_players:
-                if player is not player_being_challenged:
-                    traversal_order.append(self._players.index(player))
-
-        for i in traversal_order:
-            challenger = self._players[i]
-            should_challenge, challenge_speech = challenger.determine_challenge(
-                player_being_challenged,
-                action_target,
-                action_being_challenged,
-                self._build_headless_state(challenger),
-                dialogue_so_far,
+            challenger = None
+            for candidate in challengers:
+                should_challenge, challenge_speech = candidate.determine_challenge(
+                    player_being_challenged,
+                    action_target,
+                    action_being_challenged,
+                    self._build_headless_state(candidate),
+                    dialogue_so_far,
+                )
+                if challenge_speech is not None:
+                    accumulated_speech.append(challenge_speech)
+
+                if should_challenge:
+                    challenger = candidate
+                    break
+
+        if challenger is not None:
+            message = f"{challenger} is challenging {player_being_challenged}!"
+            print_text(message)
+            self._emit(
+                EventType.challenge_declared,
+                player=challenger.name,
+                target=player_being_challenged.name,
+                cards=[action_being_challenged.associated_card_type.value],
             )
-            if challenge_speech is not None:
-                accumulated_speech.append(challenge_speech)
-
-            if should_challenge:
-                message = f"{challenger} is challenging {player_being_challenged}!"
-                print_text(message)
-                self._current_round_events.append(message)
-
-                # Player being challenged has the card
-                if card := player_being_challenged.find_card(
-                    action_being_challenged.associated_card_type
-                ):
-                    self._challenge_against_player_failed(
-                        player_being_challenged=player_being_challenged,
-                        card=card,
-                        challenger=challenger,
-                    )
-                    return ChallengeResult.challenge_failed, accumulated_speech
+            self._record_event(message)
+
+            # Player being challenged has the card
+            if card := player_being_challenged.find_card(
+                action_being_challenged.associated_card_type
+            ):
+                self._challenge_against_player_failed(
+                    player_being_challenged=player_being_challenged,
+                    card=card,
+                    challenger=challenger,
+                )
+                return ChallengeResult.challenge_failed, accumulated_speech
 
-                # Player being challenged bluffed
-                else:
-                    self._challenge_against_player_succeeded(player_being_challenged)
-                    return ChallengeResult.challenge_succeeded, accumulated_speech
+            # Player being challenged bluffed
+            else:
+                self._hand_inference.caught_bluffing(
+                    player_being_challenged.name, action_being_challenged.associated_card_type
+                )
+                self._challenge_against_player_succeeded(player_being_challenged)
+                return ChallengeResult.challenge_succeeded, accumulated_speech
 
         # No  challenge happened
         return ChallengeResult.no_challenge, None
 
+    @tracer.traced("phase")
+    async def _deliberate_challenges_concurrently(
+        self,
+        challengers: List[BasePlayer],
+        player_being_challenged: BasePlayer,
+        action_being_challenged: Union[Action, CounterAction],
+        dialogue_so_far: Optional[List[str]],
+        action_target: Optional[BasePlayer],
+    ) -> Tuple[Optional[BasePlayer], List[str]]:
+        """Start every challenger's deliberation at once, then settle them in traversal order.
+
+        The first player (in traversal order) who challenges wins, exactly as in the sequential
+        flow; deliberations of lower-priority players still in flight are cancelled.
+        """
+        tasks = [
+            asyncio.ensure_future(
+                challenger.adetermine_challenge(
+                    player_being_challenged,
+                    action_target,
+                    action_being_challenged,
+                    self._build_headless_state(challenger),
+                    dialogue_so_far,
+                )
+            )
+            for challenger in challengers
+        ]
+
+        accumulated_speech = []
+        try:
+            for challenger, task in zip(challengers, tasks):
+                should_challenge, challenge_speech = await task
+                if challenge_speech is not None:
+                    print_text(challenge_speech)
+                    accumulated_speech.append(challenge_speech)
+
+                if should_challenge:
+                    return challenger, accumulated_speech
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return None, accumulated_speech
+
+    @tracer.traced("phase")
     def _counter_phase(
         self,
-        players_without_current: list[BasePlayer],
         target_action: Action,
         target_player: Optional[BasePlayer] = None,
     ) -> Tuple[Optional[BasePlayer], Optional[CounterAction]]:
-        # Every player can choose to counter
-        for countering_player in players_without_current:
-            should_counter = countering_player.determine_counter(
-                actor=self.current_player,
-                target_player=target_player,
-                action=target_action,
-                state=self._build_headless_state(countering_player),
-                dialogue_so_far=self._current_round_events,
+        # Every player can choose to counter, in turn from the current player
+        candidates = self._responders(self.current_player)
+        if self._concurrent_deliberation:
+            countering_player = run_coroutine(
+                self._deliberate_counters_concurrently(candidates, target_action, target_player)
             )
-            if should_counter:
-                target_counter = get_counter_action(target_action.action_type)
-                print_text(
-                    build_counter_report_string(
-                        target_player=self.current_player,
-                        counter=target_counter,
-                        countering_player=countering_player,
-                    )
+        else:
+            countering_player = None
+            for candidate in candidates:
+                should_counter, counter_speech = candidate.determine_counter(
+                    actor=self.current_player,
+                    target_player=target_player,
+                    action=target_action,
+                    state=self._build_headless_state(candidate),
+                    dialogue_so_far=self._current_round_events,
+                )
+                if counter_speech is not None:
+                    self._record_event(counter_speech)
+
+                if should_counter:
+                    countering_player = candidate
+                    break
+
+        if countering_player is not None:
+            target_counter = get_counter_action(target_action.action_type)
+            self._hand_inference.claimed(
+                countering_player.name, target_counter.associated_card_type
+            )
+            self._emit(
+                EventType.counter_declared,
+                player=countering_player.name,
+                target=self.current_player.name,
+                action=target_action.action_type.value,
+                cards=[target_counter.associated_card_type.value],
+            )
+            print_text(
+                build_counter_report_string(
+                    target_player=self.current_player,
+                    counter=target_counter,
+                    countering_player=countering_player,
                 )
+            )
 
-                return countering_player, target_counter
+            return countering_player, target_counter
 
         return None, None
 
+    @tracer.traced("phase")
+    async def _deliberate_counters_concurrently(
+        self,
+        candidates: List[BasePlayer],
+        target_action: Action,
+        target_player: Optional[BasePlayer],
+    ) -> Optional[BasePlayer]:
+        """Ask every player whether to block at once, then settle the answers in seat order.
+
+        The first player in seat order who blocks wins, exactly as in the sequential flow; the
+        remaining deliberations still in flight are cancelled.
+        """
+        dialogue_so_far = self._current_round_events.copy()
+        tasks = [
+            asyncio.ensure_future(
+                candidate.adetermine_counter(
+                    actor=self.current_player,
+                    target_player=target_player,
+                    action=target_action,
+                    state=self._build_headless_state(candidate),
+                    dialogue_so_far=dialogue_so_far,
+                )
+            )
+            for candidate in candidates
+        ]
+
+        try:
+            for candidate, task in zip(candidates, tasks):
+                should_counter, counter_speech = await task
+                if counter_speech is not None:
+                    self._broadcast_and_record(counter_speech)
+
+                if should_counter:
+                    return candidate
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return None
+
+    @tracer.traced("phase")
     def _execute_action(
         self, action: Action, target_player: BasePlayer, countered: bool = False
     ) -> None:
@@ -353,154 +755,189 @@ class ResistanceCoupGameHandler:
                 self._broadcast_and_record(
                     f"{self.current_player} takes one coin from the treasury."
                 )
-                self._take_coin_from_treasury(self.current_player, 1)
+                self._take_coin_from_treasury(
+                    self.current_player, TREASURY_PAYOUTS[ActionType.income]
+                )
             case ActionType.foreign_aid:
                 if not countered:
                     # Player gets 2 coin
                     self._broadcast_and_record(
                         f"{self.current_player}'s takes two coins from the treasury."
                     )
-                    self._take_coin_from_treasury(self.current_player, 2)
+                    self._take_coin_from_treasury(
+                        self.current_player, TREASURY_PAYOUTS[ActionType.foreign_aid]
+                    )
             case ActionType.coup:
                 # Player pays 7 coin
                 self._broadcast_and_record(
                     f"{self.current_player} pays 7 coins and performs the coup against {target_player}!"
                 )
-                self._give_coin_to_treasury(self.current_player, 7)
+                self._give_coin_to_treasury(self.current_player, COUP_COINS)
 
                 if target_player.cards:
                     # Target player loses influence
-                    self._discard.append(target_player.remove_card(self._current_round_events))
+                    self._lose_influence(target_player)
             case ActionType.tax:
                 # Player gets 3 coins
                 self._broadcast_and_record(
                     f"{self.current_player} takes three coins from the treasury!"
                 )
-                self._take_coin_from_treasury(self.current_player, 3)
+                self._take_coin_from_treasury(self.current_player, TREASURY_PAYOUTS[ActionType.tax])
             case ActionType.assassinate:
                 # Player pays 3 coin
-                self._give_coin_to_treasury(self.current_player, 3)
+                self._give_coin_to_treasury(self.current_player, ASSASSINATION_COINS)
                 if not countered and target_player.cards:
                     self._broadcast_and_record(
                         f"{self.current_player} assassinates {target_player}"
                     )
-                    self._discard.append(target_player.remove_card(self._current_round_events))
+                    self._lose_influence(target_player)
 
             case ActionType.steal:
                 if not countered:
                     # Take 2 (or all) coins from a player
-                    steal_amount = min(target_player.coins, 2)
+                    steal_amount = min(target_player.coins, STEAL_COINS)
                     target_player.coins -= steal_amount
                     self.current_player.coins += steal_amount
+                    self._emit(
+                        EventType.coins_moved,
+                        player=self.current_player.name,
+                        target=target_player.name,
+                        amount=steal_amount,
+                    )
                     self._broadcast_and_record(
                         f"{self.current_player} steals {steal_amount} coins from {target_player}!"
                     )
             case ActionType.exchange:
                 # Get 2 random cards from deck
-                cards = [self._deck.pop(), self._deck.pop()]
+                cards = [self._draw_card(), self._draw_card()]
                 first_card, second_card = self.current_player.choose_exchange_cards(
                     cards, self._current_round_events
                 )
-                self._deck.append(first_card)
-                self._deck.append(second_card)
+                self._deck.put_back(first_card.card_type)
+                self._deck.put_back(second_card.card_type)
+                self._hand_inference.hand_refreshed(self.current_player.name)
+                self._emit(
+                    EventType.cards_exchanged,
+                    player=self.current_player.name,
+                    cards=[f"{first_card}", f"{second_card}"],
+                    drawn=[f"{card}" for card in cards],
+                    amount=2,
+                )
+        chat_requests = []
         for player in self._players:
             target_string = ""
             if target_player is not None:
                 target_string = f" against {target_player}"
             if player is self.current_player:
-                chat = player.determine_chat(
-                    actor=self.current_player,
-                    event_to_chat_about=f"You just successfully used {action.action_type}${target_string}!",
-                    past_events=self._current_round_events,
-                    modifier=0.8,
+                event_to_chat_about = (
+                    f"You just successfully used {action.action_type}${target_string}!"
                 )
             else:
-                chat = player.determine_chat(
-                    actor=self.current_player,
-                    event_to_chat_about=f"{self.current_player} successfully performed the {action.action_type.value} action{target_string}",
-                    past_events=self._current_round_events,
-                    modifier=0.8,
+                event_to_chat_about = (
+                    f"{self.current_player} successfully performed the "
+                    f"{action.action_type.value} action{target_string}"
                 )
-            if chat is not None:
-                self._current_round_events.append(chat)
+            chat_requests.append((player, self.current_player, event_to_chat_about, 0.8))
+        self._record_chats(chat_requests)
 
-    def handle_turn(self) -> bool:
-        # We might need to aggregate all the round dialogue into a nice array
-        players_without_current = self._players_without_player(self.current_player)
+    def _record_chats(self, chat_requests: List[Tuple[BasePlayer, BasePlayer, str, float]]) -> None:
+        """Give each (player, actor, event, modifier) a chance to chat, recording speech in order"""
+        if self._concurrent_deliberation:
+            run_coroutine(self._chat_concurrently(chat_requests))
+            return
 
-        # Choose an action to perform
-        target_action, target_player, speech = self._action_phase()
-        if speech is not None:
-            self._current_round_events.append(speech)
-
-        # Opportunity to challenge action
-        challenge_result = ChallengeResult.no_challenge
-        if target_action.can_be_challenged:
-            challenge_result, challenge_speech = self._challenge_phase(
-                other_players=players_without_current,
-                player_being_challenged=self.current_player,
-                action_being_challenged=target_action,
-                dialogue_so_far=[speech],
-                action_target=target_player,
+        for player, actor, event_to_chat_about, modifier in chat_requests:
+            chat = player.determine_chat(
+                actor=actor,
+                event_to_chat_about=event_to_chat_about,
+                past_events=self._current_round_events,
+                modifier=modifier,
             )
+            if chat is not None:
+                self._record_event(chat)
 
-            if challenge_speech is not None:
-                for speech in challenge_speech:
-                    self._current_round_events.append(speech)
-
-        if challenge_result == ChallengeResult.challenge_succeeded:
-            # Challenge succeeded and the action does not take place
-            pass
-        elif challenge_result == ChallengeResult.challenge_failed:
-            # Challenge failed and the action is still resolved
-            self._execute_action(target_action, target_player)
-        elif challenge_result == ChallengeResult.no_challenge:
-            # Action can't be countered
-            if not target_action.can_be_countered:
-                self._execute_action(target_action, target_player)
-
-            # Opportunity to counter
-            else:
-                countering_player, counter = self._counter_phase(
-                    players_without_current, target_action, target_player
+    @tracer.traced("phase")
+    async def _chat_concurrently(
+        self, chat_requests: List[Tuple[BasePlayer, BasePlayer, str, float]]
+    ) -> None:
+        """Run every commentary call at once; speech is recorded in request order.
+
+        Every chat sees the events as they stood before the fan-out, since none of them waits
+        for the others.
+        """
+        past_events = self._current_round_events.copy()
+        chats = await asyncio.gather(
+            *[
+                player.adetermine_chat(
+                    actor=actor,
+                    event_to_chat_about=event_to_chat_about,
+                    past_events=past_events,
+                    modifier=modifier,
                 )
+                for player, actor, event_to_chat_about, modifier in chat_requests
+            ]
+        )
+        for chat in chats:
+            if chat is not None:
+                self._broadcast_and_record(chat)
 
-                # Opportunity to challenge counter
-                counter_challenge_result = ChallengeResult.no_challenge
-                if countering_player and counter:
-                    players_without_countering_player = self._players_without_player(
-                        countering_player
-                    )
-                    counter_challenge_result = self._challenge_phase(
-                        other_players=players_without_countering_player,
-                        player_being_challenged=countering_player,
-                        action_being_challenged=counter,
-                    )
-                    counter_action_bluff_called = (
-                        counter_challenge_result != ChallengeResult.no_challenge
-                    )
-                    counter_action_bluff_revealed = counter_action_bluff_called and (
-                        counter_challenge_result == ChallengeResult.challenge_succeeded
-                    )
+    def _challenge_claim(
+        self,
+        claimant: BasePlayer,
+        claim: Union[Action, CounterAction],
+        dialogue_so_far: Optional[List[str]] = None,
+        target: Optional[BasePlayer] = None,
+    ) -> Optional[bool]:
+        """Whether `claimant`'s claim held up when challenged (None if nobody challenged), the way
+        `resolve_action` asks for it"""
+        challenge_result, challenge_speech = self._challenge_phase(
+            player_being_challenged=claimant,
+            action_being_challenged=claim,
+            dialogue_so_far=dialogue_so_far,
+            action_target=target,
+        )
+        if challenge_speech is not None:
+            for speech in challenge_speech:
+                self._record_event(speech)
 
-                # Successfully countered and counter not challenged
-                if counter and counter_challenge_result in [
-                    ChallengeResult.no_challenge,
-                    ChallengeResult.challenge_failed,
-                ]:
-                    self._execute_action(target_action, target_player, countered=True)
-                # No counter occurred
-                else:
-                    self._execute_action(target_action, target_player)
+        return CLAIM_UPHELD[challenge_result]
 
+    def _contest_action(
+        self, target_action: Action, target_player: Optional[BasePlayer], speech: Optional[str]
+    ) -> None:
+        """Give the other players their chance to challenge and block the action, and carry it
+        out unless they stop it"""
+        resolve_action(
+            target_action,
+            challenge_claim=lambda: self._challenge_claim(
+                self.current_player, target_action, [speech], target_player
+            ),
+            counter=lambda: self._counter_phase(target_action, target_player)[0],
+            challenge_counter=lambda countering_player: self._challenge_claim(
+                countering_player, get_counter_action(target_action.action_type)
+            ),
+            execute=lambda countered: self._execute_action(
+                target_action, target_player, countered=countered
+            ),
+        )
+
+    def _end_turn(self) -> bool:
+        """Retire defeated players and pass the turn on, returning whether the game is won"""
         removed_players = []
 
         # Is any player out of the game?
         while player := self._remove_defeated_player():
             removed_players.append(player)
             self._broadcast_and_record(f"{player} was defeated! :skull: :skull: :skull:")
+
+        if self.events.has_subscribers:
+            self._emit(
+                EventType.turn_ended, player=self.current_player.name, state=self._snapshot()
+            )
+
         # Have we reached a winner?
         if self._determine_win_state():
+            self._emit(EventType.game_won, player=self.remaining_player.name)
             print_text(
                 f":raising_hands: Congratulations {self.remaining_player}! You are the final survivor!",
                 with_markup=True,
@@ -509,7 +946,31 @@ class ResistanceCoupGameHandler:
 
         self._next_player()
         self._last_round_events = self._current_round_events
-        self._current_round_events = []
+        self._current_round_events = EventHistory()
 
         # No winner yet
         return False
+
+    @tracer.traced("turn")
+    def handle_turn(self) -> bool:
+        self._turn += 1
+        self._emit(EventType.turn_started, player=self.current_player.name)
+
+        # Choose an action to perform
+        target_action, target_player, speech = self._action_phase()
+        if target_action.associated_card_type is not None:
+            self._hand_inference.claimed(
+                self.current_player.name, target_action.associated_card_type
+            )
+        self._emit(
+            EventType.action_declared,
+            player=self.current_player.name,
+            target=target_player.name if target_player is not None else None,
+            action=target_action.action_type.value,
+        )
+        if speech is not None:
+            self._record_event(speech)
+
+        self._contest_action(target_action, target_player, speech)
+
+        return self._end_turn()
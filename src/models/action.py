@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from src.models.card import CardType
 
@@ -23,6 +23,9 @@ class CounterActionType(str, Enum):
 
 
 class Action(BaseModel):
+    # Actions are shared (see ACTIONS), so they cannot be changed once built
+    model_config = ConfigDict(frozen=True)
+
     action_type: ActionType
     associated_card_type: Optional[CardType] = None
     requires_target: bool = False
@@ -76,6 +79,8 @@ class ExchangeAction(Action):
 
 
 class CounterAction(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     counter_type: CounterActionType
     associated_card_type: Optional[List[CardType]]
 
@@ -98,9 +103,69 @@ class BlockStealCounterAction(CounterAction):
     associated_card_type: CardType = CardType.captain
 
 
+# Built once and shared: nothing ever changes an action or a counter
+ACTIONS: Dict[ActionType, Action] = {
+    action.action_type: action
+    for action in [
+        IncomeAction(),
+        ForeignAidAction(),
+        CoupAction(),
+        TaxAction(),
+        AssassinateAction(),
+        StealAction(),
+        ExchangeAction(),
+    ]
+}
+COUNTER_ACTIONS: Dict[ActionType, CounterAction] = {
+    ActionType.foreign_aid: BlockForeignAidCounterAction(),
+    ActionType.steal: BlockStealCounterAction(),
+    ActionType.assassinate: BlockAssassinationCounterAction(),
+}
+
+ASSASSINATION_COINS = 3
+COUP_COINS = 7
+# Coins an action takes from the treasury, and the most a steal takes from its target
+TREASURY_PAYOUTS: Dict[ActionType, int] = {
+    ActionType.income: 1,
+    ActionType.foreign_aid: 2,
+    ActionType.tax: 3,
+}
+STEAL_COINS = 2
+# A player with this many coins (or more) must coup
+FORCED_COUP_COINS = 10
+
+
+def _legal_actions(coins: int) -> Tuple[Action, ...]:
+    if coins >= FORCED_COUP_COINS:
+        return (ACTIONS[ActionType.coup],)
+
+    action_types = [
+        ActionType.income,
+        ActionType.foreign_aid,
+        ActionType.tax,
+        ActionType.steal,
+        ActionType.exchange,
+    ]
+    if coins >= COUP_COINS:
+        action_types.append(ActionType.coup)
+    if coins >= ASSASSINATION_COINS:
+        action_types.append(ActionType.assassinate)
+    return tuple(ACTIONS[action_type] for action_type in action_types)
+
+
+# The actions open to a player, by number of coins (from FORCED_COUP_COINS up, the last entry)
+LEGAL_ACTIONS: Tuple[Tuple[Action, ...], ...] = tuple(
+    _legal_actions(coins) for coins in range(FORCED_COUP_COINS + 1)
+)
+LEGAL_ACTION_TYPES: Tuple[Tuple[ActionType, ...], ...] = tuple(
+    tuple(action.action_type for action in actions) for actions in LEGAL_ACTIONS
+)
+
+
+def legal_actions(coins: int) -> Tuple[Action, ...]:
+    """The actions open to a player with `coins` coins"""
+    return LEGAL_ACTIONS[min(coins, FORCED_COUP_COINS)]
+
+
 def get_counter_action(action_type: ActionType) -> CounterAction:
-    return {
-        ActionType.foreign_aid: BlockForeignAidCounterAction(),
-        ActionType.steal: BlockStealCounterAction(),
-        ActionType.assassinate: BlockAssassinationCounterAction(),
-    }[action_type]
+    return COUNTER_ACTIONS[action_type]
@@ -1,9 +1,11 @@
 import os
 import random
+import threading
+from functools import partial
 
 from langchain_core.runnables import RunnableSerializable
 from pydantic.dataclasses import dataclass
-from typing import Optional, List, Dict, Union, Tuple
+from typing import Any, Callable, Optional, List, Dict, Generator, TypeVar, Union, Tuple
 
 from src.models.action import ActionType
 from src.models.agents.analysis_agent import create_game_state_analyzer, analyzer_template
@@ -18,6 +20,9 @@ from src.models.agents.contester_chooser import (
     create_game_state_contester_chooser,
     contester_chooser_template,
 )
+from src.models.agents.decider_agent import create_game_state_decider, decider_template
+from src.models.agents.llm_client_factory import forget_cached_responses_on_failure
+from src.models.agents.retry_policy import RetryBudgetExhausted, RetryPolicy
 from src.models.agents.rationalizer_agent import rationale_template, create_game_state_rationalizer
 from src.models.agents.speech_redacter import create_game_speech_redacter, speech_redacter_template
 from src.models.agents.speech_smoothener_agent import (
@@ -25,9 +30,48 @@ from src.models.agents.speech_smoothener_agent import (
     speech_smoothing_template,
 )
 from src.models.traits import AICharacterTraits
+from src.utils.instrumentation import instrumentation
+from src.utils.logger import app_logger
+from src.utils.tracing import tracer
 
 openai_api_key = os.getenv("OPENAI_API_KEY")
-from src.utils.logger import app_logger
+
+# Decide on a move (analysis, rationale, action, target and dialogue) in a single model call
+fast_decision = os.getenv("AI_FAST_DECISION") == "1"
+
+# Print rationale and speech live as the model writes them
+stream_speech = os.getenv("AI_STREAM_SPEECH") == "1"
+
+TARGETED_ACTIONS = {ActionType.coup.value, ActionType.assassinate.value, ActionType.steal.value}
+
+# What an AI says when its speech could not be redacted
+REDACTION_FALLBACK_SPEECH = "..."
+
+# Build every agent chain in a background thread as soon as the players are created
+prewarm_agents = os.getenv("AI_PREWARM_AGENTS") == "1"
+
+# How each agent chain is built, in the order they are usually first needed during a game
+AGENT_FACTORIES: Dict[str, Callable[[str], RunnableSerializable]] = {
+    "analyzer": create_game_state_analyzer,
+    "rationalizer": create_game_state_rationalizer,
+    "chooser": create_game_state_chooser,
+    "smoothener": create_ai_speech_smoothing_agent,
+    "redacter": create_game_speech_redacter,
+    "challenger": create_game_state_challenger,
+    "contester_chooser": create_game_state_contester_chooser,
+    "chatter": create_ai_chatter_agent,
+    "discarder": create_ai_card_discarder_agent,
+    "decider": create_game_state_decider,
+}
+
+_chain_lock = threading.RLock()
+
+T = TypeVar("T")
+
+# A decision written once, as a generator that yields each model call it needs (the arguments of
+# `AIGameAgent._invoke`) and is sent back the response, or has the call's exception thrown in.
+# `AIGameAgent.run` makes the calls synchronously and `arun` asynchronously.
+Flow = Generator[Tuple, Any, T]
 
 
 class MyConfig:
@@ -46,42 +90,179 @@ class AIGameAgent:
     chatter: RunnableSerializable = None
     redacter: RunnableSerializable = None
     discarder: RunnableSerializable = None
+    decider: RunnableSerializable = None
     traits: AICharacterTraits = None
     last_rationale: str = None
+    fast_decision: bool = False
+    stream_speech: bool = False
+    retry_policy: RetryPolicy = None
 
     def __init__(self, name: str):
         self.name = name
 
     def __post_init__(self):
-        self.analyzer = create_game_state_analyzer(self.name)
-        self.rationalizer = create_game_state_rationalizer(self.name)
-        self.chooser = create_game_state_chooser(self.name)
-        self.contester_chooser = create_game_state_contester_chooser(self.name)
-        self.challenger = create_game_state_challenger(self.name)
-        self.smoothener = create_ai_speech_smoothing_agent(self.name)
-        self.chatter = create_ai_chatter_agent(self.name)
-        self.redacter = create_game_speech_redacter(self.name)
-        self.discarder = create_ai_card_discarder_agent(self.name)
         self.traits = AICharacterTraits()
         self.last_rationale = ""
+        self.fast_decision = fast_decision
+        self.stream_speech = stream_speech
+        self.retry_policy = RetryPolicy()
+
+    def chain(self, role: str) -> RunnableSerializable:
+        """Return the agent chain for `role`, building it on first use"""
+        chain = getattr(self, role)
+        if chain is None:
+            # A background prewarm may be building the same chain
+            with _chain_lock:
+                chain = getattr(self, role)
+                if chain is None:
+                    chain = AGENT_FACTORIES[role](self.name)
+                    setattr(self, role, chain)
+        return chain
+
+    def prewarm(self, roles: Optional[List[str]] = None) -> None:
+        """Build the chains for `roles` (all of them by default) ahead of their first use"""
+        for role in roles or self._roles_in_use():
+            self.chain(role)
+
+    def _roles_in_use(self) -> List[str]:
+        """The roles this agent will call on; in fast decision mode the decider (which stands in
+        for the analyzer, rationalizer and chooser on the agent's own turn) comes first"""
+        roles = [role for role in AGENT_FACTORIES if role != "decider"]
+        return ["decider", *roles] if self.fast_decision else roles
+
+    def _invoke(
+        self,
+        role: str,
+        message: Dict[str, str],
+        description: str,
+        validate: Optional[Callable] = None,
+    ):
+        """Invoke one of the agents (by attribute name) under the retry policy, logging and
+        instrumenting the exchange.
+
+        `validate` may transform the response, or raise to have it retried as a parse failure;
+        a rejected response is dropped from the response cache, so the retry asks the model again.
+        """
+        chain = self.chain(role)
+        app_logger.info(f"AI {self.name} {description}")
+
+        with instrumentation.track(role, self.name) as tracker, tracer.span(
+            role, "agent", player=self.name, phase=tracker.invocation.phase
+        ):
+
+            def attempt():
+                tracker.attempt()
+                with forget_cached_responses_on_failure():
+                    response = chain.invoke(message, config=tracker.config)
+                    app_logger.debug(
+                        f"Input Message: {message}\r\n\r\nResponse message: {response}"
+                    )
+                    return validate(response) if validate is not None else response
 
-    def analyze_state(self, game_state_summary, last_round_dialogue):
-        app_logger.info(f"AI {self.name} analyzing state")
+            return self.retry_policy.call(attempt, f"AI {self.name} {description}")
+
+    async def _ainvoke(
+        self,
+        role: str,
+        message: Dict[str, str],
+        description: str,
+        validate: Optional[Callable] = None,
+    ):
+        chain = self.chain(role)
+        app_logger.info(f"AI {self.name} {description} (async)")
+
+        # Async calls may overlap other players' calls, so each player gets a lane of their own
+        with instrumentation.track(role, self.name) as tracker, tracer.span(
+            role, "agent", lane=self.name, player=self.name, phase=tracker.invocation.phase
+        ):
+
+            async def attempt():
+                tracker.attempt()
+                with forget_cached_responses_on_failure():
+                    response = await chain.ainvoke(message, config=tracker.config)
+                    app_logger.debug(
+                        f"Input Message: {message}\r\n\r\nResponse message: {response}"
+                    )
+                    return validate(response) if validate is not None else response
+
+            return await self.retry_policy.acall(attempt, f"AI {self.name} {description}")
+
+    async def _astream(
+        self,
+        role: str,
+        message: Dict[str, str],
+        description: str,
+        on_chunk: Callable[[str], None],
+    ) -> str:
+        """Run a text-producing agent under the retry policy, passing each chunk to `on_chunk` as
+        it arrives (a retried stream starts over, so callers should reconcile at the end)"""
+        chain = self.chain(role)
+        app_logger.info(f"AI {self.name} {description} (streaming)")
+
+        # Async calls may overlap other players' calls, so each player gets a lane of their own
+        with instrumentation.track(role, self.name) as tracker, tracer.span(
+            role, "agent", lane=self.name, player=self.name, phase=tracker.invocation.phase
+        ):
+
+            async def attempt():
+                tracker.attempt()
+                response = ""
+                async for chunk in chain.astream(message, config=tracker.config):
+                    response += chunk
+                    on_chunk(chunk)
+                app_logger.debug(f"Input Message: {message}\r\n\r\nResponse message: {response}")
+                return response
+
+            return await self.retry_policy.acall(attempt, f"AI {self.name} {description}")
+
+    def run(self, flow: Flow[T]) -> T:
+        """Carry out `flow`, making its model calls one after the other"""
+        response, error = None, None
+        while True:
+            try:
+                call = flow.throw(error) if error is not None else flow.send(response)
+            except StopIteration as done:
+                return done.value
+            try:
+                response, error = self._invoke(*call), None
+            except Exception as e:
+                response, error = None, e
+
+    async def arun(self, flow: Flow[T]) -> T:
+        """Carry out `flow` without blocking the event loop while its model calls are made"""
+        response, error = None, None
+        while True:
+            try:
+                call = flow.throw(error) if error is not None else flow.send(response)
+            except StopIteration as done:
+                return done.value
+            try:
+                response, error = await self._ainvoke(*call), None
+            except Exception as e:
+                response, error = None, e
+
+    def analysis_flow(self, game_state_summary, last_round_dialogue) -> Flow[str]:
         message = {"input": analyzer_template(self.traits, game_state_summary, last_round_dialogue)}
-        response = self.analyzer.invoke(message)
-        app_logger.debug(f"Input Message: {message}\r\n\r\nResponse message: {response}")
-        return response
+        return (yield ("analyzer", message, "analyzing state"))
 
-    def _smoothen_speech(self, action: str, rationale: str, attempted_dialogue: str):
-        app_logger.info(
-            f"AI {self.name} Smoothening Speech to match its procedurally generated qualities"
-        )
+    def analyze_state(self, game_state_summary, last_round_dialogue):
+        return self.run(self.analysis_flow(game_state_summary, last_round_dialogue))
+
+    def _smoothen_flow(self, action: str, rationale: str, attempted_dialogue: str) -> Flow[str]:
         message = {
             "input": speech_smoothing_template(self.traits, action, rationale, attempted_dialogue)
         }
-        response = self.smoothener.invoke(message)
-        app_logger.debug(f"Input Message: {message}\r\n\r\nResponse message: {response}")
-        return response
+        try:
+            return (
+                yield (
+                    "smoothener",
+                    message,
+                    "Smoothening Speech to match its procedurally generated qualities",
+                )
+            )
+        except RetryBudgetExhausted:
+            # Unpolished, but still in character
+            return attempted_dialogue
 
     def create_rationale(
         self,
@@ -89,152 +270,267 @@ class AIGameAgent:
         allowed_actions: List[str],
         last_dialogue: Optional[List[str]] = None,
     ) -> Union[str, Dict, None]:
-        app_logger.info(f"AI {self.name} creating rationale")
         message = {
             "input": rationale_template(self.traits, game_analysis, allowed_actions, last_dialogue)
         }
-        response = self.rationalizer.invoke(message)
-        app_logger.debug(f"Input Message: {message}\r\n\r\nResponse message: {response}")
+        response = self._invoke("rationalizer", message, "creating rationale")
         self.last_rationale = response
         return response
 
-    def extract_choice(
-        self,
-        game_analysis: str,
-        allowed_actions: List[str],
-        rationale: str,
-        last_dialogue: Optional[List[str]] = None,
+    @staticmethod
+    def _unpack_choice(
+        extracted_response: Dict[str, str]
     ) -> Tuple[str, Optional[str], Optional[str]]:
-        extracted_response: Optional[Tuple[ActionType, Optional[str], Optional[str]]] = None
-        while extracted_response is None:
-            try:
-                app_logger.info(f"AI {self.name} extracting choice")
-                message = {
-                    "input": chooser_template(
-                        self.traits, game_analysis, allowed_actions, rationale, last_dialogue
-                    )
-                }
-                extracted_response = self.chooser.invoke(message)
-                app_logger.debug(
-                    f"Input Message: {message}\r\n\r\nResponse message: {extracted_response}"
-                )
-
-            except Exception as e:
-                if "Got invalid JSON object." not in f"{e}":
-                    app_logger.warn(f"Received retryable error: {e}")
-                else:
-                    app_logger.debug(f"AI {self.name} failed to extract choice with error {e}")
-
         action: str = extracted_response["action"]
 
-        speech: Optional[str] = "None"
+        dialogue: Optional[str] = None
         if extracted_response["dialogue"] is not None and extracted_response["dialogue"] != "None":
-            speech = self._smoothen_speech(
-                extracted_response["action"], rationale, extracted_response["dialogue"]
-            )
+            dialogue = extracted_response["dialogue"]
 
         target: Optional[str] = None
         if extracted_response["target"] is not None:
             if extracted_response["target"] != "None":
                 target = extracted_response["target"]
 
-        app_logger.info(f"AI {self.name} redacting speech")
+        return (action, dialogue, target)
+
+    @classmethod
+    def _validate_choice(
+        cls, extracted_response: Dict[str, str], allowed_actions: List[str], targets: List[str]
+    ) -> Tuple[str, Optional[str], Optional[str]]:
+        """Unpack a choice and check it against the rules"""
+        action, dialogue, target = cls._unpack_choice(extracted_response)
+        if action not in allowed_actions:
+            raise ValueError(f"{action} is not one of the legal actions {allowed_actions}")
+        if action in TARGETED_ACTIONS and target not in targets:
+            raise ValueError(f"{action} needs one of {targets} as a target, not {target}")
+        return (action, dialogue, target)
+
+    def extract_raw_choice(
+        self,
+        game_analysis: str,
+        allowed_actions: List[str],
+        rationale: str,
+        last_dialogue: Optional[List[str]] = None,
+        targets: Optional[List[str]] = None,
+    ) -> Tuple[str, Optional[str], Optional[str]]:
+        """Ask the chooser for an action, its unpolished dialogue and its target; given the
+        possible `targets`, choices that break the rules are retried under the retry policy"""
         message = {
+            "input": chooser_template(
+                self.traits, game_analysis, allowed_actions, rationale, last_dialogue
+            )
+        }
+        validate = self._unpack_choice
+        if targets is not None:
+            validate = partial(
+                self._validate_choice, allowed_actions=allowed_actions, targets=targets
+            )
+        return self._invoke("chooser", message, "extracting choice", validate)
+
+    def extract_choice(
+        self,
+        game_analysis: str,
+        allowed_actions: List[str],
+        rationale: str,
+        last_dialogue: Optional[List[str]] = None,
+        targets: Optional[List[str]] = None,
+    ) -> Tuple[str, Optional[str], Optional[str]]:
+        action, dialogue, target = self.extract_raw_choice(
+            game_analysis, allowed_actions, rationale, last_dialogue, targets
+        )
+
+        speech: Optional[str] = "None"
+        if dialogue is not None:
+            speech = self.run(self._smoothen_flow(action, rationale, dialogue))
+
+        return (action, self.run(self._redact_flow(action, rationale, speech)), target)
+
+    @staticmethod
+    def _redaction_message(traits: AICharacterTraits, action: str, rationale: str, speech: str):
+        return {
             "input": speech_redacter_template(
-                self.traits,
+                traits,
                 "None" if action is None or action.lower() == "None" else action,
                 rationale,
                 speech,
             )
         }
-        speech = self.redacter.invoke(message)
-        app_logger.debug(f"Input Message: {message}\r\n\r\nResponse message: {speech}")
 
-        return (action, speech, target)
+    def _redact_flow(self, action: str, rationale: str, speech: str) -> Flow[str]:
+        message = self._redaction_message(self.traits, action, rationale, speech)
+        try:
+            return (yield ("redacter", message, "redacting speech"))
+        except RetryBudgetExhausted:
+            # Unredacted speech might give the game away, so say nothing of substance
+            return REDACTION_FALLBACK_SPEECH
 
-    def extract_contest_choice(
+    async def astream_rationale(
         self,
         game_analysis: str,
-        actor: str,
-        target: Optional[str],
         allowed_actions: List[str],
-        rationale: str,
+        on_chunk: Callable[[str], None],
         last_dialogue: Optional[List[str]] = None,
-    ) -> Tuple[str, Optional[str], Optional[str]]:
-        extracted_response: Optional[Tuple[ActionType, Optional[str], Optional[str]]] = None
-        while extracted_response is None:
-            try:
-                app_logger.info(f"AI {self.name} extracting CONTEST choice")
-                message = {
-                    "input": contester_chooser_template(
-                        self.traits,
-                        game_analysis,
-                        actor,
-                        target,
-                        allowed_actions,
-                        rationale,
-                        last_dialogue,
-                    )
-                }
-                extracted_response = self.contester_chooser.invoke(message)
-                app_logger.debug(
-                    f"Input Message: {message}\r\n\r\nResponse message: {extracted_response}"
-                )
-
-            except Exception as e:
-                if "Got invalid JSON object." not in f"{e}":
-                    app_logger.warn(f"Received retryable error: {e}")
-                else:
-                    app_logger.debug(f"AI {self.name} failed to extract choice with error {e}")
-
-        action: str = extracted_response["action"]
+    ) -> str:
+        """Like create_rationale, but passing the rationale to `on_chunk` as it is written"""
+        message = {
+            "input": rationale_template(self.traits, game_analysis, allowed_actions, last_dialogue)
+        }
+        response = await self._astream("rationalizer", message, "creating rationale", on_chunk)
+        self.last_rationale = response
+        return response
 
-        speech: Optional[str] = "None"
-        if extracted_response["dialogue"] is not None and extracted_response["dialogue"] != "None":
-            speech = self._smoothen_speech(
-                extracted_response["action"], rationale, extracted_response["dialogue"]
+    async def astream_speech(
+        self,
+        action: str,
+        rationale: str,
+        dialogue: Optional[str],
+        on_chunk: Callable[[str], None],
+    ) -> str:
+        """Smoothen the chooser's dialogue, then redact it, passing the redacted speech to
+        `on_chunk` as it is written. Only the redacter's output is ever streamed, so nothing it
+        would have taken out is shown; the returned speech may still differ from what was
+        streamed if the redacter had to be retried."""
+        speech = "None"
+        if dialogue is not None:
+            speech = await self.arun(self._smoothen_flow(action, rationale, dialogue))
+
+        message = self._redaction_message(self.traits, action, rationale, speech)
+        try:
+            return await self._astream("redacter", message, "redacting speech", on_chunk)
+        except RetryBudgetExhausted:
+            return REDACTION_FALLBACK_SPEECH
+
+    @staticmethod
+    def _validate_decision(
+        decision: Dict[str, str], allowed_actions: List[str], targets: List[str]
+    ) -> Tuple[str, str, str, str, Optional[str]]:
+        """Check a fused decision against the rules, returning its fields in a fixed order"""
+        missing = [
+            key
+            for key in ["analysis", "rationale", "action", "target", "dialogue"]
+            if not isinstance(decision.get(key), str)
+        ]
+        if missing:
+            raise ValueError(f"The decision is missing {', '.join(missing)}")
+
+        action = decision["action"]
+        if action not in allowed_actions:
+            raise ValueError(f"{action} is not one of the legal actions {allowed_actions}")
+
+        target = None if decision["target"] in ["None", ""] else decision["target"]
+        if action in TARGETED_ACTIONS:
+            if target not in targets:
+                raise ValueError(f"{action} needs one of {targets} as a target, not {target}")
+        else:
+            target = None
+
+        return decision["analysis"], decision["rationale"], action, decision["dialogue"], target
+
+    def decide(
+        self,
+        game_state_summary: str,
+        allowed_actions: List[str],
+        targets: List[str],
+        last_round_dialogue: Optional[List[str]] = None,
+    ) -> Tuple[str, str, str, str, Optional[str]]:
+        """Analyze the board and choose a move in one structured call.
+
+        Returns (analysis, rationale, action, speech, target); responses that fail
+        `_validate_decision` are retried under the retry policy.
+        """
+        message = {
+            "input": decider_template(
+                self.traits,
+                game_state_summary,
+                allowed_actions,
+                targets,
+                last_round_dialogue,
             )
+        }
+        decision = self._invoke(
+            "decider",
+            message,
+            "deciding on a move",
+            lambda response: self._validate_decision(response, allowed_actions, targets),
+        )
 
-        target: Optional[str] = None
-        if extracted_response["target"] is not None:
-            if extracted_response["target"] != "None":
-                target = extracted_response["target"]
+        _, rationale, action, speech, target = decision
+        self.last_rationale = rationale
+        return decision
 
-        app_logger.info(f"AI {self.name} redacting speech")
+    def _contest_choice_flow(
+        self,
+        game_analysis: str,
+        actor: str,
+        target: Optional[str],
+        allowed_actions: List[str],
+        rationale: str,
+        last_dialogue: Optional[List[str]] = None,
+    ) -> Flow[Tuple[str, Optional[str], Optional[str]]]:
         message = {
-            "input": speech_redacter_template(
+            "input": contester_chooser_template(
                 self.traits,
-                "None" if action is None or action.lower() == "None" else action,
+                game_analysis,
+                actor,
+                target,
+                allowed_actions,
                 rationale,
-                speech,
+                last_dialogue,
             )
         }
-        speech = self.redacter.invoke(message)
-        app_logger.debug(f"Input Message: {message}\r\n\r\nResponse message: {speech}")
+        action, dialogue, target = yield (
+            "contester_chooser",
+            message,
+            "extracting CONTEST choice",
+            self._unpack_choice,
+        )
+
+        speech: Optional[str] = "None"
+        if dialogue is not None:
+            speech = yield from self._smoothen_flow(action, rationale, dialogue)
 
-        return (action, speech, target)
+        return (action, (yield from self._redact_flow(action, rationale, speech)), target)
+
+    def challenge_reaction_flow(
+        self, game_analysis: str, actor: str, target: Optional[str], conversation: List[str]
+    ) -> Flow[Tuple[str, Optional[str], Optional[str]]]:
+        message = {
+            "input": challenger_template(self.traits, game_analysis, actor, target, conversation)
+        }
+        challenge_rationale = yield ("challenger", message, "determining challenge reaction")
+        return (
+            yield from self._contest_choice_flow(
+                game_analysis,
+                actor,
+                target,
+                ["Challenge", "None"],
+                challenge_rationale,
+                conversation,
+            )
+        )
 
     def determine_challenge_reaction(
         self, game_analysis: str, actor: str, target: Optional[str], conversation: List[str]
     ) -> Tuple[str, Optional[str], Optional[str]]:
-        challenge_rationale: Optional[str] = None
-        while challenge_rationale is None:
-            try:
-                app_logger.info(f"AI {self.name} determining challenge reaction")
-                message = {
-                    "input": challenger_template(
-                        self.traits, game_analysis, actor, target, conversation
-                    )
-                }
-                challenge_rationale = self.challenger.invoke(message)
-                app_logger.debug(
-                    f"Input Message: {message}\r\n\r\nResponse message: {challenge_rationale}"
-                )
-            except Exception as e:
-                app_logger.warn(e)
+        return self.run(self.challenge_reaction_flow(game_analysis, actor, target, conversation))
 
-        return self.extract_contest_choice(
-            game_analysis, actor, target, ["Challenge", "None"], challenge_rationale, conversation
+    def block_reaction_flow(
+        self,
+        game_analysis: str,
+        actor: str,
+        cards: List[str],
+        target: Optional[str],
+        conversation: List[str],
+    ) -> Flow[Tuple[str, Optional[str], Optional[str]]]:
+        message = {
+            "input": challenger_template(self.traits, game_analysis, actor, target, conversation)
+        }
+        block_rationale = yield ("challenger", message, "determining block reaction")
+        return (
+            yield from self._contest_choice_flow(
+                game_analysis, actor, target, ["Block", "None"], block_rationale, conversation
+            )
         )
 
     def determine_block_reaction(
@@ -245,69 +541,66 @@ class AIGameAgent:
         target: Optional[str],
         conversation: List[str],
     ) -> Tuple[str, Optional[str], Optional[str]]:
-        block_rationale: Optional[str] = None
-        while block_rationale is None:
-            try:
-                app_logger.info(f"AI {self.name} determining block reaction")
-                message = {
-                    "input": challenger_template(
-                        self.traits, game_analysis, actor, target, conversation
-                    )
-                }
-                block_rationale = self.challenger.invoke(message)
-                app_logger.debug(
-                    f"Input Message: {message}\r\n\r\nResponse message: {block_rationale}"
-                )
-            except Exception as e:
-                app_logger.warn(e)
-        return self.extract_contest_choice(
-            game_analysis, actor, target, ["Block", "None"], block_rationale, conversation
-        )
+        return self.run(self.block_reaction_flow(game_analysis, actor, cards, target, conversation))
 
     def check_chat(self, modifier: float = 1):
         return (self.traits.chattiness * modifier) > random.random()
 
+    def chat_flow(self, actor: str, event_to_chat_about: str, past_events=list[str]) -> Flow[str]:
+        message = {
+            "input": chatter_template(
+                traits=self.traits,
+                event_to_chat_about=event_to_chat_about,
+                past_events=past_events,
+                last_rationale=self.last_rationale,
+            )
+        }
+        unsmoothened_speech = yield ("chatter", message, "chatting")
+        return (
+            yield from self._smoothen_flow(
+                action="Chat",
+                rationale=self.last_rationale,
+                attempted_dialogue=unsmoothened_speech,
+            )
+        )
+
     def chat(self, actor: str, event_to_chat_about: str, past_events=list[str]) -> str:
-        speech: Optional[str] = None
-        while speech is None:
-            try:
-                app_logger.info(f"AI {self.name} chatting")
-                message = {
-                    "input": chatter_template(
-                        traits=self.traits,
-                        event_to_chat_about=event_to_chat_about,
-                        past_events=past_events,
-                        last_rationale=self.last_rationale,
-                    )
-                }
-                unsmoothened_speech = self.chatter.invoke(message)
-                app_logger.debug(
-                    f"Input Message: {message}\r\n\r\nResponse message: {unsmoothened_speech}"
-                )
-                speech = self._smoothen_speech(
-                    action="Chat",
-                    rationale=self.last_rationale,
-                    attempted_dialogue=unsmoothened_speech,
-                )
-            except Exception as e:
-                app_logger.warn(e)
-        return speech
+        return self.run(self.chat_flow(actor, event_to_chat_about, past_events))
+
+    @staticmethod
+    def _validate_discard(response: str, cards: List[str]) -> str:
+        if response.lower() not in [card.lower() for card in cards]:
+            raise ValueError(f"{response} is not one of the cards held, {cards}")
+        return response
 
     def discard(self, past_events: List[str], cards: List[str]) -> str:
-        target_card: Optional[str] = None
-        while target_card is None:
-            try:
-                app_logger.info(f"AI {self.name} discarding from {cards}")
-                message = {
-                    "input": discarder_template(
-                        traits=self.traits,
-                        past_events=past_events,
-                        last_rationale=self.last_rationale,
-                        cards=cards,
-                    )
-                }
-                target_card = self.discarder.invoke(message)
-                app_logger.debug(f"Input Message: {message}\r\n\r\nResponse message: {target_card}")
-            except Exception as e:
-                app_logger.warn(e)
-        return target_card
+        """Name the card to give up; answers naming a card not held are retried"""
+        message = {
+            "input": discarder_template(
+                traits=self.traits,
+                past_events=past_events,
+                last_rationale=self.last_rationale,
+                cards=cards,
+            )
+        }
+        return self._invoke(
+            "discarder",
+            message,
+            f"discarding from {cards}",
+            lambda response: self._validate_discard(response, cards),
+        )
+
+
+def prewarm_in_background(agents: List[AIGameAgent]) -> threading.Thread:
+    """Build the chains of every agent in a daemon thread, round-robin so that the roles needed
+    first are ready for everybody first"""
+
+    def prewarm():
+        roles = agents[0]._roles_in_use() if agents else []
+        for role in roles:
+            for agent in agents:
+                agent.chain(role)
+
+    thread = threading.Thread(target=prewarm, name="agent-prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -17,12 +17,14 @@ You will be given MARKDOWN with two tables that contains the current state of th
 I will give you `gamestate` which contains:
 - The first table will contain a list of PLAYERS, their COINS, their visible CARDS.
 - The second table will contain the current DECK count, the TREASURY coins remaining, and the DISCARD pile contents.
+- The third table, HAND ODDS, gives the chance that each other player holds each card, worked out
+  from everything the table has seen (claims, called bluffs, discards and exchanges).
 I will also give you `PAST_DIALOGUE` which contains a list of the dialogue that just occurred.
 Please refer to all other players by NAME.  Your name is "{name}"
 
 I would like for you to respond with a detailed analysis of the board.  This should contain, at least:
  - A breakdown of the current situation at large
- - A prediction for what each players' cards are (or UNKNOWN)
+ - What each player probably holds, going by the HAND ODDS rather than guessing, and whether their claims fit those odds
  - An analysis of what each player is postured to do and how likely they are to bluff given their conditions
  - An analysis of who is the greatest threat (to yourself) on the board, and what could be done to stop them
  - An analysis of who is a viable cooperator on the board, and how we might temporarily align with one another
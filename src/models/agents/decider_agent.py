@@ -0,0 +1,108 @@
+from typing import List, Optional
+
+from langchain.output_parsers import ResponseSchema, StructuredOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableSerializable
+
+from src.models.agents.llm_client_factory import create_llm
+from src.models.traits import AICharacterTraits
+
+
+# a function which returns a RunnableSerializable given a name parameter:
+def create_game_state_decider(name: str) -> RunnableSerializable:
+    decider_prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                f"""You are an AI-powered player in the game `The Resistance: Coup`.
+Your name is {name}.
+It is your turn to take an action.
+
+You will be given CHARACTER_QUALITY, which represents a qualitative description of HOW you should
+reason and speak-- like thought & speech roleplay.
+You will be given MARKDOWN (GAMESTATE) with the current state of the entire game, as is known to
+you: the PLAYERS, their COINS and their visible CARDS, then the DECK count, the TREASURY coins
+remaining and the DISCARD pile, and the HAND ODDS: the chance that each other player holds each
+card, worked out from everything the table has seen.
+You will also be given `PAST_DIALOGUE`, which contains the dialogue that just occurred.
+You will also be given a list of legal actions (LEGAL_ACTIONS) from which you could pick, and the
+PLAYERS you could target.
+
+In one go, you should analyze the board, decide on your move, and declare it.
+You should RESPOND with JSON describing five properties, which are described in the value fields
+below::
+```json
+    "analysis": "a brief analysis of the board: what each player probably holds (going by the HAND
+        ODDS), who is the greatest threat to you, and your immediate goal",
+    "rationale": "your internal thoughts about which move to make and why, in your own reasoning
+        style; this may include plans to lie or bluff",
+    "action": "one of the items from the list of LEGAL_ACTIONS, which constrains what you can do
+        according to the rules",
+    "target": "one of the PLAYERS that you are targeting with your action.  If there is no target
+        (such as in "Income" or "Foreign Aid"), just use the string "None"",
+    "dialogue": "dialogue text, in your own speech style, which should be a phrase, made of one or
+        two short sentences, which contains maybe lies and bluffs, declaring what you will do"
+```
+
+Remember:
+- Please refer to all other players by NAME.
+- Your "dialogue" should be based on your "rationale", but it should NEVER reveal it, or your cards,
+  or that you are bluffing.
+- Seek to influence others' thoughts about your own gameplay; this is a game of bluffing and
+  informational maneuvering.
+- "Income" is 1 coin, which is easy to confuse with "Tax", which is 3 coins and implies you hold a
+  Duke.
+- "Income" cannot be blocked.  It is not associated with a card.  It is not a "Duke" power.
+- "Foreign Aid" is not a card-associated move.  It can be blocked by certain cards.  It is not a
+  "Duke" power.
+- "Tax" is the "Duke" power. Dukes can block "Foreign Aid".  They CANNOT block "Steal".
+- "Ambassador" can block "Steal."  They can also exchange cards.
+- "Coup", "Assassinate" and "Steal" need a target; everything else does not.
+
+__ Please only respond with valid JSON (or an error description in plain text). __
+""",
+            ),
+            ("user", "{input}"),
+        ]
+    )
+    response_schemas = [
+        ResponseSchema(name="analysis", description="a brief analysis of the board"),
+        ResponseSchema(name="rationale", description="your internal thoughts about your move"),
+        ResponseSchema(name="action", description="one of the LEGAL_ACTIONS"),
+        ResponseSchema(name="target", description="one of the PLAYERS, or None"),
+        ResponseSchema(name="dialogue", description="dialogue declaring your intent to act"),
+    ]
+    output_parser = StructuredOutputParser.from_response_schemas(response_schemas)
+    return decider_prompt | create_llm() | output_parser
+
+
+def decider_template(
+    traits: AICharacterTraits,
+    game_state_summary: str,
+    allowed_actions: List[str],
+    targets: List[str],
+    last_round_dialogue: Optional[List[str]],
+) -> str:
+    # at least for now game_state_summary comes padded in its own ticks
+    return f"""
+```CHARACTER_QUALITY
+- Personality: You {traits.personality_trait}
+- Reasoning: You reason like a person that is {traits.rationalization_trait}
+- Speech: You {traits.speech_trait}
+```
+
+{game_state_summary}
+
+```PAST_DIALOGUE
+{last_round_dialogue}
+```
+
+```LEGAL_ACTIONS
+{allowed_actions}
+```
+
+```PLAYERS
+{targets}
+```
+
+"""
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+ACTIONS_REQUIRING_TARGET = {"Coup", "Assassinate", "Steal"}
+
+# How often a contesting player picks something other than "None" (i.e. Challenge or Block)
+CONTEST_PROBABILITY = 0.25
+
+_PLAYER_ROW_PATTERN = re.compile(r"(?:🤖|😬|:robot:|:grimacing:) (\S+)")
+_SPEAKER_PATTERN = re.compile(r"""(?:Your name is|You \()"?([^".)\n]+)""")
+
+_FREE_TEXT_LINES = [
+    "I think it is wise to keep my options open this turn.",
+    "Nobody at this table is as innocent as they look.",
+    "Coins are power, and power is what I need right now.",
+    "Let's see who blinks first.",
+    "I have a good feeling about this round.",
+    "Interesting move. I'll remember that.",
+    "Patience wins games like this one.",
+    "Someone here is definitely bluffing.",
+]
+
+
+def _section(prompt: str, name: str) -> str:
+    """Return the body of a ```NAME fenced block from one of the agent templates"""
+    match = re.search(rf"```{name}\n(.*?)```", prompt, re.DOTALL)
+    return match.group(1) if match else ""
+
+
+def _quoted(text: str) -> List[str]:
+    """Extract the quoted items of a rendered Python list, e.g. LEGAL_ACTIONS or CARDS"""
+    return re.findall(r"'([^']+)'", text) or re.findall(r'"([^"]+)"', text)
+
+
+class FakeCoupChatModel(BaseChatModel):
+    """A local, seedable stand-in for the OpenAI model.
+
+    It recognizes which agent is calling from the prompt and answers within that agent's
+    contract: JSON action/dialogue/target for the choosers (plus analysis and rationale for the
+    fused decider), a held card for the discarder, and free text for everyone else. Responses
+    are a pure function of the seed and the prompt, so a seeded game is reproducible no matter
+    how calls interleave.
+    """
+
+    seed: int = 0
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-coup"
+
+    def _rng(self, messages: List[BaseMessage]) -> random.Random:
+        return random.Random(f"{self.seed}\0" + "\0".join(f"{m.content}" for m in messages))
+
+    def _delay(self, rng: random.Random) -> float:
+        return self.latency + rng.uniform(0, self.latency_jitter)
+
+    def _respond(self, messages: List[BaseMessage], rng: random.Random) -> str:
+        system = f"{messages[0].content}" if len(messages) > 1 else ""
+        prompt = f"{messages[-1].content}"
+        speaker = _SPEAKER_PATTERN.search(system)
+        name = speaker.group(1).strip() if speaker else None
+
+        if "```LEGAL_ACTIONS" in prompt and "JSON" in system:
+            return self._choose(prompt, rng)
+        if "```CARDS" in prompt and "discard" in system:
+            cards = _quoted(_section(prompt, "CARDS"))
+            return rng.choice(cards) if cards else "None"
+        if "```GAMESTATE" in prompt:
+            return self._analyze(prompt, name, rng)
+        return rng.choice(_FREE_TEXT_LINES)
+
+    @staticmethod
+    def _analyze(prompt: str, name: Optional[str], rng: random.Random) -> str:
+        opponents = []
+        for line in _section(prompt, "GAMESTATE").splitlines():
+            row = _PLAYER_ROW_PATTERN.search(line)
+            if row is None or row.group(1) == name:
+                continue
+            if "💀" in line or ":skull:" in line:
+                continue
+            opponents.append(row.group(1))
+
+        threat = rng.choice(opponents) if opponents else "UNKNOWN"
+        return (
+            f"Opponents: {', '.join(opponents)}\n"
+            f"Greatest threat: {threat}\n"
+            f"Immediate goal: {rng.choice(_FREE_TEXT_LINES)}"
+        )
+
+    @staticmethod
+    def _choose(prompt: str, rng: random.Random) -> str:
+        legal_actions = _quoted(_section(prompt, "LEGAL_ACTIONS")) or ["None"]
+
+        if "```ACTOR" in prompt:
+            contests = [action for action in legal_actions if action != "None"]
+            action = "None"
+            if contests and rng.random() < CONTEST_PROBABILITY:
+                action = rng.choice(contests)
+        else:
+            action = rng.choice(legal_actions)
+
+        # The fused decider lists its targets and analyzes the board itself
+        fused = "```PLAYERS" in prompt
+        if fused:
+            opponents = _quoted(_section(prompt, "PLAYERS"))
+        else:
+            analysis = _section(prompt, "DETAILED_ANALYSIS")
+            match = re.search(r"^Opponents: (.*)$", analysis, re.MULTILINE)
+            opponents = [o for o in match.group(1).split(", ") if o] if match else []
+
+        target = "None"
+        if action in ACTIONS_REQUIRING_TARGET and opponents:
+            target = rng.choice(opponents)
+
+        response = {
+            "action": action,
+            "dialogue": rng.choice(_FREE_TEXT_LINES),
+            "target": target,
+        }
+        if fused:
+            response["analysis"] = (
+                f"Opponents: {', '.join(opponents)}\n"
+                f"Greatest threat: {rng.choice(opponents) if opponents else 'UNKNOWN'}"
+            )
+            response["rationale"] = rng.choice(_FREE_TEXT_LINES)
+        return f"```json\n{json.dumps(response)}\n```"
+
+    @staticmethod
+    def _chunks(content: str) -> List[str]:
+        """Split a response into word-sized chunks, the way a streaming API delivers tokens"""
+        return re.findall(r"\s*\S+", content) or [content]
+
+    @staticmethod
+    def _result(messages: List[BaseMessage], content: str) -> ChatResult:
+        # Report token usage like the OpenAI API does, estimated at four characters per token
+        prompt_tokens = sum(len(f"{message.content}") // 4 + 1 for message in messages)
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=content))],
+            llm_output={
+                "token_usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(content) // 4 + 1,
+                },
+                "model_name": "fake-coup",
+            },
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        rng = self._rng(messages)
+        if delay := self._delay(rng):
+            time.sleep(delay)
+        return self._result(messages, self._respond(messages, rng))
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        rng = self._rng(messages)
+        if delay := self._delay(rng):
+            await asyncio.sleep(delay)
+        return self._result(messages, self._respond(messages, rng))
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        rng = self._rng(messages)
+        delay = self._delay(rng)
+        chunks = self._chunks(self._respond(messages, rng))
+        for chunk in chunks:
+            if delay:
+                time.sleep(delay / len(chunks))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=chunk))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        rng = self._rng(messages)
+        delay = self._delay(rng)
+        chunks = self._chunks(self._respond(messages, rng))
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay / len(chunks))
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=chunk))
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from src.utils.logger import app_logger
+
+# The entries read or written by the model call in progress, so that they can be dropped again
+_touched_keys: ContextVar[Optional[List[str]]] = ContextVar("touched_keys", default=None)
+
+
+def _model_name_from_llm_string(llm_string: str) -> str:
+    """Pull the model name out of LangChain's serialized model configuration"""
+    serialized_model, _, _ = llm_string.partition("---")
+    try:
+        kwargs = json.loads(serialized_model).get("kwargs", {})
+        return kwargs.get("model_name") or kwargs.get("model") or llm_string
+    except (ValueError, AttributeError):
+        return llm_string
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so that re-indented templates still hit the same entry"""
+    return " ".join(prompt.split())
+
+
+class SQLiteResponseCache(BaseCache):
+    """A persistent LLM response cache, keyed by model name plus the normalized prompt.
+
+    Entries are evicted least-recently-used first once the stored responses exceed `max_bytes`.
+    """
+
+    def __init__(self, database_path: str, max_bytes: int = 64 * 1024 * 1024):
+        self.database_path = database_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model_name TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        model_name = _model_name_from_llm_string(llm_string)
+        return hashlib.sha256(f"{model_name}\0{_normalize_prompt(prompt)}".encode()).hexdigest()
+
+    @staticmethod
+    def _touch(key: str) -> None:
+        touched = _touched_keys.get()
+        if touched is not None:
+            touched.append(key)
+
+    @contextmanager
+    def forget_on_failure(self) -> Iterator[None]:
+        """Drop the entries looked up or stored inside the block if it raises, e.g. because the
+        response was rejected by its parser: retries then reach the model instead of getting the
+        same bad response back, and it is not served again in later games"""
+        touched: List[str] = []
+        token = _touched_keys.set(touched)
+        try:
+            yield
+        except Exception:
+            self.forget(touched)
+            raise
+        finally:
+            _touched_keys.reset(token)
+
+    def forget(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        with self._lock:
+            self._connection.executemany(
+                "DELETE FROM responses WHERE key = ?", [(key,) for key in set(keys)]
+            )
+            self._connection.commit()
+        app_logger.debug(f"LLM response cache dropped {len(set(keys))} rejected entries")
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        self._touch(key)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._connection.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._connection.commit()
+
+        with warnings.catch_warnings():
+            # `loads` is flagged as beta and would warn on every cache hit
+            warnings.simplefilter("ignore")
+            return [loads(generation) for generation in json.loads(row[0])]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        self._touch(key)
+        value = json.dumps([dumps(generation) for generation in return_val])
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, model_name, value, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, _model_name_from_llm_string(llm_string), value, len(value), time.time()),
+            )
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        (total_size,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total_size <= self.max_bytes:
+            return
+
+        stale_keys = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_used ASC"
+        ):
+            if total_size <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total_size -= size
+
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+        self.evictions += len(stale_keys)
+        app_logger.debug(f"LLM response cache evicted {len(stale_keys)} entries")
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
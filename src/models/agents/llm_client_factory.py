@@ -1,12 +1,121 @@
 import os
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, Optional
 
+from langchain_core.globals import set_llm_cache
 from langchain_core.runnables import RunnableSerializable
-from langchain_openai import ChatOpenAI
+
+from src.models.agents.llm_cache import SQLiteResponseCache
 
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
 model_name = "gpt-4-1106-preview"
 
+# Which backend create_llm hands out: "openai", or "fake" for a local, seedable model
+llm_backend = os.getenv("LLM_BACKEND", "openai")
+
+# Settings for the fake backend: seed, plus injected latency (in seconds) for load testing
+fake_llm_seed = int(os.getenv("LLM_FAKE_SEED", 0))
+fake_llm_latency = float(os.getenv("LLM_FAKE_LATENCY", 0))
+fake_llm_latency_jitter = float(os.getenv("LLM_FAKE_LATENCY_JITTER", 0))
+
+# Connection pool shared by every OpenAI-backed agent in the process
+llm_max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+llm_max_keepalive_connections = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", 10))
+llm_keepalive_expiry = float(os.getenv("LLM_KEEPALIVE_EXPIRY", 60.0))
+
+# Optional persistent response cache, e.g. LLM_CACHE_PATH=.llm_cache.sqlite
+llm_cache_path = os.getenv("LLM_CACHE_PATH")
+llm_cache_max_bytes = int(os.getenv("LLM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+_response_cache: Optional[SQLiteResponseCache] = None
+_shared_openai_llm: Optional[RunnableSerializable] = None
+
+
+def get_response_cache() -> Optional[SQLiteResponseCache]:
+    """Return the process-wide response cache (installed on first use), if one is configured"""
+    global _response_cache
+    if _response_cache is None and llm_cache_path:
+        _response_cache = SQLiteResponseCache(llm_cache_path, max_bytes=llm_cache_max_bytes)
+        set_llm_cache(_response_cache)
+    return _response_cache
+
+
+@contextmanager
+def forget_cached_responses_on_failure() -> Iterator[None]:
+    """Keep responses that the block goes on to reject out of the response cache, if any"""
+    cache = get_response_cache()
+    with cache.forget_on_failure() if cache is not None else nullcontext():
+        yield
+
+
+def _create_openai_llm() -> RunnableSerializable:
+    """Return the process-wide chat model, whose sync and async OpenAI clients each keep a
+    single pool of keep-alive connections.
+
+    Every agent of every player shares it (the model holds no per-conversation state), so a
+    connection opened for one call is reused by the next instead of each agent paying for its
+    own TLS handshakes.
+    """
+    global _shared_openai_llm
+    if _shared_openai_llm is None:
+        import httpx
+        import openai
+        from langchain_openai import ChatOpenAI
+
+        limits = httpx.Limits(
+            max_connections=llm_max_connections,
+            max_keepalive_connections=llm_max_keepalive_connections,
+            keepalive_expiry=llm_keepalive_expiry,
+        )
+        timeout = httpx.Timeout(600.0, connect=10.0)
+        api_key = f"{openai_api_key}"
+        base_url = os.getenv("OPENAI_API_BASE") or None
+
+        _shared_openai_llm = ChatOpenAI(
+            model_name=model_name,
+            openai_api_key=api_key,
+            client=openai.OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=httpx.Client(limits=limits, timeout=timeout),
+            ).chat.completions,
+            async_client=openai.AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=httpx.AsyncClient(limits=limits, timeout=timeout),
+            ).chat.completions,
+        )
+    return _shared_openai_llm
+
+
+def _create_fake_llm() -> RunnableSerializable:
+    from src.models.agents.fake_llm import FakeCoupChatModel
+
+    return FakeCoupChatModel(
+        seed=fake_llm_seed, latency=fake_llm_latency, latency_jitter=fake_llm_latency_jitter
+    )
+
+
+_backends: Dict[str, Callable[[], RunnableSerializable]] = {
+    "openai": _create_openai_llm,
+    "fake": _create_fake_llm,
+}
+
+
+def register_llm_backend(name: str, factory: Callable[[], RunnableSerializable]) -> None:
+    """Make another model backend available to create_llm"""
+    _backends[name] = factory
+
+
+def set_llm_backend(name: str) -> None:
+    """Switch the backend used by every agent created from now on"""
+    global llm_backend
+    if name not in _backends:
+        raise ValueError(f"Unknown LLM backend '{name}', expected one of {sorted(_backends)}")
+    llm_backend = name
+
 
 def create_llm() -> RunnableSerializable:
-    return ChatOpenAI(model_name=model_name, openai_api_key=f"{openai_api_key}")
+    get_response_cache()
+    return _backends[llm_backend]()
@@ -0,0 +1,221 @@
+import asyncio
+import functools
+import os
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from langchain_core.exceptions import OutputParserException
+
+from src.utils.logger import app_logger
+from src.utils.tracing import tracer
+
+try:
+    import httpx
+    import openai
+
+    _TRANSIENT_ERRORS = (
+        ConnectionError,
+        TimeoutError,
+        asyncio.TimeoutError,
+        httpx.TransportError,
+        openai.APIConnectionError,
+    )
+except ImportError:
+    _TRANSIENT_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+# How many model calls a single decision may spend before falling back to a default
+retry_attempts = int(os.getenv("AI_RETRY_ATTEMPTS", 4))
+
+# Backoff (in seconds) after the first transient failure, doubling with every attempt
+retry_base_delay = float(os.getenv("AI_RETRY_BASE_DELAY", 1.0))
+retry_max_delay = float(os.getenv("AI_RETRY_MAX_DELAY", 30.0))
+
+T = TypeVar("T")
+
+
+class ErrorKind(str, Enum):
+    rate_limit = "rate limit"
+    transient = "transient"
+    parse = "parse"
+    fatal = "fatal"
+
+
+class RetryBudgetExhausted(Exception):
+    """Raised when a decision has used up its attempts; callers fall back to a default"""
+
+    def __init__(self, description: str, last_error: Exception):
+        super().__init__(f"{description} failed after exhausting its retries: {last_error}")
+        self.last_error = last_error
+
+
+class RetryBudget:
+    """The failed attempts left to one decision, shared by every model call made for it (and by
+    any retries of the decision itself)"""
+
+    def __init__(self, max_attempts: Optional[int] = None):
+        # Set by the first policy to draw on the budget, unless given
+        self.max_attempts = max_attempts
+        self.failures = 0
+
+    def fail(self, max_attempts: int) -> bool:
+        """Count a failed attempt, returning whether the decision may try again"""
+        if self.max_attempts is None:
+            self.max_attempts = max_attempts
+        self.failures += 1
+        return self.failures < self.max_attempts
+
+
+# The budget of the decision being made, if any
+current_budget: ContextVar[Optional[RetryBudget]] = ContextVar("current_budget", default=None)
+
+
+def per_decision(method: Callable) -> Callable:
+    """Have every model call made inside the decorated (sync or async) method draw on a single
+    retry budget; nested decisions share the outermost one"""
+
+    if asyncio.iscoroutinefunction(method):
+
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            if current_budget.get() is not None:
+                return await method(*args, **kwargs)
+            token = current_budget.set(RetryBudget())
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                current_budget.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if current_budget.get() is not None:
+            return method(*args, **kwargs)
+        token = current_budget.set(RetryBudget())
+        try:
+            return method(*args, **kwargs)
+        finally:
+            current_budget.reset(token)
+
+    return wrapper
+
+
+def classify_error(error: Exception) -> ErrorKind:
+    """Sort a failed model call into rate limiting, transient trouble, a response we could not
+    use, or a request that will never succeed"""
+    status_code = getattr(error, "status_code", None)
+    if status_code == 429 or "rate limit" in f"{error}".lower():
+        return ErrorKind.rate_limit
+    if isinstance(error, _TRANSIENT_ERRORS):
+        return ErrorKind.transient
+    if isinstance(status_code, int):
+        return ErrorKind.transient if status_code >= 500 or status_code == 408 else ErrorKind.fatal
+    if isinstance(error, (OutputParserException, ValueError, KeyError, TypeError)):
+        return ErrorKind.parse
+    return ErrorKind.transient
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """The server's requested wait, if a rate limit response carried one"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """Retry a model call with exponential backoff and jitter, within an attempt budget.
+
+    Unusable responses are retried right away (another sample will likely parse); transient
+    errors back off exponentially, and rate limits back off four times as long (or as long as
+    the server asks). Requests that can never succeed are not retried at all.
+
+    Within a `per_decision` method, all the calls made for the decision share `max_attempts`
+    failed attempts between them: each call still gets its first attempt, but is only retried
+    while the decision has failures to spare. Elsewhere, every call has a budget of its own.
+    """
+
+    max_attempts: int = field(default_factory=lambda: retry_attempts)
+    base_delay: float = field(default_factory=lambda: retry_base_delay)
+    max_delay: float = field(default_factory=lambda: retry_max_delay)
+    jitter: float = 0.5
+    rate_limit_factor: float = 4.0
+
+    def delay(self, kind: ErrorKind, attempt: int, error: Optional[Exception] = None) -> float:
+        """Seconds to wait after the `attempt`-th (zero-based) failure"""
+        if kind is ErrorKind.parse:
+            return 0.0
+
+        delay = self.base_delay * 2**attempt
+        if kind is ErrorKind.rate_limit:
+            delay *= self.rate_limit_factor
+        delay = min(delay, self.max_delay)
+
+        # Spread out retries from players that failed at the same moment
+        delay *= 1 - self.jitter * random.random()
+
+        # ...but never come back sooner than the server asked
+        if kind is ErrorKind.rate_limit and error is not None:
+            retry_after = _retry_after(error)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _budget(self) -> RetryBudget:
+        return current_budget.get() or RetryBudget(self.max_attempts)
+
+    def retry_allowed(self) -> bool:
+        """Count a failure outside a model call (such as an unusable decision) against the
+        current budget, returning whether the decision may try again"""
+        return self._budget().fail(self.max_attempts)
+
+    def _next_delay(
+        self, description: str, attempt: int, error: Exception, budget: RetryBudget
+    ) -> float:
+        kind = classify_error(error)
+        if kind is ErrorKind.fatal or not budget.fail(self.max_attempts):
+            app_logger.warning(f"{description} failed ({kind.value} error), giving up: {error}")
+            raise RetryBudgetExhausted(description, error) from error
+
+        delay = self.delay(kind, attempt, error)
+        app_logger.warning(
+            f"{description} failed ({kind.value} error), retrying in {delay:.1f}s: {error}"
+        )
+        return delay
+
+    def call(self, attempt: Callable[[], T], description: str) -> T:
+        """Call `attempt` until it succeeds, raising RetryBudgetExhausted when out of attempts"""
+        if self.max_attempts <= 0:
+            raise RetryBudgetExhausted(description, RuntimeError("no attempts allowed"))
+        budget = self._budget()
+        attempt_number = 0
+        while True:
+            try:
+                return attempt()
+            except Exception as e:
+                delay = self._next_delay(description, attempt_number, e, budget)
+                with tracer.span("backoff", "retry", error=classify_error(e).value):
+                    time.sleep(delay)
+            attempt_number += 1
+
+    async def acall(self, attempt: Callable[[], Awaitable[T]], description: str) -> T:
+        """Await `attempt` until it succeeds, raising RetryBudgetExhausted when out of attempts"""
+        if self.max_attempts <= 0:
+            raise RetryBudgetExhausted(description, RuntimeError("no attempts allowed"))
+        budget = self._budget()
+        attempt_number = 0
+        while True:
+            try:
+                return await attempt()
+            except Exception as e:
+                delay = self._next_delay(description, attempt_number, e, budget)
+                with tracer.span("backoff", "retry", error=classify_error(e).value):
+                    await asyncio.sleep(delay)
+            attempt_number += 1
@@ -1,7 +1,8 @@
+import random
 from enum import Enum
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class CardType(str, Enum):
@@ -30,6 +31,9 @@ CARD_BACKGROUND_COLOR_MAP: Dict[CardType, str] = {
 
 
 class Card(BaseModel):
+    # Cards are shared (see CARDS), so they cannot be changed once built
+    model_config = ConfigDict(frozen=True)
+
     foreground_color: str
     background_color: str
     card_type: CardType
@@ -42,28 +46,94 @@ class Card(BaseModel):
         return f"{self.card_type.value}"
 
 
-def build_deck() -> List[Card]:
-    def _create_card(card_type: CardType):
-        return Card(
-            foreground_color=CARD_FOREGROUND_COLOR_MAP.get(card_type),
-            background_color=CARD_BACKGROUND_COLOR_MAP.get(card_type),
-            card_type=card_type,
+def create_card(card_type: CardType) -> Card:
+    return Card(
+        foreground_color=CARD_FOREGROUND_COLOR_MAP.get(card_type),
+        background_color=CARD_BACKGROUND_COLOR_MAP.get(card_type),
+        card_type=card_type,
+    )
+
+
+# Cards never change once made, so every hand and deck holds the same instance of each type
+CARDS: Dict[CardType, Card] = {card_type: create_card(card_type) for card_type in CardType}
+
+COPIES_PER_CARD = 3
+
+
+class Deck:
+    """The court deck, kept as a count of each card type rather than as a list in shuffled order.
+
+    Drawing takes one of the cards left uniformly at random, which is all that drawing the top
+    card of a freshly shuffled deck amounts to; so a card can be put back and another drawn
+    without reshuffling anything, and both take constant time. The order of the deck is never
+    observable: iterating over it yields the cards left grouped by type.
+    """
+
+    def __init__(self, cards: Iterable[CardType] = ()):
+        self._counts: Dict[CardType, int] = dict.fromkeys(CardType, 0)
+        self._size = 0
+        for card_type in cards:
+            self.put_back(card_type)
+
+    @classmethod
+    def full(cls, copies: int = COPIES_PER_CARD) -> "Deck":
+        deck = cls()
+        deck._counts = dict.fromkeys(CardType, copies)
+        deck._size = copies * len(deck._counts)
+        return deck
+
+    def draw(self, rng: random.Random = random) -> CardType:
+        """Take a card, every card left being equally likely"""
+        if not self._size:
+            raise IndexError("draw from an empty deck")
+        index = rng.randrange(self._size)
+        for card_type, count in self._counts.items():
+            if index < count:
+                self._counts[card_type] = count - 1
+                self._size -= 1
+                return card_type
+            index -= count
+
+    def put_back(self, card_type: CardType) -> None:
+        self._counts[card_type] += 1
+        self._size += 1
+
+    def remove(self, card_type: CardType) -> None:
+        """Take out a card of the given type"""
+        if not self._counts[card_type]:
+            raise ValueError(f"The deck holds no {card_type.value}")
+        self._counts[card_type] -= 1
+        self._size -= 1
+
+    def count(self, card_type: CardType) -> int:
+        return self._counts[card_type]
+
+    def copy(self) -> "Deck":
+        deck = Deck()
+        deck._counts = self._counts.copy()
+        deck._size = self._size
+        return deck
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, card_type: CardType) -> bool:
+        return self._counts.get(card_type, 0) > 0
+
+    def __iter__(self) -> Iterator[CardType]:
+        for card_type, count in self._counts.items():
+            for _ in range(count):
+                yield card_type
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Deck) and self._counts == other._counts
+
+    def __repr__(self) -> str:
+        counts = ", ".join(
+            f"{card_type.value}={count}" for card_type, count in self._counts.items()
         )
+        return f"Deck({counts})"
+
 
-    return [
-        _create_card(CardType.contessa),
-        _create_card(CardType.contessa),
-        _create_card(CardType.contessa),
-        _create_card(CardType.duke),
-        _create_card(CardType.duke),
-        _create_card(CardType.duke),
-        _create_card(CardType.assassin),
-        _create_card(CardType.assassin),
-        _create_card(CardType.assassin),
-        _create_card(CardType.ambassador),
-        _create_card(CardType.ambassador),
-        _create_card(CardType.ambassador),
-        _create_card(CardType.captain),
-        _create_card(CardType.captain),
-        _create_card(CardType.captain),
-    ]
+def build_deck() -> Deck:
+    return Deck.full()
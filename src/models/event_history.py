@@ -0,0 +1,139 @@
+import os
+import re
+from collections import Counter, deque
+from typing import Any, Dict, Iterator, List, Optional
+
+# How many of the latest events are kept word for word
+history_recent_events = int(os.getenv("AI_HISTORY_EVENTS", 8))
+
+# Roughly how many tokens of history may be pasted into a single prompt
+history_token_budget = int(os.getenv("AI_HISTORY_TOKEN_BUDGET", 400))
+
+# Folded game events are kept to a line each
+FOLDED_EVENT_LENGTH = 120
+
+_SPEECH_PATTERN = re.compile(r'^(\S+) says(?: to \S+?,?)? "')
+
+
+def estimate_tokens(text: str) -> int:
+    """A cheap token estimate (about four characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+class EventHistory:
+    """A bounded log of what happened (and what was said) during a round.
+
+    The latest `max_recent` events are kept as they are; older ones are folded into a running
+    summary, where game events are kept as short lines and speech is reduced to who spoke how
+    often. Formatting it for a prompt renders as many of the newest events as fit in
+    `token_budget`, so prompt size stays flat however chatty the table gets.
+    """
+
+    def __init__(self, max_recent: Optional[int] = None, token_budget: Optional[int] = None):
+        self.max_recent = history_recent_events if max_recent is None else max_recent
+        self.token_budget = history_token_budget if token_budget is None else token_budget
+        self._recent: deque = deque()
+        self._folded_events: List[str] = []
+        self._folded_speech: Counter = Counter()
+        self._number_of_events = 0
+
+    def append(self, event: str) -> None:
+        self._recent.append(event)
+        self._number_of_events += 1
+        while len(self._recent) > self.max_recent:
+            self._fold(self._recent.popleft(), self._folded_events, self._folded_speech)
+
+    def extend(self, events: List[str]) -> None:
+        for event in events:
+            self.append(event)
+
+    def copy(self) -> "EventHistory":
+        history = EventHistory(self.max_recent, self.token_budget)
+        history._recent = self._recent.copy()
+        history._folded_events = self._folded_events.copy()
+        history._folded_speech = self._folded_speech.copy()
+        history._number_of_events = self._number_of_events
+        return history
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_recent": self.max_recent,
+            "token_budget": self.token_budget,
+            "recent": list(self._recent),
+            "folded_events": self._folded_events,
+            "folded_speech": dict(self._folded_speech),
+            "number_of_events": self._number_of_events,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EventHistory":
+        history = cls(data["max_recent"], data["token_budget"])
+        history._recent = deque(data["recent"])
+        history._folded_events = list(data["folded_events"])
+        history._folded_speech = Counter(data["folded_speech"])
+        history._number_of_events = data["number_of_events"]
+        return history
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the events that are still kept word for word"""
+        return iter(self._recent)
+
+    def __len__(self) -> int:
+        return self._number_of_events
+
+    @staticmethod
+    def _fold(event: str, folded_events: List[str], folded_speech: Counter) -> None:
+        speech = _SPEECH_PATTERN.match(event)
+        if speech is not None:
+            folded_speech[speech.group(1)] += 1
+        elif len(event) > FOLDED_EVENT_LENGTH:
+            folded_events.append(event[: FOLDED_EVENT_LENGTH - 3] + "...")
+        else:
+            folded_events.append(event)
+
+    @staticmethod
+    def _summarize(folded_events: List[str], folded_speech: Counter, token_budget: int) -> str:
+        speech = ", ".join(
+            f"{speaker} spoke {count} time{'s' if count > 1 else ''}"
+            for speaker, count in folded_speech.items()
+        )
+        speech = f"{speech}." if speech else ""
+
+        # Drop the oldest folded events until the summary fits
+        for dropped in range(len(folded_events) + 1):
+            events = (["..."] if dropped else []) + folded_events[dropped:]
+            summary = " ".join(["Earlier:", *events, speech]).strip()
+            if estimate_tokens(summary) <= token_budget:
+                return summary
+        return ""
+
+    def render(self, token_budget: Optional[int] = None) -> str:
+        """Format the history for a prompt, spending at most `token_budget` (estimated) tokens"""
+        remaining = self.token_budget if token_budget is None else token_budget
+
+        # The newest events are the most relevant, so they claim the budget first
+        shown: List[str] = []
+        recent = list(self._recent)
+        while recent and estimate_tokens(recent[-1]) + 1 <= remaining:
+            event = recent.pop()
+            remaining -= estimate_tokens(event) + 1
+            shown.insert(0, event)
+
+        # Whatever did not fit is summarized along with everything folded before it
+        folded_events = self._folded_events.copy()
+        folded_speech = self._folded_speech.copy()
+        for event in recent:
+            self._fold(event, folded_events, folded_speech)
+
+        lines = [f"- {event}" for event in shown]
+        if folded_events or folded_speech:
+            summary = self._summarize(folded_events, folded_speech, remaining)
+            if summary:
+                lines.insert(0, summary)
+        return "\n".join(lines) if lines else "None"
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __repr__(self) -> str:
+        return f"EventHistory({list(self._recent)!r}, events={self._number_of_events})"
@@ -1,11 +1,14 @@
 import random
-import time
 from typing import List, Optional, Tuple, Union
 
-from src.models.action import Action, get_counter_action, CounterAction
-from src.models.card import Card
+from src.models.action import Action, ActionType, get_counter_action, CounterAction
+from src.models.agents.ai_orchestrator import Flow
+from src.models.agents.retry_policy import RetryBudgetExhausted, per_decision
+from src.models.card import Card, CardType
 from src.models.players.base import BasePlayer
-from src.utils.print import print_text, print_texts
+from src.utils.aio import run_coroutine
+from src.utils.instrumentation import in_phase
+from src.utils.print import StreamingText, print_text, print_texts
 from src.utils.logger import app_logger
 
 CHALLENGE_CONSTANT = 0.5
@@ -14,6 +17,8 @@ CHALLENGE_CONSTANT = 0.5
 class AIPlayer(BasePlayer):
     is_ai: bool = True
 
+    @in_phase("action")
+    @per_decision
     def choose_action(
         self,
         other_players: List[BasePlayer],
@@ -25,63 +30,182 @@ class AIPlayer(BasePlayer):
         available_actions = self.available_actions()
         print_text(f"[bold magenta]{self}[/] is thinking about their move...", with_markup=True)
 
+        # Rationale and speech are printed live as they are written, except for fused decisions
+        streaming = self.ai_agent.stream_speech and not self.ai_agent.fast_decision
+
         chosen_action: Optional[Action] = None
+        rationale: Optional[str] = None
         extracted_target: Optional[str] = None
         extracted_action: Optional[str] = None
-        while chosen_action is None:
+        extracted_speech: Optional[str] = None
+        # Every model call below, and every retry of the whole choice, shares one retry budget
+        while True:
             try:
-                analysis = self.ai_agent.analyze_state(state, last_round_dialogue)
-
-                rationale = self.ai_agent.create_rationale(
-                    analysis, [action.action_type for action in available_actions]
+                (
+                    rationale,
+                    extracted_action,
+                    extracted_speech,
+                    extracted_target,
+                ) = self._extract_action_choice(
+                    state, available_actions, other_players, last_round_dialogue, streaming
                 )
-
-                print_text(f'{self.name} thinks "[bold cyan]{rationale}[/]"', with_markup=True)
-
-                extracted_action, extracted_speech, extracted_target = self.ai_agent.extract_choice(
-                    analysis, [action.action_type for action in available_actions], rationale
+                chosen_action = self._match_action_choice(
+                    available_actions,
+                    other_players,
+                    extracted_action,
+                    extracted_speech,
+                    extracted_target,
                 )
+                break
 
-                # Which (if any) action matches the model output?
-                chosen_action: Union[Action, None] = None
-                for action in available_actions:
-                    if action.action_type == extracted_action:
-                        chosen_action = action
-
-                if chosen_action is None:
-                    available_actions_str = ", ".join(
-                        [action.action_type for action in available_actions]
-                    )
-                    app_logger.error(f"Bad action choice {chosen_action} for available actions")
-                    app_logger.error(f"Available actions: {available_actions_str}")
-                    app_logger.error(f"Extracted action: {extracted_action}")
-                    app_logger.error(f"Extracted speech: {extracted_speech}")
-                    app_logger.error(f"Extracted target: {extracted_target}")
-                    raise RuntimeError("The agent did not choose a valid action")
-
+            except RetryBudgetExhausted as e:
+                app_logger.error(e)
+                break
             except Exception as e:
                 app_logger.error(f"Bad action choice {chosen_action} for available actions")
                 app_logger.error(e)
+                if not self.ai_agent.retry_policy.retry_allowed():
+                    break
 
-        # Let's spare OpenAI the parsing of markup in speech:
-        headless_speech: str = ""
+        if chosen_action is None:
+            chosen_action, extracted_target = self._fallback_action(
+                available_actions, other_players
+            )
+            extracted_action = chosen_action.action_type
+            extracted_speech = f"I'll go with {extracted_action}."
+            streaming = False
+            print_text(
+                f"[bold magenta]{self}[/] can't make up their mind, and goes with their gut.",
+                with_markup=True,
+            )
 
         # Which (if any) target matches the model output?\
         if extracted_target == "None":
             extracted_target = None
 
-        if extracted_target is None:
-            headless_speech = f'{self.name} says "[{extracted_speech}"'
+        headless_speech = self._speak_action_choice(
+            extracted_action, rationale, extracted_speech, extracted_target, streaming
+        )
+
+        self.pacing.pause(1)
+
+        self._check_coup_choice(available_actions, extracted_action, extracted_target)
+
+        chosen_target: Optional[BasePlayer] = None
+        if extracted_target is not None:
+            for player in other_players:
+                if player.name == extracted_target:
+                    chosen_target = player
+
+        return chosen_action, chosen_target, headless_speech
+
+    def _extract_action_choice(
+        self,
+        state: str,
+        available_actions: Tuple[Action, ...],
+        other_players: List[BasePlayer],
+        last_round_dialogue: Optional[List[str]],
+        streaming: bool,
+    ) -> Tuple[str, str, Optional[str], Optional[str]]:
+        """The rationale, action, speech and target the agent comes up with"""
+        action_types = [action.action_type for action in available_actions]
+        targets = [player.name for player in other_players]
+        if self.ai_agent.fast_decision:
+            _, rationale, action, speech, target = self.ai_agent.decide(
+                state,
+                action_types,
+                targets,
+                last_round_dialogue,
+            )
+            print_text(f'{self.name} thinks "[bold cyan]{rationale}[/]"', with_markup=True)
+            return rationale, action, speech, target
+
+        analysis = self.ai_agent.analyze_state(state, last_round_dialogue)
+        if streaming:
+            with StreamingText(f'{self.name} thinks "', "bold cyan", '"') as thought:
+                rationale = run_coroutine(
+                    self.ai_agent.astream_rationale(analysis, action_types, thought.append)
+                )
+                # A retried stream starts over, after the text of the failed attempt
+                thought.reconcile(rationale)
+            action, speech, target = self.ai_agent.extract_raw_choice(
+                analysis, action_types, rationale, targets=targets
+            )
+        else:
+            rationale = self.ai_agent.create_rationale(analysis, action_types)
+            print_text(f'{self.name} thinks "[bold cyan]{rationale}[/]"', with_markup=True)
+            action, speech, target = self.ai_agent.extract_choice(
+                analysis, action_types, rationale, targets=targets
+            )
+        return rationale, action, speech, target
+
+    @staticmethod
+    def _match_action_choice(
+        available_actions: Tuple[Action, ...],
+        other_players: List[BasePlayer],
+        extracted_action: str,
+        extracted_speech: Optional[str],
+        extracted_target: Optional[str],
+    ) -> Action:
+        """Which action matches the model output, raising if none does"""
+        chosen_action: Union[Action, None] = None
+        for action in available_actions:
+            if action.action_type == extracted_action:
+                chosen_action = action
+
+        if chosen_action is not None and chosen_action.requires_target:
+            if extracted_target not in [player.name for player in other_players]:
+                app_logger.error(f"Bad target {extracted_target} for {chosen_action}")
+                chosen_action = None
+
+        if chosen_action is None:
+            available_actions_str = ", ".join([action.action_type for action in available_actions])
+            app_logger.error(f"Bad action choice {chosen_action} for available actions")
+            app_logger.error(f"Available actions: {available_actions_str}")
+            app_logger.error(f"Extracted action: {extracted_action}")
+            app_logger.error(f"Extracted speech: {extracted_speech}")
+            app_logger.error(f"Extracted target: {extracted_target}")
+            raise RuntimeError("The agent did not choose a valid action")
+        return chosen_action
+
+    def _speak_action_choice(
+        self,
+        extracted_action: str,
+        rationale: Optional[str],
+        extracted_speech: Optional[str],
+        extracted_target: Optional[str],
+        streaming: bool,
+    ) -> str:
+        """Print the speech that goes with the action, returning it as recorded for the others"""
+        if streaming:
+            # Redacted speech streams in, and is replaced if a retry changes it
+            to_target = f" to {extracted_target}," if extracted_target is not None else ""
+            with StreamingText(f'{self.name} says{to_target} "', "bold yellow", '"') as speech:
+                extracted_speech = run_coroutine(
+                    self.ai_agent.astream_speech(
+                        extracted_action, rationale, extracted_speech, speech.append
+                    )
+                )
+                speech.reconcile(extracted_speech)
+        elif extracted_target is None:
             print_text(f'{self.name} says "[bold yellow]{extracted_speech}[/]"', with_markup=True)
         else:
-            headless_speech = f'{self.name} says to {extracted_target} "[{extracted_speech}"'
             print_text(
                 f'{self.name} says to {extracted_target}, "[bold yellow]{extracted_speech}[/]"',
                 with_markup=True,
             )
 
-        time.sleep(1)
-
+        # Let's spare OpenAI the parsing of markup in speech:
+        if extracted_target is None:
+            return f'{self.name} says "[{extracted_speech}"'
+        return f'{self.name} says to {extracted_target} "[{extracted_speech}"'
+
+    @staticmethod
+    def _check_coup_choice(
+        available_actions: Tuple[Action, ...],
+        extracted_action: str,
+        extracted_target: Optional[str],
+    ) -> None:
         # Coup is only option
         if len(available_actions) == 1:
             if extracted_action != "Coup":
@@ -93,52 +217,148 @@ class AIPlayer(BasePlayer):
                     "Only coup is available, but the agent did not choose a target"
                 )
 
-        chosen_target: Optional[BasePlayer] = None
-        if extracted_target is not None:
-            for player in other_players:
-                if player.name == extracted_target:
-                    chosen_target = player
-
-        return chosen_action, chosen_target, headless_speech
-
-    def determine_challenge(
+    def _fallback_action(
+        self, available_actions: Tuple[Action, ...], other_players: List[BasePlayer]
+    ) -> Tuple[Action, Optional[str]]:
+        """A rule-based move for when the agent cannot decide: play honestly, couping or
+        assassinating the strongest opponent when possible, and otherwise take coins"""
+        actions = {action.action_type: action for action in available_actions}
+        opponents = [player for player in other_players if player.is_active]
+        strongest = max(opponents, key=lambda player: (len(player.cards), player.coins))
+        held = [card.card_type for card in self.cards]
+
+        if ActionType.coup in actions:
+            return actions[ActionType.coup], strongest.name
+        if ActionType.assassinate in actions and CardType.assassin in held:
+            return actions[ActionType.assassinate], strongest.name
+        if CardType.duke in held:
+            return actions[ActionType.tax], None
+        return actions[ActionType.income], None
+
+    def _holds_counter_to(self, action: Action) -> bool:
+        counter_card = get_counter_action(action.action_type).associated_card_type
+        return any(card.card_type == counter_card for card in self.cards)
+
+    def _announce_deliberation(
         self,
+        considering: str,
         actor: BasePlayer,
         target_player: Optional["BasePlayer"],
         action: Union[Action, CounterAction],
-        state: str,
-        dialogue_so_far: Optional[List[str]],
-    ) -> Tuple[bool, Optional[str]]:
-        """Choose whether to challenge the current player"""
+    ) -> None:
         if target_player is None:
             # Todo: chat?
             print_text(
-                f"[bold magenta]{self}[/] is considering challenging {actor}'s use of {action}...",
+                f"[bold magenta]{self}[/] is considering {considering} {actor}'s use of {action}...",
                 with_markup=True,
             )
         else:
             target_string = target_player.name if target_player is not self else "themselves"
             print_text(
-                f"[bold magenta]{self}[/] is considering challenging {actor}'s use of {action} against {target_string}...",
+                f"[bold magenta]{self}[/] is considering {considering} {actor}'s use of {action} "
+                f"against {target_string}...",
                 with_markup=True,
             )
-        analysis = self.ai_agent.analyze_state(state, dialogue_so_far)
 
-        action, dialogue, maybe_target = self.ai_agent.determine_challenge_reaction(
-            analysis,
-            actor.name,
-            target_player.name if target_player is not None else None,
-            dialogue_so_far,
+    def _headless_speech(self, speech: Optional[str]) -> Optional[str]:
+        return f'{self.name} says "{speech}"' if speech is not None else None
+
+    def _say(self, speech: Optional[str]) -> Optional[str]:
+        """Print what the player says, returning it as recorded for the other players"""
+        if speech is not None:
+            print_text(f'{self.name} says "[bold yellow]{speech}[/]"', with_markup=True)
+        return self._headless_speech(speech)
+
+    def _challenge_flow(
+        self,
+        actor: BasePlayer,
+        target_player: Optional["BasePlayer"],
+        action: Union[Action, CounterAction],
+        state: str,
+        dialogue_so_far: Optional[List[str]],
+    ) -> Flow[Tuple[bool, Optional[str]]]:
+        """Whether to challenge, and what to say (if anything)"""
+        self._announce_deliberation("challenging", actor, target_player, action)
+        try:
+            analysis = yield from self.ai_agent.analysis_flow(state, dialogue_so_far)
+
+            reaction, dialogue, _ = yield from self.ai_agent.challenge_reaction_flow(
+                analysis,
+                actor.name,
+                target_player.name if target_player is not None else None,
+                dialogue_so_far,
+            )
+        except RetryBudgetExhausted as e:
+            # Without a read on the table, let the claim stand
+            app_logger.error(e)
+            return False, None
+
+        return (reaction == "Challenge"), dialogue if self.ai_agent.check_chat() else None
+
+    @in_phase("challenge")
+    @per_decision
+    def determine_challenge(
+        self,
+        actor: BasePlayer,
+        target_player: Optional["BasePlayer"],
+        action: Union[Action, CounterAction],
+        state: str,
+        dialogue_so_far: Optional[List[str]],
+    ) -> Tuple[bool, Optional[str]]:
+        """Choose whether to challenge the current player"""
+        challenges, dialogue = self.ai_agent.run(
+            self._challenge_flow(actor, target_player, action, state, dialogue_so_far)
         )
+        return challenges, self._say(dialogue)
 
-        if self.ai_agent.check_chat():
-            headless_speech = f'{self.name} says "{dialogue}"'
-            print_text(f'{self.name} says "[bold yellow]{dialogue}[/]"', with_markup=True)
-        else:
-            headless_speech = None
+    @in_phase("challenge")
+    @per_decision
+    async def adetermine_challenge(
+        self,
+        actor: BasePlayer,
+        target_player: Optional["BasePlayer"],
+        action: Union[Action, CounterAction],
+        state: str,
+        dialogue_so_far: Optional[List[str]],
+    ) -> Tuple[bool, Optional[str]]:
+        """Choose whether to challenge the current player, without blocking other deliberations.
+
+        Speech is returned but not printed, so the caller can announce it in settlement order.
+        """
+        challenges, dialogue = await self.ai_agent.arun(
+            self._challenge_flow(actor, target_player, action, state, dialogue_so_far)
+        )
+        return challenges, self._headless_speech(dialogue)
+
+    def _counter_flow(
+        self,
+        actor: BasePlayer,
+        target_player: Optional["BasePlayer"],
+        action: Action,
+        state: str,
+        dialogue_so_far: Optional[List[str]],
+    ) -> Flow[Tuple[bool, Optional[str]]]:
+        """Whether to block, and what to say"""
+        self._announce_deliberation("blocking", actor, target_player, action)
+        try:
+            analysis = yield from self.ai_agent.analysis_flow(state, dialogue_so_far)
+
+            reaction, dialogue, _ = yield from self.ai_agent.block_reaction_flow(
+                game_analysis=analysis,
+                actor=actor.name,
+                cards=[f"{card}" for card in enumerate(self.cards)],
+                target=target_player.name if target_player is not None else None,
+                conversation=dialogue_so_far,
+            )
+        except RetryBudgetExhausted as e:
+            # Without a read on the table, only block with the card to back it up
+            app_logger.error(e)
+            return self._holds_counter_to(action), None
 
-        return (action == "Challenge"), headless_speech
+        return (reaction == "Block"), dialogue
 
+    @in_phase("counter")
+    @per_decision
     def determine_counter(
         self,
         actor: BasePlayer,
@@ -148,33 +368,53 @@ class AIPlayer(BasePlayer):
         dialogue_so_far: Optional[List[str]],
     ) -> Tuple[bool, Optional[str]]:
         """Choose whether to counter/block the current player's action"""
-        if target_player is None:
-            # Todo: chat?
-            print_text(
-                f"[bold magenta]{self}[/] is considering blocking {actor}'s use of {action}...",
-                with_markup=True,
-            )
-        else:
-            target_string = target_player.name if target_player is not self else "themselves"
-            print_text(
-                f"[bold magenta]{self}[/] is considering blocking {actor}'s use of {action} against {target_string}...",
-                with_markup=True,
-            )
-        analysis = self.ai_agent.analyze_state(state, dialogue_so_far)
-
-        action, dialogue, _ = self.ai_agent.determine_block_reaction(
-            game_analysis=analysis,
-            actor=actor.name,
-            cards=[f"{card}" for card in enumerate(self.cards)],
-            target=target_player.name if target_player is not None else None,
-            conversation=dialogue_so_far,
+        blocks, dialogue = self.ai_agent.run(
+            self._counter_flow(actor, target_player, action, state, dialogue_so_far)
         )
+        return blocks, self._say(dialogue)
 
-        headless_speech = f'{self.name} says "{dialogue}"'
-        print_text(f'{self.name} says "[bold yellow]{dialogue}[/]"', with_markup=True)
+    @in_phase("counter")
+    @per_decision
+    async def adetermine_counter(
+        self,
+        actor: BasePlayer,
+        target_player: Optional["BasePlayer"],
+        action: Action,
+        state: str,
+        dialogue_so_far: Optional[List[str]],
+    ) -> Tuple[bool, Optional[str]]:
+        """Choose whether to counter/block the current player's action, without blocking other
+        deliberations.
 
-        return (action == "Block"), headless_speech
+        Speech is returned but not printed, so the caller can announce it in settlement order.
+        """
+        blocks, dialogue = await self.ai_agent.arun(
+            self._counter_flow(actor, target_player, action, state, dialogue_so_far)
+        )
+        return blocks, self._headless_speech(dialogue)
 
+    def _chat_flow(
+        self,
+        actor: "BasePlayer",
+        event_to_chat_about: str,
+        past_events: Optional[List[str]],
+    ) -> Flow[Optional[str]]:
+        """What to say about the current event, if anything"""
+        if not self.ai_agent.check_chat():
+            return None
+
+        try:
+            return (
+                yield from self.ai_agent.chat_flow(
+                    actor=actor, event_to_chat_about=event_to_chat_about, past_events=past_events
+                )
+            )
+        except RetryBudgetExhausted as e:
+            app_logger.error(e)
+            return None
+
+    @in_phase("chat")
+    @per_decision
     def determine_chat(
         self,
         actor: "BasePlayer",
@@ -183,37 +423,49 @@ class AIPlayer(BasePlayer):
         modifier: Optional[float] = 1,
     ) -> Optional[str]:
         """Choose whether to chat about the current event"""
-        if self.ai_agent.check_chat():
-            speech = self.ai_agent.chat(
-                actor=actor, event_to_chat_about=event_to_chat_about, past_events=past_events
-            )
+        return self._say(
+            self.ai_agent.run(self._chat_flow(actor, event_to_chat_about, past_events))
+        )
 
-            headless_speech = f'{self.name} says "{speech}"'
-            print_text(f'{self.name} says "[bold yellow]{speech}[/]"', with_markup=True)
-            return headless_speech
+    @in_phase("chat")
+    @per_decision
+    async def adetermine_chat(
+        self,
+        actor: "BasePlayer",
+        event_to_chat_about: str,
+        past_events: Optional[List[str]],
+        modifier: Optional[float] = 1,
+    ) -> Optional[str]:
+        """Choose whether to chat about the current event, without blocking other players' chats.
 
-        return None
+        Speech is returned but not printed, so the caller can announce it in a stable order.
+        """
+        return self._headless_speech(
+            await self.ai_agent.arun(self._chat_flow(actor, event_to_chat_about, past_events))
+        )
 
-    def remove_card(self, past_events: List[str]) -> str:
-        """Choose a card and remove it from your hand"""
-        target_card: Optional[Card] = None
-        while target_card is None:
+    def _choose_card_to_give_up(self, past_events: List[str]) -> Card:
+        """Ask the agent which card to give up (answers naming cards not held are retried by the
+        agent), falling back to a random one if it cannot answer"""
+        try:
             target_discard = self.ai_agent.discard(
                 cards=[f"{card}" for card in self.cards],
                 past_events=past_events,
             )
+        except RetryBudgetExhausted as e:
+            app_logger.error(e)
+            return random.choice(self.cards)
 
-            for possible_target in self.cards:
-                app_logger.debug(
-                    f"Comparing: {str(possible_target).lower()}, {target_discard.lower()}"
-                )
-                if str(possible_target).lower() == target_discard.lower():
-                    target_card = possible_target
-                    break
-            if target_card is None:
-                app_logger.warn(
-                    f"AI {self.name} tried to discard {target_discard}, but they don't have that card"
-                )
+        for possible_target in self.cards:
+            if str(possible_target).lower() == target_discard.lower():
+                return possible_target
+        return random.choice(self.cards)
+
+    @in_phase("discard")
+    @per_decision
+    def remove_card(self, past_events: List[str]) -> str:
+        """Choose a card and remove it from your hand"""
+        self._choose_card_to_give_up(past_events)
 
         # TODO: run this through the chooser model, should work with fake actions like "DISCARD_ASSASSIN"
         # Remove a random card
@@ -221,6 +473,8 @@ class AIPlayer(BasePlayer):
         print_texts(f"{self} discards their ", (f"{discarded_card}", discarded_card.style), " card")
         return f"{discarded_card}"
 
+    @in_phase("discard")
+    @per_decision
     def choose_exchange_cards(
         self, exchange_cards: list[Card], past_events: List[str]
     ) -> Tuple[Card, Card]:
@@ -230,37 +484,10 @@ class AIPlayer(BasePlayer):
         random.shuffle(self.cards)
 
         print_text(f"{self} is thinking about which cards to discard...")
-        target_card_a: Optional[Card] = None
-        while target_card_a is None:
-            target_discard = self.ai_agent.discard(
-                cards=[f"{card}" for card in self.cards],
-                past_events=past_events,
-            )
-            for possible_target in self.cards:
-                if str(possible_target).lower() == target_discard.lower():
-                    target_card_a = possible_target
-                    break
-            if target_card_a is None:
-                app_logger.warn(
-                    f"AI {self.name} tried to discard {target_discard} (1), but they don't have that card"
-                )
-
+        target_card_a = self._choose_card_to_give_up(past_events)
         discard_a = self.cards.pop(self.cards.index(target_card_a))
 
-        target_card_b: Optional[Card] = None
-        while target_card_b is None:
-            target_discard = self.ai_agent.discard(
-                cards=[f"{card}" for card in self.cards],
-                past_events=past_events,
-            )
-            for possible_target in self.cards:
-                if str(possible_target).lower() == target_discard.lower():
-                    target_card_b = possible_target
-                    break
-            if target_card_b is None:
-                app_logger.warn(
-                    f"AI {self.name} tried to discard {target_discard} (2), but they don't have that card"
-                )
+        target_card_b = self._choose_card_to_give_up(past_events)
 
         print_text(f"{self} exchanges 2 cards")
         return discard_a, self.cards.pop(self.cards.index(target_card_b))
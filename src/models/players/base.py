@@ -2,21 +2,11 @@ from abc import ABC, abstractmethod
 from typing import List, Optional, Tuple, Union
 from src.models.agents.ai_orchestrator import AIGameAgent
 
-from pydantic import BaseModel
-
-from src.models.action import (
-    Action,
-    ActionType,
-    AssassinateAction,
-    CounterAction,
-    CoupAction,
-    ExchangeAction,
-    ForeignAidAction,
-    IncomeAction,
-    StealAction,
-    TaxAction,
-)
+from pydantic import BaseModel, Field
+
+from src.models.action import Action, ActionType, CounterAction, legal_actions
 from src.models.card import Card, CardType
+from src.utils.pacing import PacingClock
 
 
 class BasePlayer(BaseModel, ABC):
@@ -26,6 +16,7 @@ class BasePlayer(BaseModel, ABC):
     cards: List[Card] = []
     is_ai: bool
     is_active: bool = False
+    pacing: PacingClock = Field(default_factory=PacingClock.from_env)
 
     def __str__(self):
         return f"{self.name}"
@@ -44,19 +35,8 @@ class BasePlayer(BaseModel, ABC):
 
         return True
 
-    def available_actions(self) -> List[Action]:
-        # You must coup if you have more than 10 coins
-        if self.coins >= 10:
-            return [CoupAction()]
-
-        actions = [IncomeAction(), ForeignAidAction(), TaxAction(), StealAction(), ExchangeAction()]
-        if self.coins >= 7:
-            actions.append(CoupAction())
-
-        if self.coins >= 3:
-            actions.append(AssassinateAction())
-
-        return actions
+    def available_actions(self) -> Tuple[Action, ...]:
+        return legal_actions(self.coins)
 
     def find_card(self, card_type: CardType) -> Optional[Card]:
         for ind, card in enumerate(self.cards):
@@ -87,6 +67,17 @@ class BasePlayer(BaseModel, ABC):
         """Choose whether to challenge the current player"""
         pass
 
+    async def adetermine_challenge(
+        self,
+        actor: "BasePlayer",
+        target_player: Union["BasePlayer", None],
+        action: Union[Action, CounterAction],
+        state: str,
+        dialogue_so_far: Optional[List[str]],
+    ) -> Tuple[bool, Optional[str]]:
+        """Asynchronously choose whether to challenge the current player"""
+        return self.determine_challenge(actor, target_player, action, state, dialogue_so_far)
+
     @abstractmethod
     def determine_chat(
         self,
@@ -98,6 +89,16 @@ class BasePlayer(BaseModel, ABC):
         """Choose whether to chat about the current event"""
         pass
 
+    async def adetermine_chat(
+        self,
+        actor: "BasePlayer",
+        event_to_chat_about: str,
+        past_events: Optional[List[str]],
+        modifier: Optional[float] = 1,
+    ) -> Optional[str]:
+        """Asynchronously choose whether to chat about the current event"""
+        return self.determine_chat(actor, event_to_chat_about, past_events, modifier)
+
     @abstractmethod
     def determine_counter(
         self,
@@ -110,6 +111,17 @@ class BasePlayer(BaseModel, ABC):
         """Choose whether to counter the current player's action"""
         pass
 
+    async def adetermine_counter(
+        self,
+        actor: "BasePlayer",
+        target_player: Optional["BasePlayer"],
+        action: Union[Action, CounterAction],
+        state: str,
+        dialogue_so_far: Optional[List[str]],
+    ) -> Tuple[bool, Optional[str]]:
+        """Asynchronously choose whether to counter the current player's action"""
+        return self.determine_counter(actor, target_player, action, state, dialogue_so_far)
+
     @abstractmethod
     def remove_card(self, past_events: List[str]) -> str:
         """Choose a card and remove it from your hand"""
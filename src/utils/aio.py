@@ -0,0 +1,23 @@
+import asyncio
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide event loop used to drive concurrent agent calls"""
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+    return _event_loop
+
+
+def run_coroutine(coroutine: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous game code.
+
+    The loop is kept alive between calls (instead of `asyncio.run`), so the async HTTP clients
+    behind the LLM runnables keep their connections from one phase to the next.
+    """
+    return get_event_loop().run_until_complete(coroutine)
@@ -1,15 +1,15 @@
-from typing import List
+from typing import List, Tuple
 
 from rich.panel import Panel
 from rich.table import Column, Table
 from rich.text import Text
 
-from src.models.card import Card
+from src.models.card import Deck
 from src.models.players.human import BasePlayer
 
 
 def generate_state_panel(
-    deck: list[Card],
+    deck: Deck,
     treasury_coins: int,
     current_player: BasePlayer,
     discards: list[str],
@@ -61,3 +61,51 @@ def generate_players_table(players: List[BasePlayer], current_player_index: int)
         table.add_row(player_text, coin_text, card_text)
 
     return table
+
+
+def render_player_row(player: BasePlayer, reveal_cards: bool = False) -> str:
+    """Render one player as a plain-text (markdown) table row"""
+    icon = "🤖" if player.is_ai else "😬"
+    if not player.is_active:
+        cards = "💀"
+    elif reveal_cards:
+        cards = " ".join(str(card) for card in player.cards)
+    else:
+        cards = " ".join("<Secret...>" for _ in player.cards)
+
+    return f"| {icon} {player} | {player.coins} | {cards} |"
+
+
+def render_public_state(
+    players: List[BasePlayer], deck: Deck, treasury_coins: int, discards: list[str]
+) -> Tuple[List[str], str]:
+    """Render the parts of the board every player can see: one row per player, with their cards
+    hidden, and the deck, treasury and discard summary"""
+    rows = [render_player_row(player) for player in players]
+    summary = (
+        f"🎲 Deck: {len(deck)} cards\n"
+        f"💰 Treasury: {treasury_coins} coins\n"
+        f"Discards: {', '.join(discards) or 'None'}"
+    )
+    return rows, summary
+
+
+def render_headless_state(
+    public_state: Tuple[List[str], str],
+    players: List[BasePlayer],
+    viewer_index: int,
+    hand_odds: str = "",
+) -> str:
+    """Render the board as seen by one player, revealing only their own cards.
+
+    A cheap alternative to capturing `generate_players_table` and `generate_state_panel` from a
+    rich console, for prompts rather than the screen.
+    """
+    rows, summary = public_state
+    rows = list(rows)
+    viewer = players[viewer_index]
+    rows[viewer_index] = render_player_row(viewer, reveal_cards=True)
+
+    table = "\n".join(["| Players | Coins | Cards |", "| --- | --- | --- |", *rows])
+    state = f"{table}\n\n💁 Current Player: {viewer}\n{summary}\n"
+    return f"{state}\n{hand_odds}\n" if hand_odds else state
@@ -0,0 +1,276 @@
+import asyncio
+import functools
+import json
+import os
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.models.event_history import estimate_tokens
+
+# Where per-game metrics are written at the end of a game (nothing is written if unset)
+metrics_dir = os.getenv("AI_METRICS_DIR")
+
+# USD per 1000 prompt / completion tokens, by model
+MODEL_PRICES = {
+    "gpt-4-1106-preview": (0.01, 0.03),
+}
+
+# Which part of the turn the current model calls belong to: action, challenge, counter, ...
+current_phase: ContextVar[str] = ContextVar("current_phase", default="other")
+
+
+def in_phase(phase: str) -> Callable:
+    """Attribute every model call made inside the decorated (sync or async) method to `phase`"""
+
+    def decorator(method: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(*args, **kwargs):
+                token = current_phase.set(phase)
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    current_phase.reset(token)
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            token = current_phase.set(phase)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current_phase.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+@dataclass
+class ChainInvocation:
+    role: str
+    player: str
+    phase: str
+    started_at: float
+    wall_time: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    attempts: int = 0
+    succeeded: bool = False
+    # Abandoned rather than failed, e.g. a deliberation made moot by a higher-priority player
+    cancelled: bool = False
+    model_name: Optional[str] = None
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+    @property
+    def cost(self) -> float:
+        prompt_price, completion_price = MODEL_PRICES.get(self.model_name, (0.0, 0.0))
+        return (
+            self.prompt_tokens * prompt_price + self.completion_tokens * completion_price
+        ) / 1000
+
+
+class TokenUsageCallback(BaseCallbackHandler):
+    """Collects the token usage of every model run inside one chain invocation.
+
+    Usage reported by the API is preferred; streamed responses (which do not report it) are
+    estimated from the prompt and the generated text.
+    """
+
+    def __init__(self, invocation: ChainInvocation):
+        self.invocation = invocation
+        self._estimated_prompt_tokens = 0
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, **kwargs: Any) -> None:
+        self._estimated_prompt_tokens = sum(
+            estimate_tokens(f"{message.content}") for batch in messages for message in batch
+        )
+        invocation_params = kwargs.get("invocation_params") or {}
+        self.invocation.model_name = invocation_params.get(
+            "model_name", invocation_params.get("model", self.invocation.model_name)
+        )
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        llm_output = response.llm_output or {}
+        self.invocation.model_name = llm_output.get("model_name", self.invocation.model_name)
+
+        usage = llm_output.get("token_usage") or {}
+        if usage:
+            self.invocation.prompt_tokens += usage.get("prompt_tokens", 0)
+            self.invocation.completion_tokens += usage.get("completion_tokens", 0)
+            return
+
+        self.invocation.prompt_tokens += self._estimated_prompt_tokens
+        self.invocation.completion_tokens += sum(
+            estimate_tokens(generation.text)
+            for batch in response.generations
+            for generation in batch
+        )
+
+
+class InvocationTracker:
+    """Times one (possibly retried) chain invocation and records it when done"""
+
+    def __init__(self, instrumentation: "Instrumentation", role: str, player: str):
+        self.instrumentation = instrumentation
+        self.invocation = ChainInvocation(
+            role=role, player=player, phase=current_phase.get(), started_at=time.time()
+        )
+        self.config = {"callbacks": [TokenUsageCallback(self.invocation)]}
+        self._started = time.perf_counter()
+
+    def attempt(self) -> None:
+        self.invocation.attempts += 1
+
+    def __enter__(self) -> "InvocationTracker":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.invocation.wall_time = time.perf_counter() - self._started
+        self.invocation.succeeded = exc_type is None
+        self.invocation.cancelled = exc_type is not None and issubclass(
+            exc_type, asyncio.CancelledError
+        )
+        self.instrumentation.record(self.invocation)
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))] if ordered else 0.0
+
+
+class Instrumentation:
+    """Records every AIGameAgent chain invocation, and summarizes them by role, phase and player"""
+
+    def __init__(self):
+        self.invocations: List[ChainInvocation] = []
+
+    def track(self, role: str, player: str) -> InvocationTracker:
+        return InvocationTracker(self, role, player)
+
+    def record(self, invocation: ChainInvocation) -> None:
+        self.invocations.append(invocation)
+
+    def reset(self) -> None:
+        self.invocations = []
+
+    @staticmethod
+    def _aggregate(invocations: List[ChainInvocation]) -> Dict[str, Any]:
+        wall_times = [invocation.wall_time for invocation in invocations]
+        return {
+            "calls": len(invocations),
+            "failures": sum(
+                not invocation.succeeded and not invocation.cancelled for invocation in invocations
+            ),
+            "cancelled": sum(invocation.cancelled for invocation in invocations),
+            "retries": sum(invocation.retries for invocation in invocations),
+            "wall_time_total": round(sum(wall_times), 4),
+            "wall_time_mean": round(sum(wall_times) / len(wall_times), 4) if wall_times else 0.0,
+            "wall_time_p50": round(_percentile(wall_times, 0.5), 4),
+            "wall_time_p95": round(_percentile(wall_times, 0.95), 4),
+            "prompt_tokens": sum(invocation.prompt_tokens for invocation in invocations),
+            "completion_tokens": sum(invocation.completion_tokens for invocation in invocations),
+            "cost": round(sum(invocation.cost for invocation in invocations), 6),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals, plus breakdowns by role, phase and player, sorted by time spent"""
+        summary: Dict[str, Any] = {"total": self._aggregate(self.invocations)}
+        for dimension in ["role", "phase", "player"]:
+            groups = defaultdict(list)
+            for invocation in self.invocations:
+                groups[getattr(invocation, dimension)].append(invocation)
+            breakdown = {key: self._aggregate(group) for key, group in groups.items()}
+            summary[f"by_{dimension}"] = dict(
+                sorted(breakdown.items(), key=lambda item: -item[1]["wall_time_total"])
+            )
+        return summary
+
+    def write_json(self, path: str, include_invocations: bool = True) -> None:
+        """Write the summary (and, by default, every invocation) as JSON"""
+        report = self.summary()
+        if include_invocations:
+            report["invocations"] = [
+                {**asdict(invocation), "retries": invocation.retries, "cost": invocation.cost}
+                for invocation in self.invocations
+            ]
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Render per role and phase counters in the Prometheus text exposition format"""
+        groups = defaultdict(list)
+        for invocation in self.invocations:
+            groups[(invocation.role, invocation.phase)].append(invocation)
+
+        metrics = [
+            ("coup_agent_calls_total", "counter", "Chain invocations", lambda g: len(g)),
+            (
+                "coup_agent_cancelled_total",
+                "counter",
+                "Chain invocations cancelled before they finished",
+                lambda g: sum(i.cancelled for i in g),
+            ),
+            (
+                "coup_agent_retries_total",
+                "counter",
+                "Retried model calls",
+                lambda g: sum(i.retries for i in g),
+            ),
+            (
+                "coup_agent_prompt_tokens_total",
+                "counter",
+                "Prompt tokens sent",
+                lambda g: sum(i.prompt_tokens for i in g),
+            ),
+            (
+                "coup_agent_completion_tokens_total",
+                "counter",
+                "Completion tokens received",
+                lambda g: sum(i.completion_tokens for i in g),
+            ),
+            (
+                "coup_agent_cost_dollars_total",
+                "counter",
+                "Estimated model cost in USD",
+                lambda g: round(sum(i.cost for i in g), 6),
+            ),
+            (
+                "coup_agent_call_seconds_total",
+                "counter",
+                "Wall time spent in chain invocations",
+                lambda g: round(sum(i.wall_time for i in g), 6),
+            ),
+        ]
+
+        lines = []
+        for name, metric_type, description, value in metrics:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for (role, phase), group in sorted(groups.items()):
+                lines.append(f'{name}{{role="{role}",phase="{phase}"}} {value(group)}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        with open(path, "w") as metrics_file:
+            metrics_file.write(self.to_prometheus())
+
+    def export(self, directory: str, name: str) -> None:
+        """Write `name`.json and `name`.prom into `directory`"""
+        os.makedirs(directory, exist_ok=True)
+        self.write_json(os.path.join(directory, f"{name}.json"))
+        self.write_prometheus(os.path.join(directory, f"{name}.prom"))
+
+
+instrumentation = Instrumentation()
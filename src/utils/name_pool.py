@@ -0,0 +1,48 @@
+import bisect
+import os
+import random
+from typing import Dict, List, Optional, Tuple
+
+GENDERS = ("male", "female")
+
+
+def _load_names(gender: str) -> Tuple[List[str], List[float]]:
+    """Read the names (and their cumulative frequency, in percent) that ship with `names`"""
+    import names
+
+    names_path = os.path.join(os.path.dirname(names.__file__), f"dist.{gender}.first")
+    # Each line is: NAME frequency cumulative-frequency rank
+    with open(names_path) as names_file:
+        fields = names_file.read().split()
+    return fields[0::4], [float(frequency) for frequency in fields[2::4]]
+
+
+class NamePool:
+    """Draws first names as `names.get_first_name` does (common names more often), from tables
+    read once and kept in memory, and never hands out the same name twice in one draw"""
+
+    def __init__(self):
+        self._tables: Dict[str, Tuple[List[str], List[float]]] = {}
+
+    def _table(self, gender: str) -> Tuple[List[str], List[float]]:
+        if gender not in self._tables:
+            self._tables[gender] = _load_names(gender)
+        return self._tables[gender]
+
+    def _draw(self, gender: str, rng: random.Random) -> str:
+        first_names, cumulative = self._table(gender)
+        index = bisect.bisect_right(cumulative, rng.random() * cumulative[-1])
+        return first_names[min(index, len(first_names) - 1)].capitalize()
+
+    def sample(self, count: int, rng: Optional[random.Random] = None) -> List[str]:
+        """`count` distinct first names, each of a randomly chosen gender"""
+        rng = rng or random
+        taken: List[str] = []
+        while len(taken) < count:
+            name = self._draw(rng.choice(GENDERS), rng)
+            if name not in taken:
+                taken.append(name)
+        return taken
+
+
+name_pool = NamePool()
@@ -0,0 +1,45 @@
+import os
+import time
+from enum import Enum
+
+from pydantic import BaseModel
+
+from src.utils.tracing import tracer
+
+
+class PacingMode(str, Enum):
+    real_time = "real-time"
+    batch = "batch"
+    accelerated = "accelerated"
+
+
+# How the game paces itself between messages: real-time (for spectators), batch (no pauses at
+# all) or accelerated (pauses shortened by GAME_PACING_SPEED, for replays)
+game_pacing = os.getenv("GAME_PACING", PacingMode.real_time.value)
+game_pacing_speed = float(os.getenv("GAME_PACING_SPEED", 4.0))
+
+
+class PacingClock(BaseModel):
+    """Decides how long the cosmetic pauses between game messages actually last"""
+
+    mode: PacingMode = PacingMode.real_time
+    speed: float = 4.0
+
+    @classmethod
+    def from_env(cls) -> "PacingClock":
+        return cls(mode=PacingMode(game_pacing), speed=game_pacing_speed)
+
+    def scale(self, seconds: float) -> float:
+        if self.mode == PacingMode.batch:
+            return 0.0
+        if self.mode == PacingMode.accelerated:
+            return seconds / self.speed
+        return seconds
+
+    def pause(self, seconds: float) -> None:
+        """Pause for `seconds` of spectator time (recorded as a pacing span when tracing)"""
+        delay = self.scale(seconds)
+        if delay <= 0:
+            return
+        with tracer.span("pause", "pacing", seconds=delay):
+            time.sleep(delay)
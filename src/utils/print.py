@@ -1,7 +1,9 @@
 import random
+from typing import TYPE_CHECKING
 
 from rich.console import Console, JustifyMethod
 from rich.highlighter import Highlighter
+from rich.live import Live
 from rich.panel import Panel
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
@@ -9,7 +11,10 @@ from rich.text import Text
 from rich.tree import Tree
 
 from src.models.action import Action, ActionType, CounterAction, CounterActionType
-from src.models.players.base import BasePlayer
+
+if TYPE_CHECKING:
+    # Only for annotations: importing the players pulls in the agents (and langchain)
+    from src.models.players.base import BasePlayer
 
 console = Console()
 
@@ -49,6 +54,42 @@ def print_texts(*parts):
     console.print(text)
 
 
+class StreamingText:
+    """Print text live as it streams in (e.g. model output), between a fixed prefix and suffix.
+
+    Use as a context manager, feeding chunks to `append`; `reconcile` swaps in the final text
+    if it turns out different from what was streamed, e.g. after redaction.
+    """
+
+    def __init__(self, prefix: str, style: str = "", suffix: str = ""):
+        self.prefix = prefix
+        self.style = style
+        self.suffix = suffix
+        self.text = ""
+        self._live = Live(console=console, auto_refresh=False)
+
+    def _render(self) -> Text:
+        return Text.assemble(self.prefix, (self.text, self.style), self.suffix)
+
+    def __enter__(self) -> "StreamingText":
+        print_blank()
+        self._live.start()
+        self._live.update(self._render(), refresh=True)
+        return self
+
+    def append(self, chunk: str):
+        self.text += chunk
+        self._live.update(self._render(), refresh=True)
+
+    def reconcile(self, final_text: str):
+        if final_text != self.text:
+            self.text = final_text
+            self._live.update(self._render(), refresh=True)
+
+    def __exit__(self, *exc_info):
+        self._live.stop()
+
+
 def print_tree(root: str, content: list[str]):
     print_blank()
 
@@ -83,7 +124,7 @@ def print_confirm(content: str) -> bool:
 
 
 def build_action_report_string(
-    player: BasePlayer, action: Action, target_player: BasePlayer
+    player: "BasePlayer", action: Action, target_player: "BasePlayer"
 ) -> str:
     action_report_string = f"[bold magenta]{player}[/] chose to "
     match action.action_type:
@@ -108,7 +149,7 @@ def build_action_report_string(
 
 
 def build_counter_report_string(
-    target_player: BasePlayer, counter: CounterAction, countering_player: BasePlayer
+    target_player: "BasePlayer", counter: CounterAction, countering_player: "BasePlayer"
 ) -> str:
     counter_report_string = f"{countering_player} chose to "
     match counter.counter_type:
@@ -0,0 +1,131 @@
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Where a Chrome trace-event timeline of each game is written (nothing is recorded if unset)
+trace_dir = os.getenv("AI_TRACE_DIR")
+
+# Spans without a lane of their own are drawn on the game loop's row
+GAME_LANE = "game"
+
+# The lane that spans opened in the current context are drawn on
+current_lane: ContextVar[str] = ContextVar("current_lane", default=GAME_LANE)
+
+
+class Tracer:
+    """Records nested timing spans as Chrome trace events.
+
+    Spans on the same lane nest by time, so a turn shows its phases, each phase the actions and
+    agent calls made inside it, and so on. Spans that may run concurrently are given a lane of
+    their own (inherited by the spans opened inside them), so overlapping calls do not garble
+    each other. The export loads in chrome://tracing, https://ui.perfetto.dev or speedscope.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        self._lanes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def _lane_id(self, lane: str) -> int:
+        if lane not in self._lanes:
+            self._lanes[lane] = len(self._lanes) + 1
+        return self._lanes[lane]
+
+    def _now(self) -> float:
+        """Microseconds since the tracer was created"""
+        return (time.perf_counter() - self._origin) * 1e6
+
+    @contextmanager
+    def span(
+        self, name: str, category: str, lane: Optional[str] = None, **args: Any
+    ) -> Iterator[None]:
+        """Time the body of the `with` statement as one span"""
+        if not self.enabled:
+            yield
+            return
+
+        lane = lane or current_lane.get()
+        token = current_lane.set(lane)
+        started = self._now()
+        try:
+            yield
+        finally:
+            current_lane.reset(token)
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round(started, 1),
+                "dur": round(self._now() - started, 1),
+                "pid": 1,
+                "args": {key: f"{value}" for key, value in args.items()},
+            }
+            with self._lock:
+                event["tid"] = self._lane_id(lane)
+                self.events.append(event)
+
+    def traced(self, category: str, name: Optional[str] = None) -> Callable:
+        """Decorate a (sync or async) function so every call is recorded as a span"""
+
+        def decorator(function: Callable) -> Callable:
+            span_name = name or function.__name__
+
+            if asyncio.iscoroutinefunction(function):
+
+                @functools.wraps(function)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name, category):
+                        return await function(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, category):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def reset(self) -> None:
+        with self._lock:
+            self.events = []
+            self._lanes = {}
+            self._origin = time.perf_counter()
+
+    def to_trace_events(self) -> Dict[str, Any]:
+        with self._lock:
+            events = list(self.events)
+            lanes = dict(self._lanes)
+
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "Coup"}},
+            *[
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": lane}}
+                for lane, tid in lanes.items()
+            ],
+        ]
+        return {
+            "traceEvents": metadata + sorted(events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+        }
+
+    def export(self, directory: str, name: str) -> str:
+        """Write `name`.trace.json into `directory`, returning its path"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.trace.json")
+        with open(path, "w") as trace_file:
+            json.dump(self.to_trace_events(), trace_file)
+        return path
+
+
+tracer = Tracer(enabled=bool(trace_dir))
@@ -0,0 +1,34 @@
+import random
+from typing import List, Optional
+
+import pytest
+
+from src.engine.events import EventSubscriber
+from src.handler.game_handler import ResistanceCoupGameHandler
+
+MAX_TURNS = 300
+
+
+class Games:
+    """Starts seeded games against the fake model, and plays them out"""
+
+    @staticmethod
+    def new(
+        seed: int, subscribers: Optional[List[EventSubscriber]] = None
+    ) -> ResistanceCoupGameHandler:
+        random.seed(seed)
+        handler = ResistanceCoupGameHandler("test", 5, subscribers=subscribers)
+        handler.setup_game()
+        return handler
+
+    @staticmethod
+    def play_to_the_end(handler: ResistanceCoupGameHandler) -> ResistanceCoupGameHandler:
+        for _ in range(MAX_TURNS):
+            if handler.handle_turn():
+                break
+        return handler
+
+
+@pytest.fixture(scope="session")
+def games() -> Games:
+    return Games()
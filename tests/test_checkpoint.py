@@ -0,0 +1,59 @@
+import gzip
+import random
+
+import pytest
+
+from src.handler.checkpoint import load_checkpoint, remove_checkpoint, save_checkpoint
+from src.handler.game_handler import ResistanceCoupGameHandler
+
+SEED = 3
+
+
+def _outcome(handler: ResistanceCoupGameHandler):
+    return handler.turn, handler.remaining_player.name, handler._snapshot()
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "checkpoints" / "game.json.gz")
+    checkpoint = {"name": "game", "event_log_size": 42, "game": {"turn": 7, "deck": ["Duke"]}}
+
+    assert load_checkpoint(path) is None
+    save_checkpoint(checkpoint, path)
+
+    assert load_checkpoint(path) == checkpoint
+    with gzip.open(path, "rb") as checkpoint_file:
+        assert checkpoint_file.read().startswith(b'{"name":"game"')
+    assert [entry.name for entry in tmp_path.joinpath("checkpoints").iterdir()] == ["game.json.gz"]
+
+    remove_checkpoint(path)
+    assert load_checkpoint(path) is None
+
+
+def test_resumed_game_plays_out_like_an_uninterrupted_one(games, tmp_path):
+    """A game checkpointed after a few turns and resumed (with the global RNG moved on in
+    between) ends the same way as one that was never interrupted"""
+    uninterrupted = _outcome(games.play_to_the_end(games.new(SEED)))
+
+    handler = games.new(SEED)
+    for _ in range(4):
+        assert not handler.handle_turn()
+    path = str(tmp_path / "game.json.gz")
+    save_checkpoint({"game": handler.to_checkpoint()}, path)
+
+    random.seed(SEED + 1)
+    resumed = ResistanceCoupGameHandler.from_checkpoint(load_checkpoint(path)["game"])
+
+    assert resumed._snapshot() == handler._snapshot()
+    assert [player.ai_agent.traits for player in resumed._players] == [
+        player.ai_agent.traits for player in handler._players
+    ]
+    assert list(resumed._last_round_events) == list(handler._last_round_events)
+    assert _outcome(games.play_to_the_end(resumed)) == uninterrupted
+
+
+def test_checkpoints_of_another_version_are_rejected(games):
+    checkpoint = games.new(SEED).to_checkpoint()
+    checkpoint["version"] -= 1
+
+    with pytest.raises(ValueError, match="Unsupported checkpoint version"):
+        ResistanceCoupGameHandler.from_checkpoint(checkpoint)
@@ -0,0 +1,57 @@
+import random
+from collections import Counter
+
+import pytest
+
+from src.models.card import COPIES_PER_CARD, CardType, Deck
+
+
+def test_draw_takes_every_card_once():
+    deck = Deck.full()
+    rng = random.Random(7)
+
+    drawn = [deck.draw(rng) for _ in range(COPIES_PER_CARD * len(CardType))]
+
+    assert len(deck) == 0
+    assert Counter(drawn) == dict.fromkeys(CardType, COPIES_PER_CARD)
+    with pytest.raises(IndexError):
+        deck.draw(rng)
+
+
+def test_put_back_returns_the_card_to_the_deck():
+    deck = Deck.full()
+    card_type = deck.draw(random.Random(7))
+    assert len(deck) == COPIES_PER_CARD * len(CardType) - 1
+    assert deck.count(card_type) == COPIES_PER_CARD - 1
+
+    deck.put_back(card_type)
+
+    assert len(deck) == COPIES_PER_CARD * len(CardType)
+    assert deck == Deck.full()
+
+
+def test_draw_is_uniform_over_the_cards_left():
+    """With one Duke among four cards, it is drawn about a quarter of the time"""
+    deck = Deck([CardType.duke, CardType.captain, CardType.captain, CardType.captain])
+    rng = random.Random(7)
+
+    dukes = 0
+    for _ in range(4000):
+        card_type = deck.draw(rng)
+        dukes += card_type is CardType.duke
+        deck.put_back(card_type)
+
+    assert 900 < dukes < 1100
+
+
+def test_remove_and_copy():
+    deck = Deck([CardType.duke, CardType.contessa])
+    copy = deck.copy()
+
+    deck.remove(CardType.duke)
+
+    assert CardType.duke not in deck
+    assert CardType.duke in copy
+    assert list(deck) == [CardType.contessa]
+    with pytest.raises(ValueError):
+        deck.remove(CardType.duke)
@@ -0,0 +1,164 @@
+import random
+from typing import Callable, List, Optional, Tuple, Union
+
+import pytest
+from pydantic import ConfigDict
+
+from src.engine.engine import COUNTER_CARDS, CoupEngine
+from src.engine.events import EventType, GameEvent
+from src.engine.policies import HonestPolicy, Policy, RandomPolicy
+from src.engine.state import GameState, PlayerState
+from src.handler.game_handler import ResistanceCoupGameHandler
+from src.models.action import ACTIONS, Action, CounterAction
+from src.models.agents.ai_orchestrator import AIGameAgent
+from src.models.card import Card
+from src.models.players.base import BasePlayer
+
+NAMES = ["Ada", "Bo", "Cy", "Di", "Ed"]
+MAX_TURNS = 300
+
+# Rule events only: the handler also records table talk and end-of-turn snapshots
+IGNORED_EVENTS = {EventType.message, EventType.turn_ended}
+
+
+class PolicyPlayer(BasePlayer):
+    """Plays a seat of the handler's game with an engine policy, drawing on the global random
+    generator exactly where the engine draws on its own"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    is_ai: bool = True
+    policy: Policy
+    seat: int
+    view: Callable[[], GameState]
+
+    def choose_action(
+        self,
+        other_players: List[BasePlayer],
+        state: str,
+        last_round_dialogue: Optional[List[str]] = None,
+    ) -> Tuple[Action, Optional[BasePlayer], Optional[str]]:
+        legal_actions = [action.action_type for action in self.available_actions()]
+        action_type, target = self.policy.choose_action(
+            self.view(), self.seat, legal_actions, random
+        )
+        if not ACTIONS[action_type].requires_target:
+            return ACTIONS[action_type], None, None
+        target_player = next(player for player in other_players if player.name == NAMES[target])
+        return ACTIONS[action_type], target_player, None
+
+    def determine_challenge(
+        self,
+        actor: BasePlayer,
+        target_player: Optional[BasePlayer],
+        action: Union[Action, CounterAction],
+        state: str,
+        dialogue_so_far: Optional[List[str]],
+    ) -> Tuple[bool, Optional[str]]:
+        claimant = NAMES.index(actor.name)
+        challenges = self.policy.should_challenge(
+            self.view(), self.seat, claimant, action.associated_card_type, random
+        )
+        return challenges, None
+
+    def determine_counter(
+        self,
+        actor: BasePlayer,
+        target_player: Optional[BasePlayer],
+        action: Union[Action, CounterAction],
+        state: str,
+        dialogue_so_far: Optional[List[str]],
+    ) -> Tuple[bool, Optional[str]]:
+        card = COUNTER_CARDS[action.action_type]
+        blocks = self.policy.should_block(
+            self.view(), self.seat, NAMES.index(actor.name), action.action_type, card, random
+        )
+        return blocks, None
+
+    def determine_chat(
+        self,
+        actor: BasePlayer,
+        event_to_chat_about: str,
+        past_events: Optional[List[str]],
+        modifier: Optional[float],
+    ) -> Optional[str]:
+        return None
+
+    def remove_card(self, past_events: List[str]) -> str:
+        card_type = self.policy.choose_discard(self.view(), self.seat, random)
+        return f"{self.find_card(card_type)}"
+
+    def choose_exchange_cards(
+        self, exchange_cards: List[Card], current_events: List[str]
+    ) -> Tuple[Card, Card]:
+        self.cards += exchange_cards
+        first, second = self.policy.choose_exchange(self.view(), self.seat, random)
+        return self.find_card(first), self.find_card(second)
+
+
+def _handler_view(handler: ResistanceCoupGameHandler) -> GameState:
+    return GameState(
+        players=[
+            PlayerState(
+                name=player.name,
+                coins=player.coins,
+                cards=[card.card_type for card in player.cards],
+                is_active=player.is_active,
+            )
+            for player in handler._players
+        ],
+        deck=handler._deck.copy(),
+        discard=list(handler._discard),
+        treasury=handler._treasury,
+        current_player_index=handler._current_player_index,
+        turn=handler.turn,
+    )
+
+
+def _policies(seed: int) -> List[Policy]:
+    # Mixed tables exercise bluffs, blocks and called bluffs on both sides
+    return [RandomPolicy() if (seed + seat) % 2 else HonestPolicy() for seat in range(len(NAMES))]
+
+
+def _play_handler(games, seed: int) -> Tuple[List[GameEvent], ResistanceCoupGameHandler]:
+    events: List[GameEvent] = []
+    handler = ResistanceCoupGameHandler.__new__(ResistanceCoupGameHandler)
+    handler._reset(len(NAMES), False, None, [events.append])
+    for seat, (name, policy) in enumerate(zip(NAMES, _policies(seed))):
+        handler._players.append(
+            PolicyPlayer(
+                name=name,
+                ai_agent=AIGameAgent(name=name),
+                policy=policy,
+                seat=seat,
+                view=lambda: _handler_view(handler),
+            )
+        )
+
+    random.seed(seed)
+    handler.setup_game()
+    return events, games.play_to_the_end(handler)
+
+
+def _play_engine(seed: int) -> Tuple[List[GameEvent], CoupEngine]:
+    events: List[GameEvent] = []
+    engine = CoupEngine(NAMES, _policies(seed), seed=seed, subscribers=[events.append])
+    engine.play_game(MAX_TURNS)
+    return events, engine
+
+
+def _rule_events(events: List[GameEvent]) -> List[dict]:
+    return [event.to_dict() for event in events if event.event_type not in IGNORED_EVENTS]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+def test_handler_and_engine_agree(games, seed):
+    """The same seat policies and seed play out the same game in the handler and the engine"""
+    handler_events, handler = _play_handler(games, seed)
+    engine_events, engine = _play_engine(seed)
+
+    assert _rule_events(handler_events) == _rule_events(engine_events)
+    assert engine.state.winner is not None
+    assert handler.remaining_player.name == NAMES[engine.state.winner]
+    assert _handler_view(handler).deck == engine.state.deck
+    assert handler._discard == [card.value for card in engine.state.discard]
@@ -0,0 +1,53 @@
+from src.models.event_history import FOLDED_EVENT_LENGTH, EventHistory, estimate_tokens
+
+
+def test_keeps_the_latest_events_word_for_word():
+    history = EventHistory(max_recent=3, token_budget=1000)
+    history.extend([f"Ada takes income ({turn})" for turn in range(5)])
+
+    assert len(history) == 5
+    assert list(history) == [f"Ada takes income ({turn})" for turn in range(2, 5)]
+    assert history.render().splitlines() == [
+        "Earlier: Ada takes income (0) Ada takes income (1)",
+        "- Ada takes income (2)",
+        "- Ada takes income (3)",
+        "- Ada takes income (4)",
+    ]
+
+
+def test_folds_speech_into_counts_and_shortens_long_events():
+    history = EventHistory(max_recent=1, token_budget=1000)
+    history.append('Ada says "I have the Duke, honestly"')
+    history.append('Ada says to Bo, "Do not even think about it"')
+    history.append('Bo says "Sure you do"')
+    history.append("x" * 200)
+    history.append("Cy takes foreign aid")
+
+    summary = history.render().splitlines()[0]
+    assert summary == (
+        f"Earlier: {'x' * (FOLDED_EVENT_LENGTH - 3)}... Ada spoke 2 times, Bo spoke 1 time."
+    )
+
+
+def test_render_stays_within_the_token_budget():
+    history = EventHistory(max_recent=50, token_budget=1000)
+    history.extend([f"Player {number} challenges the Captain claim" for number in range(50)])
+
+    for token_budget in (5, 20, 60, 200):
+        rendered = history.render(token_budget)
+        assert estimate_tokens(rendered) <= token_budget + 1
+        # The newest events claim the budget first
+        if token_budget >= 20:
+            assert rendered.endswith("Player 49 challenges the Captain claim")
+
+    assert EventHistory().render() == "None"
+
+
+def test_round_trips_through_a_dict():
+    history = EventHistory(max_recent=2, token_budget=300)
+    history.extend(['Ada says "hello"', "Bo coups Cy", "Cy loses a Duke"])
+
+    restored = EventHistory.from_dict(history.to_dict())
+
+    assert restored.render() == history.render()
+    assert len(restored) == len(history) == 3
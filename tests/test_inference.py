@@ -0,0 +1,60 @@
+import pytest
+
+from src.engine.inference import HandInference
+from src.models.card import CardType
+
+
+def test_odds_without_a_record_follow_the_unseen_cards():
+    """Two Dukes in hand and one discarded leave 12 unseen cards, none of them a Duke: Bo's two
+    cards include a Captain with odds 1 - C(9, 2) / C(12, 2) = 1 - 36/66 = 5/11"""
+    odds = HandInference().odds(
+        own_cards=[CardType.duke, CardType.duke],
+        opponents=[("Bo", 2)],
+        discard=[CardType.duke],
+    )
+
+    assert odds["Bo"][CardType.duke] == 0.0
+    for card_type in (CardType.captain, CardType.contessa, CardType.assassin, CardType.ambassador):
+        assert odds["Bo"][card_type] == pytest.approx(5 / 11)
+
+
+def test_a_claim_weighs_hands_holding_the_card():
+    """Bo's one card is any of the 15 with three of each type: holding the claimed Duke weighs 1
+    and each other type `bluff_rate` (1/4), so the Duke has odds 3 / (3 + 4 * 3 / 4) = 1/2"""
+    inference = HandInference(bluff_rate=0.25)
+    inference.claimed("Bo", CardType.duke)
+
+    odds = inference.odds(own_cards=[], opponents=[("Bo", 1)], discard=[])
+
+    assert odds["Bo"][CardType.duke] == pytest.approx(1 / 2)
+    assert odds["Bo"][CardType.captain] == pytest.approx(1 / 8)
+
+
+def test_a_called_bluff_rules_the_card_out():
+    inference = HandInference()
+    inference.caught_bluffing("Bo", CardType.duke)
+
+    odds = inference.odds(own_cards=[], opponents=[("Bo", 1), ("Cy", 1)], discard=[])
+
+    assert odds["Bo"][CardType.duke] == 0.0
+    assert odds["Bo"][CardType.captain] == pytest.approx(1 / 4)
+    # Cy draws from the 14 cards left once Bo's is set aside, three Dukes among them
+    assert odds["Cy"][CardType.duke] == pytest.approx(3 / 14)
+
+    # A fresh hand forgets the record
+    inference.hand_refreshed("Bo")
+    odds = inference.odds(own_cards=[], opponents=[("Bo", 1)], discard=[])
+    assert odds["Bo"][CardType.duke] == pytest.approx(1 / 5)
+
+
+def test_sampled_odds_approach_the_exact_ones():
+    exact = HandInference(bluff_rate=0.25)
+    sampled = HandInference(bluff_rate=0.25, exact_limit=0, samples=20000)
+    for inference in (exact, sampled):
+        inference.claimed("Bo", CardType.duke)
+
+    expected = exact.odds([], [("Bo", 2)], [])["Bo"]
+    estimated = sampled.odds([], [("Bo", 2)], [])["Bo"]
+
+    for card_type in CardType:
+        assert estimated[card_type] == pytest.approx(expected[card_type], abs=0.02)
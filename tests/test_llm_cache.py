@@ -0,0 +1,68 @@
+import itertools
+import json
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.outputs import Generation
+
+from src.models.agents import llm_cache
+from src.models.agents.llm_cache import SQLiteResponseCache
+
+LLM_STRING = json.dumps({"kwargs": {"model_name": "fake-model"}}) + "---[('stop', None)]"
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # A clock that ticks on every read, so least recently used is never a tie
+    ticks = itertools.count()
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: float(next(ticks))))
+    return SQLiteResponseCache(str(tmp_path / "responses.sqlite"))
+
+
+def _response(text: str):
+    return [Generation(text=text)]
+
+
+def test_lookup_returns_what_was_stored(cache):
+    cache.update("Who  holds\nthe Duke?", LLM_STRING, _response("Ada"))
+
+    # Prompts that only differ in whitespace share an entry
+    assert cache.lookup("Who holds the Duke?", LLM_STRING) == _response("Ada")
+    assert cache.lookup("Who holds the Captain?", LLM_STRING) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used_by_bytes(cache):
+    cache.update("first", LLM_STRING, _response("one"))
+    entry_size = cache.stats()["bytes"]
+    cache.max_bytes = 2 * entry_size
+
+    cache.update("second", LLM_STRING, _response("two"))
+    # Using the first entry leaves the second as the least recently used
+    assert cache.lookup("first", LLM_STRING) is not None
+    cache.update("third", LLM_STRING, _response("six"))
+
+    assert cache.lookup("second", LLM_STRING) is None
+    assert cache.lookup("first", LLM_STRING) == _response("one")
+    assert cache.lookup("third", LLM_STRING) == _response("six")
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_forget_on_failure_drops_the_rejected_response(cache):
+    cache.update("served", LLM_STRING, _response("stale"))
+
+    # Both the response served from the cache and the one stored are dropped
+    with pytest.raises(ValueError):
+        with cache.forget_on_failure():
+            cache.lookup("served", LLM_STRING)
+            cache.update("rejected", LLM_STRING, _response("unparseable"))
+            raise ValueError("could not parse the response")
+
+    assert cache.lookup("rejected", LLM_STRING) is None
+    assert cache.lookup("served", LLM_STRING) is None
+
+    with cache.forget_on_failure():
+        cache.update("accepted", LLM_STRING, _response("fine"))
+    assert cache.lookup("accepted", LLM_STRING) == _response("fine")
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from src.engine.event_log import JsonlEventLog, read_events, split_games
+from src.engine.events import EventType
+from src.engine.replay import GameReplayer, ReplayError
+
+SEEDS = [1, 2]
+
+
+@pytest.fixture(scope="module")
+def recorded_games(games, tmp_path_factory):
+    """The event log of a couple of games played against the fake model, with the handlers that
+    played them"""
+    path = str(tmp_path_factory.mktemp("logs") / "games.jsonl")
+    event_log = JsonlEventLog(path)
+    handlers = [games.play_to_the_end(games.new(seed, subscribers=[event_log])) for seed in SEEDS]
+    event_log.close()
+    return path, handlers
+
+
+def test_replay_rebuilds_every_game(recorded_games):
+    path, handlers = recorded_games
+    games = list(split_games(read_events(path)))
+    assert len(games) == len(handlers)
+
+    for game, handler in zip(games, handlers):
+        replayer = GameReplayer()
+        turns = list(replayer.replay(game))
+
+        assert len(turns) == handler.turn
+        assert replayer.state.players[replayer.state.winner].name == handler.remaining_player.name
+        assert turns[-1].state.turn == replayer.state.turn
+
+
+def test_replay_skips_a_line_cut_short(recorded_games, tmp_path):
+    path, _ = recorded_games
+    with open(path) as log_file:
+        lines = log_file.readlines()
+    truncated = tmp_path / "truncated.jsonl"
+    truncated.write_text("".join(lines) + lines[0][: len(lines[0]) // 2])
+
+    assert len(list(read_events(str(truncated)))) == len(lines)
+
+
+def test_replay_catches_a_tampered_log(recorded_games, tmp_path):
+    path, _ = recorded_games
+    with open(path) as log_file:
+        events = [json.loads(line) for line in log_file]
+    turn_ended = next(
+        event for event in events if event["event_type"] == EventType.turn_ended.value
+    )
+    turn_ended["state"]["treasury"] += 1
+    tampered = tmp_path / "tampered.jsonl"
+    tampered.write_text("".join(json.dumps(event) + "\n" for event in events))
+
+    game = next(split_games(read_events(str(tampered))))
+    with pytest.raises(ReplayError):
+        list(GameReplayer().replay(game))
+    # Without verification the log is taken at its word
+    assert list(GameReplayer(verify=False).replay(game))
@@ -0,0 +1,116 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+
+from src.models.agents.retry_policy import (
+    ErrorKind,
+    RetryBudgetExhausted,
+    RetryPolicy,
+    classify_error,
+    per_decision,
+)
+
+
+class APIError(Exception):
+    """Stands in for a client error that carries the response's status code"""
+
+    def __init__(self, status_code: int, retry_after: str = None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={"retry-after": retry_after} if retry_after else {})
+
+
+@pytest.mark.parametrize(
+    "error, kind",
+    [
+        (APIError(429), ErrorKind.rate_limit),
+        (RuntimeError("Rate limit reached for requests"), ErrorKind.rate_limit),
+        (TimeoutError(), ErrorKind.transient),
+        (ConnectionError(), ErrorKind.transient),
+        (APIError(503), ErrorKind.transient),
+        (APIError(408), ErrorKind.transient),
+        (APIError(401), ErrorKind.fatal),
+        (OutputParserException("not JSON"), ErrorKind.parse),
+        (ValueError("Could not find the card"), ErrorKind.parse),
+        (RuntimeError("something else"), ErrorKind.transient),
+    ],
+)
+def test_classify_error(error, kind):
+    assert classify_error(error) is kind
+
+
+def test_backoff_doubles_up_to_the_maximum():
+    policy = RetryPolicy(base_delay=1.0, max_delay=30.0, jitter=0.0)
+
+    assert [policy.delay(ErrorKind.transient, attempt) for attempt in range(6)] == [
+        1.0,
+        2.0,
+        4.0,
+        8.0,
+        16.0,
+        30.0,
+    ]
+    assert policy.delay(ErrorKind.rate_limit, 1) == 8.0
+    assert policy.delay(ErrorKind.parse, 3) == 0.0
+
+
+def test_backoff_jitter_and_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=30.0, jitter=0.5)
+    random.seed(7)
+
+    delays = [policy.delay(ErrorKind.transient, 2) for _ in range(100)]
+    assert all(2.0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+    # Rate limits never come back sooner than the server asked, nor later than the maximum
+    assert policy.delay(ErrorKind.rate_limit, 0, APIError(429, retry_after="12")) >= 12.0
+    assert policy.delay(ErrorKind.rate_limit, 0, APIError(429, retry_after="600")) == 30.0
+
+
+def _failing(calls: list):
+    def attempt():
+        calls.append(None)
+        raise ValueError("unusable response")
+
+    return attempt
+
+
+def test_each_call_has_its_own_budget_outside_a_decision():
+    policy = RetryPolicy(max_attempts=3)
+
+    for _ in range(2):
+        calls = []
+        with pytest.raises(RetryBudgetExhausted):
+            policy.call(_failing(calls), "analysis")
+        assert len(calls) == 3
+
+
+def test_calls_for_one_decision_share_a_budget():
+    policy = RetryPolicy(max_attempts=3)
+    first, second = [], []
+
+    @per_decision
+    def decide():
+        with pytest.raises(RetryBudgetExhausted):
+            policy.call(_failing(first), "analysis")
+        # Out of failures to spare: one attempt, and no retries
+        with pytest.raises(RetryBudgetExhausted):
+            policy.call(_failing(second), "decision")
+        return policy.retry_allowed()
+
+    assert decide() is False
+    assert (len(first), len(second)) == (3, 1)
+
+
+def test_fatal_errors_are_not_retried():
+    calls = []
+
+    def attempt():
+        calls.append(None)
+        raise APIError(401)
+
+    with pytest.raises(RetryBudgetExhausted):
+        RetryPolicy(max_attempts=3).call(attempt, "decision")
+    assert len(calls) == 1